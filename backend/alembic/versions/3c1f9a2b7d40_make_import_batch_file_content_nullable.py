@@ -0,0 +1,30 @@
+"""make import_batch.file_content nullable
+
+Revision ID: 3c1f9a2b7d40
+Revises: add_category_rule_table
+Create Date: 2026-10-16 09:12:31.118402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f9a2b7d40'
+down_revision: Union[str, None] = 'add_category_rule_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 流式导入不再把整个文件写入数据库
+    with op.batch_alter_table('import_batch') as batch_op:
+        batch_op.alter_column('file_content', existing_type=sa.String(), nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("UPDATE import_batch SET file_content = '' WHERE file_content IS NULL")
+    with op.batch_alter_table('import_batch') as batch_op:
+        batch_op.alter_column('file_content', existing_type=sa.String(), nullable=False)
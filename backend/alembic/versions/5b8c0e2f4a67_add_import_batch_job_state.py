@@ -0,0 +1,40 @@
+"""add import_batch background job state
+
+Revision ID: 5b8c0e2f4a67
+Revises: e5a7c3d9f214
+Create Date: 2026-10-16 13:40:18.906152
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8c0e2f4a67'
+down_revision: Union[str, None] = 'e5a7c3d9f214'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('import_batch', sa.Column('parsed_count', sa.Integer(), nullable=True, server_default='0'))
+    op.add_column('import_batch', sa.Column('categorized_count', sa.Integer(), nullable=True, server_default='0'))
+    op.add_column('import_batch', sa.Column('deduplicated_count', sa.Integer(), nullable=True, server_default='0'))
+    op.add_column('import_batch', sa.Column('inserted_count', sa.Integer(), nullable=True, server_default='0'))
+    op.add_column('import_batch', sa.Column('cancel_requested', sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.add_column('import_batch', sa.Column('started_at', sa.DateTime(), nullable=True))
+    op.add_column('import_batch', sa.Column('finished_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE import_batch SET parsed_count = processed_count")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('import_batch') as batch_op:
+        batch_op.drop_column('finished_at')
+        batch_op.drop_column('started_at')
+        batch_op.drop_column('cancel_requested')
+        batch_op.drop_column('inserted_count')
+        batch_op.drop_column('deduplicated_count')
+        batch_op.drop_column('categorized_count')
+        batch_op.drop_column('parsed_count')
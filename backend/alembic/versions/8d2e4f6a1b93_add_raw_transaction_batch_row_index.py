@@ -0,0 +1,26 @@
+"""add raw_transaction (import_batch_id, row_number) index
+
+Revision ID: 8d2e4f6a1b93
+Revises: 3c1f9a2b7d40
+Create Date: 2026-10-16 10:02:44.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e4f6a1b93'
+down_revision: Union[str, None] = '3c1f9a2b7d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_raw_transaction_batch_row', 'raw_transaction', ['import_batch_id', 'row_number'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_raw_transaction_batch_row', table_name='raw_transaction')
@@ -0,0 +1,72 @@
+"""add duplicate fingerprints to transaction and raw_transaction
+
+Revision ID: a41d7b9e0c25
+Revises: 5b8c0e2f4a67
+Create Date: 2026-10-16 15:05:52.617340
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from app.services.transaction_fingerprint import compute_fingerprint, signed_amount_cents
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41d7b9e0c25'
+down_revision: Union[str, None] = '5b8c0e2f4a67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_CHUNK_SIZE = 1000
+
+
+def backfill_transaction_fingerprints() -> None:
+    """为已有交易计算指纹，使新导入能与历史数据去重"""
+    connection = op.get_bind()
+    last_id = ""
+    while chunk := connection.execute(
+        sa.text(
+            "SELECT id, account_id, transaction_date, amount, type, description FROM \"transaction\" "
+            "WHERE id > :last_id ORDER BY id LIMIT :limit"
+        ),
+        {"last_id": last_id, "limit": BACKFILL_CHUNK_SIZE}
+    ).all():
+        last_id = chunk[-1].id
+        updates = []
+        for row in chunk:
+            transaction_date = row.transaction_date
+            if isinstance(transaction_date, str):
+                transaction_date = datetime.fromisoformat(transaction_date)
+            updates.append({
+                "id": row.id,
+                "fingerprint": compute_fingerprint(
+                    row.account_id,
+                    transaction_date,
+                    # type 列存储的是枚举名（例如 EXPENSE）
+                    signed_amount_cents(row.amount, row.type.lower()),
+                    row.description
+                )
+            })
+        connection.execute(
+            sa.text("UPDATE \"transaction\" SET fingerprint = :fingerprint WHERE id = :id"),
+            updates
+        )
+
+
+def upgrade() -> None:
+    op.add_column('transaction', sa.Column('fingerprint', sa.String(length=40), nullable=True))
+    op.add_column('raw_transaction', sa.Column('fingerprint', sa.String(length=40), nullable=True))
+    op.create_index('ix_transaction_account_fingerprint', 'transaction', ['account_id', 'fingerprint'], unique=False)
+    op.create_index(op.f('ix_raw_transaction_fingerprint'), 'raw_transaction', ['fingerprint'], unique=False)
+    backfill_transaction_fingerprints()
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_raw_transaction_fingerprint'), table_name='raw_transaction')
+    op.drop_index('ix_transaction_account_fingerprint', table_name='transaction')
+    with op.batch_alter_table('raw_transaction') as batch_op:
+        batch_op.drop_column('fingerprint')
+    with op.batch_alter_table('transaction') as batch_op:
+        batch_op.drop_column('fingerprint')
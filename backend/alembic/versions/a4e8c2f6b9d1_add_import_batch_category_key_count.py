@@ -0,0 +1,27 @@
+"""add import_batch category_key_count
+
+Revision ID: a4e8c2f6b9d1
+Revises: f1a7d3c9b5e2
+Create Date: 2026-10-17 13:20:41.587302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4e8c2f6b9d1'
+down_revision: Union[str, None] = 'f1a7d3c9b5e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('import_batch', sa.Column('category_key_count', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('import_batch') as batch_op:
+        batch_op.drop_column('category_key_count')
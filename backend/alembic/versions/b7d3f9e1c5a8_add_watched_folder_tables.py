@@ -0,0 +1,65 @@
+"""add watched folder tables
+
+Revision ID: b7d3f9e1c5a8
+Revises: a4e8c2f6b9d1
+Create Date: 2026-10-17 15:02:37.904416
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3f9e1c5a8'
+down_revision: Union[str, None] = 'a4e8c2f6b9d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('watched_folder',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('account_id', sa.String(length=36), nullable=False),
+        sa.Column('path', sa.String(length=1024), nullable=False),
+        sa.Column('pattern', sa.String(length=255), nullable=False),
+        sa.Column('recursive', sa.Boolean(), nullable=False),
+        sa.Column('auto_create', sa.Boolean(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('last_scanned_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['account_id'], ['finance_account.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'path', name='uq_watched_folder_user_path')
+    )
+    op.create_index(op.f('ix_watched_folder_user_id'), 'watched_folder', ['user_id'], unique=False)
+    op.create_table('watched_file',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('folder_id', sa.String(length=36), nullable=False),
+        sa.Column('path', sa.String(length=1024), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('mtime_ns', sa.BigInteger(), nullable=False),
+        sa.Column('file_hash', sa.String(length=64), nullable=True),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('error_message', sa.String(), nullable=True),
+        sa.Column('import_batch_id', sa.String(length=36), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['folder_id'], ['watched_folder.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['import_batch_id'], ['import_batch.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('folder_id', 'path', name='uq_watched_file_folder_path')
+    )
+    op.create_index(op.f('ix_watched_file_file_hash'), 'watched_file', ['file_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_watched_file_file_hash'), table_name='watched_file')
+    op.drop_table('watched_file')
+    op.drop_index(op.f('ix_watched_folder_user_id'), table_name='watched_folder')
+    op.drop_table('watched_folder')
@@ -0,0 +1,44 @@
+"""add import batch file table
+
+Revision ID: b8d4e2a6f1c3
+Revises: f3b9d6e1a8c4
+Create Date: 2026-10-16 23:48:12.604317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d4e2a6f1c3'
+down_revision: Union[str, None] = 'f3b9d6e1a8c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('import_batch_file',
+        sa.Column('import_batch_id', sa.String(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('file_name', sa.String(), nullable=False),
+        sa.Column('file_hash', sa.String(length=64), nullable=False),
+        sa.Column('file_size', sa.Integer(), nullable=True),
+        sa.Column('statement_format', sa.Enum('CIBC_CREDIT', 'CIBC_DEBIT', 'RBC_CHECKING', 'RBC_CREDIT', 'RBC_SAVING', 'GENERIC_CSV', 'OFX', 'XLSX', name='bankstatementformat'), nullable=True),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('error_message', sa.String(), nullable=True),
+        sa.Column('parsed_count', sa.Integer(), nullable=True),
+        sa.Column('duplicate_count', sa.Integer(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['import_batch_id'], ['import_batch.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_import_batch_file_import_batch_id'), 'import_batch_file', ['import_batch_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_import_batch_file_import_batch_id'), table_name='import_batch_file')
+    op.drop_table('import_batch_file')
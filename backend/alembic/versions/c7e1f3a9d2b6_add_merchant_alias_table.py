@@ -0,0 +1,38 @@
+"""add merchant alias table
+
+Revision ID: c7e1f3a9d2b6
+Revises: a41d7b9e0c25
+Create Date: 2026-10-16 16:20:41.382915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e1f3a9d2b6'
+down_revision: Union[str, None] = 'a41d7b9e0c25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('merchant_alias',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('alias', sa.String(length=255), nullable=False),
+        sa.Column('merchant_name', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'alias', name='uq_merchant_alias_user_alias')
+    )
+    op.create_index(op.f('ix_merchant_alias_user_id'), 'merchant_alias', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_merchant_alias_user_id'), table_name='merchant_alias')
+    op.drop_table('merchant_alias')
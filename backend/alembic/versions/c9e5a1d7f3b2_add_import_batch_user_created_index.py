@@ -0,0 +1,25 @@
+"""add import_batch user/created_at index
+
+Revision ID: c9e5a1d7f3b2
+Revises: b7d3f9e1c5a8
+Create Date: 2026-10-17 16:41:12.730518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e5a1d7f3b2'
+down_revision: Union[str, None] = 'b7d3f9e1c5a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_import_batch_user_created', 'import_batch', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_import_batch_user_created', table_name='import_batch')
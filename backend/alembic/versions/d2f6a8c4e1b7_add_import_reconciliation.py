@@ -0,0 +1,29 @@
+"""add import reconciliation count and transaction date index
+
+Revision ID: d2f6a8c4e1b7
+Revises: b8d4e2a6f1c3
+Create Date: 2026-10-17 09:12:37.408215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f6a8c4e1b7'
+down_revision: Union[str, None] = 'b8d4e2a6f1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('import_batch', sa.Column('reconciled_count', sa.Integer(), nullable=True, server_default='0'))
+    op.create_index('ix_transaction_account_date', 'transaction', ['account_id', 'transaction_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transaction_account_date', table_name='transaction')
+    with op.batch_alter_table('import_batch') as batch_op:
+        batch_op.drop_column('reconciled_count')
@@ -0,0 +1,69 @@
+"""move import_batch.file_content to the statement blob store
+
+Revision ID: e5a7c3d9f214
+Revises: 8d2e4f6a1b93
+Create Date: 2026-10-16 11:27:05.274316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from app.services.blob_store import StatementBlobStore
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c3d9f214'
+down_revision: Union[str, None] = '8d2e4f6a1b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('import_batch', sa.Column('file_hash', sa.String(length=64), nullable=True))
+    op.add_column('import_batch', sa.Column('file_size', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_import_batch_file_hash'), 'import_batch', ['file_hash'], unique=False)
+
+    # 将已有的文件内容逐行移入存储，避免一次性读入所有批次
+    store = StatementBlobStore()
+    connection = op.get_bind()
+    batch_ids = connection.execute(
+        sa.text("SELECT id FROM import_batch WHERE file_content IS NOT NULL AND file_content != ''")
+    ).scalars().all()
+    for batch_id in batch_ids:
+        content = connection.execute(
+            sa.text("SELECT file_content FROM import_batch WHERE id = :id"), {"id": batch_id}
+        ).scalar_one()
+        data = content.encode('utf-8')
+        connection.execute(
+            sa.text("UPDATE import_batch SET file_hash = :file_hash, file_size = :file_size WHERE id = :id"),
+            {"file_hash": store.put_bytes(data), "file_size": len(data), "id": batch_id}
+        )
+
+    with op.batch_alter_table('import_batch') as batch_op:
+        batch_op.drop_column('file_content')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('import_batch') as batch_op:
+        batch_op.add_column(sa.Column('file_content', sa.String(), nullable=True))
+
+    store = StatementBlobStore()
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.text("SELECT id, file_hash FROM import_batch WHERE file_hash IS NOT NULL")
+    ).all()
+    for batch_id, file_hash in rows:
+        if not store.exists(file_hash):
+            continue
+        with store.open(file_hash) as blob:
+            content = blob.read().decode('utf-8', errors='replace')
+        connection.execute(
+            sa.text("UPDATE import_batch SET file_content = :content WHERE id = :id"),
+            {"content": content, "id": batch_id}
+        )
+
+    op.drop_index(op.f('ix_import_batch_file_hash'), table_name='import_batch')
+    with op.batch_alter_table('import_batch') as batch_op:
+        batch_op.drop_column('file_hash')
+        batch_op.drop_column('file_size')
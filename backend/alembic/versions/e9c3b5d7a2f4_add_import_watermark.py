@@ -0,0 +1,32 @@
+"""add finance_account import watermark and import_batch skipped_count
+
+Revision ID: e9c3b5d7a2f4
+Revises: d2f6a8c4e1b7
+Create Date: 2026-10-17 10:26:51.730942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9c3b5d7a2f4'
+down_revision: Union[str, None] = 'd2f6a8c4e1b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('finance_account', sa.Column('import_watermark_date', sa.DateTime(), nullable=True))
+    op.add_column('finance_account', sa.Column('import_watermark_fingerprints', sa.JSON(), nullable=True))
+    op.add_column('import_batch', sa.Column('skipped_count', sa.Integer(), nullable=True, server_default='0'))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('import_batch') as batch_op:
+        batch_op.drop_column('skipped_count')
+    with op.batch_alter_table('finance_account') as batch_op:
+        batch_op.drop_column('import_watermark_fingerprints')
+        batch_op.drop_column('import_watermark_date')
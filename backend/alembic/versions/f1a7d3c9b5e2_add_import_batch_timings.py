@@ -0,0 +1,27 @@
+"""add import_batch timings
+
+Revision ID: f1a7d3c9b5e2
+Revises: e9c3b5d7a2f4
+Create Date: 2026-10-17 11:48:05.213870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a7d3c9b5e2'
+down_revision: Union[str, None] = 'e9c3b5d7a2f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('import_batch', sa.Column('timings', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('import_batch') as batch_op:
+        batch_op.drop_column('timings')
@@ -0,0 +1,27 @@
+"""add finance_account import mapping profile
+
+Revision ID: f3b9d6e1a8c4
+Revises: c7e1f3a9d2b6
+Create Date: 2026-10-16 17:02:13.574820
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b9d6e1a8c4'
+down_revision: Union[str, None] = 'c7e1f3a9d2b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('finance_account', sa.Column('import_mapping', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('finance_account') as batch_op:
+        batch_op.drop_column('import_mapping')
@@ -135,6 +135,7 @@ class FinanceAccountUpdate(BaseModel):
     card_type: Optional[FinanceAccountCardType] = None
     account_number: Optional[str] = None
     status: Optional[FinanceAccountStatus] = None
+    import_mapping: Optional[Dict[str, Any]] = None
 
 # Transaction Models
 class TransactionBase(BaseModel):
@@ -214,6 +215,18 @@ class CategoryUpdate(BaseModel):
     icon: Optional[str] = None
     color: Optional[str] = None
 
+class MerchantAliasCreate(BaseModel):
+    alias: str = Field(..., description="原始描述或规范化后的商家名")
+    merchant_name: str = Field(..., description="统一使用的商家名称")
+
+class WatchedFolderCreate(BaseModel):
+    account_id: str = Field(..., description="导入到的账户")
+    path: str = Field(..., description="监视的目录")
+    pattern: str = Field("*", description="文件名匹配模式")
+    recursive: bool = Field(False, description="是否包含子目录")
+    auto_create: bool = Field(False, description="处理后直接创建交易")
+    import_existing: bool = Field(False, description="是否导入目录中已有的文件")
+
 class CategoryResponse(CategoryBase):
     id: str
     user_id: str
@@ -302,7 +315,8 @@ class ImportBatchResponse(BaseModel):
     account_id: str
     statement_format: BankStatementFormat
     file_name: str
-    file_content: str
+    file_hash: Optional[str] = None
+    file_size: Optional[int] = None
     status: str  # pending, processing, completed, error
     error_message: Optional[str] = None
     processed_count: int
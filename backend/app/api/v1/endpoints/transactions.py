@@ -1,25 +1,35 @@
+import asyncio
+import json
 from datetime import datetime
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.db.session import get_session
 from app.core.auth_jwt import get_current_user
 from app.services.transaction_service import TransactionService
 from app.services.category_service import CategoryService
-from app.services.import_service import ImportService
+from app.services.import_service import BATCH_PAGE_SIZE, PREVIEW_PAGE_SIZE, ImportService
+from app.services.import_jobs import import_job_runner
+from app.services.merchant_normalizer import list_merchant_aliases, save_merchant_alias
+from app.models.enums import BankStatementFormat
 from app.models.user import User
 from app.api.v1.endpoints.api_models import (
     TransactionCreate,
     TransactionUpdate,
     CategoryCreate,
     CategoryUpdate,
+    MerchantAliasCreate,
     TransactionFilter,
     BaseResponse
 )
 
 router = APIRouter()
 
+# 导入进度推送间隔（秒）
+PROGRESS_STREAM_INTERVAL = 0.5
+
 # Transaction endpoints
 @router.post("/", response_model=BaseResponse[dict])
 async def create_transaction(
@@ -58,6 +68,21 @@ async def list_transactions(
     )
     return BaseResponse(data=[t.to_dict() for t in transactions])
 
+# 需在 /{transaction_id} 之前注册，否则 "import" 会被当作交易 ID
+@router.get("/import", response_model=BaseResponse[dict])
+async def list_import_batches(
+    account_id: Optional[str] = None,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = BATCH_PAGE_SIZE,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """按创建时间倒序分页获取导入批次摘要（含各状态的行数），nextCursor 为空表示没有更多批次"""
+    import_service = ImportService(session)
+    batches, next_cursor = import_service.list_import_batches(current_user, account_id, status, cursor, limit)
+    return BaseResponse(data={"batches": batches, "nextCursor": next_cursor})
+
 @router.get("/{transaction_id}", response_model=BaseResponse[dict])
 async def get_transaction(
     transaction_id: str,
@@ -177,20 +202,43 @@ async def delete_category(
 # Import endpoints
 @router.post("/import", response_model=BaseResponse[dict])
 async def create_import_batch(
-    file: UploadFile = File(...),
+    file: List[UploadFile] = File(...),
     account_id: str = Form(...),
-    statement_format: Optional[str] = Form(None),
+    statement_format: Optional[BankStatementFormat] = Form(None),
+    mapping: Optional[str] = Form(None),
+    ignore_watermark: bool = Form(False),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
-    """创建导入批次"""
+    """创建导入批次
+
+    file 可以重复多次，也可以是 zip 压缩包，多个文件合并为一个批次（各文件状态见 files）；
+    mapping 为通用 CSV 的列映射 JSON，会保存到账户；
+    默认跳过账户导入水位之前的行，补导更早的对账单时设置 ignore_watermark。
+    """
+    try:
+        column_mapping = json.loads(mapping) if mapping else None
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="mapping must be valid JSON")
     import_service = ImportService(session)
-    batch = await import_service.create_import_batch(
-        current_user,
-        file,
-        account_id,
-        statement_format
-    )
+    if len(file) > 1:
+        batch = await import_service.create_multi_file_import_batch(
+            current_user,
+            account_id,
+            file,
+            statement_format,
+            column_mapping,
+            ignore_watermark
+        )
+    else:
+        batch = await import_service.create_import_batch(
+            current_user,
+            account_id,
+            file[0],
+            statement_format,
+            column_mapping,
+            ignore_watermark
+        )
     return BaseResponse(data=batch.to_dict())
 
 @router.get("/import/{batch_id}", response_model=BaseResponse[dict])
@@ -213,11 +261,100 @@ async def process_import_batch(
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
-    """处理导入批次"""
+    """提交后台任务处理导入批次，进度通过 /progress 查询"""
     import_service = ImportService(session)
-    batch = import_service.process_import_batch(current_user, batch_id, auto_create)
-    if not batch:
-        raise HTTPException(status_code=404, detail="Import batch not found")
+    batch = import_service.queue_import_batch(current_user, batch_id)
+    import_job_runner.submit(batch.id, current_user.id, auto_create)
+    return BaseResponse(data=batch.to_dict())
+
+@router.get("/import/{batch_id}/progress", response_model=BaseResponse[dict])
+async def get_import_progress(
+    batch_id: str,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """获取导入批次的处理进度"""
+    import_service = ImportService(session)
+    batch = import_service.get_import_batch(current_user, batch_id)
+    return BaseResponse(data=batch.to_progress_dict())
+
+@router.get("/import/{batch_id}/progress/stream")
+async def stream_import_progress(
+    batch_id: str,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """以 Server-Sent Events 推送导入进度，直到任务结束"""
+    import_service = ImportService(session)
+    import_service.get_import_batch(current_user, batch_id)
+
+    async def events():
+        while True:
+            session.expire_all()
+            progress = import_service.get_import_batch(current_user, batch_id).to_progress_dict()
+            yield f"data: {json.dumps(progress)}\n\n"
+            if progress["status"] not in ("queued", "processing"):
+                break
+            await asyncio.sleep(PROGRESS_STREAM_INTERVAL)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@router.get("/import/{batch_id}/rows", response_model=BaseResponse[dict])
+async def get_import_rows(
+    batch_id: str,
+    cursor: int = 0,
+    limit: int = PREVIEW_PAGE_SIZE,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """按 row_number 游标分页获取批次的原始交易，nextCursor 为空表示没有更多行"""
+    import_service = ImportService(session)
+    rows, next_cursor = import_service.get_raw_rows_page(current_user, batch_id, cursor, limit)
+    return BaseResponse(data={"rows": rows, "nextCursor": next_cursor})
+
+@router.get("/import/{batch_id}/rows/stream")
+def stream_import_rows(
+    batch_id: str,
+    cursor: int = 0,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """以 NDJSON（每行一个 JSON 对象）流式输出批次的全部原始交易"""
+    import_service = ImportService(session)
+    chunks = import_service.iter_raw_row_chunks(current_user, batch_id, cursor)
+
+    # 同步生成器由 StreamingResponse 在线程池中迭代，逐块读库不阻塞事件循环
+    def lines():
+        for chunk in chunks:
+            yield "".join(json.dumps(row) + "\n" for row in chunk)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@router.post("/import/{batch_id}/cancel", response_model=BaseResponse[dict])
+async def cancel_import_batch(
+    batch_id: str,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """取消正在处理的导入批次"""
+    import_service = ImportService(session)
+    batch = import_service.cancel_import_batch(current_user, batch_id)
+    if not import_job_runner.cancel(batch.id):
+        # 没有对应的后台任务（例如应用重启前遗留的批次），直接结束
+        batch = import_service.finish_orphaned_batch(batch)
+    return BaseResponse(data=batch.to_progress_dict())
+
+@router.post("/import/{batch_id}/reparse", response_model=BaseResponse[dict])
+def reparse_import_batch(
+    batch_id: str,
+    statement_format: Optional[BankStatementFormat] = None,
+    ignore_watermark: bool = False,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """从原始文件重新解析导入批次"""
+    import_service = ImportService(session)
+    batch = import_service.reparse_import_batch(current_user, batch_id, statement_format, ignore_watermark)
     return BaseResponse(data=batch.to_dict())
 
 @router.post("/import/{batch_id}/confirm", response_model=BaseResponse[dict])
@@ -234,6 +371,37 @@ async def confirm_import_batch(
         raise HTTPException(status_code=404, detail="Import batch not found")
     return BaseResponse(data=batch.to_dict())
 
+@router.post("/import/{batch_id}/undo", response_model=BaseResponse[dict])
+async def undo_import_batch(
+    batch_id: str,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """撤销导入批次：删除其创建的全部交易并回退账户余额"""
+    import_service = ImportService(session)
+    batch = import_service.undo_import_batch(current_user, batch_id)
+    return BaseResponse(data=batch.to_dict())
+
+# Merchant alias endpoints
+@router.get("/merchants/aliases", response_model=BaseResponse[List[dict]])
+async def get_merchant_aliases(
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """获取商家别名列表"""
+    aliases = list_merchant_aliases(session, current_user.id)
+    return BaseResponse(data=[alias.to_dict() for alias in aliases])
+
+@router.post("/merchants/aliases", response_model=BaseResponse[dict])
+async def create_merchant_alias(
+    alias_in: MerchantAliasCreate,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """新增或更新商家别名，之后的导入会使用别名作为商家名称"""
+    alias = save_merchant_alias(session, current_user.id, alias_in.alias, alias_in.merchant_name)
+    return BaseResponse(data=alias.to_dict())
+
 # Analytics endpoints
 @router.get("/analytics/category-summary", response_model=BaseResponse[dict])
 async def get_category_summary(
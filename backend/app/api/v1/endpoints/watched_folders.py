@@ -0,0 +1,70 @@
+from typing import List
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.db.session import get_session
+from app.core.auth_jwt import get_current_user
+from app.services.watched_folder import WatchedFolderService
+from app.models.user import User
+from app.api.v1.endpoints.api_models import BaseResponse, WatchedFolderCreate
+
+router = APIRouter()
+
+@router.post("/", response_model=BaseResponse[dict])
+def create_watched_folder(
+    folder_in: WatchedFolderCreate,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """添加监视目录，其中新出现的对账单自动导入到指定账户"""
+    service = WatchedFolderService(session)
+    folder = service.create_folder(
+        current_user,
+        folder_in.account_id,
+        folder_in.path,
+        folder_in.pattern,
+        folder_in.recursive,
+        folder_in.auto_create,
+        folder_in.import_existing
+    )
+    return BaseResponse(data=folder.to_dict())
+
+@router.get("/", response_model=BaseResponse[List[dict]])
+async def list_watched_folders(
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """获取监视目录列表"""
+    folders = WatchedFolderService(session).list_folders(current_user)
+    return BaseResponse(data=[folder.to_dict() for folder in folders])
+
+@router.get("/{folder_id}/files", response_model=BaseResponse[List[dict]])
+async def list_watched_files(
+    folder_id: str,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """获取监视目录中已见过的文件及其导入结果"""
+    files = WatchedFolderService(session).list_files(current_user, folder_id)
+    return BaseResponse(data=[watched_file.to_dict() for watched_file in files])
+
+@router.post("/{folder_id}/scan", response_model=BaseResponse[List[dict]])
+def scan_watched_folder(
+    folder_id: str,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """立即扫描监视目录，返回本次创建的导入批次"""
+    service = WatchedFolderService(session)
+    batches = service.scan_folder(service.get_folder(current_user, folder_id))
+    return BaseResponse(data=[batch.to_dict() for batch in batches])
+
+@router.delete("/{folder_id}", response_model=BaseResponse)
+async def delete_watched_folder(
+    folder_id: str,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """停止监视目录"""
+    WatchedFolderService(session).delete_folder(current_user, folder_id)
+    return BaseResponse(message="Watched folder deleted successfully")
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import system, user_init, auth, users, accounts, transactions, budgets, reports, category_rules, menus
+from app.api.v1.endpoints import system, user_init, auth, users, accounts, transactions, budgets, reports, category_rules, menus, watched_folders
 # 创建主路由器
 api_router = APIRouter()
 
@@ -62,3 +62,9 @@ api_router.include_router(
     prefix="/menus",
     tags=["menus"]
 )
+
+api_router.include_router(
+    watched_folders.router,
+    prefix="/watched-folders",
+    tags=["watched-folders"]
+)
@@ -5,7 +5,9 @@ from pathlib import Path
 from functools import cached_property
 from app.core.runtime_config import RuntimeConfig
 
+import os
 import secrets
+import sys
 
 class ConfigSettings(BaseSettings):
     # 基础配置
@@ -48,6 +50,20 @@ class ConfigSettings(BaseSettings):
         description="Additional CORS origins"
     )
 
+    # 导入配置
+    IMPORT_MAX_WORKERS: int = Field(
+        default=2,
+        description="Maximum number of concurrent background import jobs"
+    )
+    IMPORT_PARSE_PROCESSES: Optional[int] = Field(
+        default=None,
+        description="Worker processes for parsing multi-file imports (defaults to the CPU count)"
+    )
+    IMPORT_WATCH_INTERVAL: int = Field(
+        default=60,
+        description="Seconds between scans of watched statement folders"
+    )
+
     # 安全配置
     SECRET_KEY: str = Field(
         default_factory=lambda: secrets.token_urlsafe(32),
@@ -12,9 +12,12 @@ from app.models.transaction import (
     Transaction,
     TransactionCategory,
     ImportBatch,
+    ImportBatchFile,
     RawTransaction
 )
 from app.models.category_rule import CategoryRule
+from app.models.merchant_alias import MerchantAlias
+from app.models.watched_folder import WatchedFolder, WatchedFile
 
 __all__ = [
     'Base',
@@ -32,6 +35,10 @@ __all__ = [
     'Transaction',
     'TransactionCategory',
     'ImportBatch',
+    'ImportBatchFile',
     'RawTransaction',
-    'CategoryRule'
+    'CategoryRule',
+    'MerchantAlias',
+    'WatchedFolder',
+    'WatchedFile'
 ]
@@ -121,6 +121,9 @@ class BankStatementFormat(str, Enum):
     RBC_CHECKING = "rbc_checking"   # RBC支票账户
     RBC_CREDIT = "rbc_credit"      # RBC信用卡
     RBC_SAVING = "rbc_saving"      # RBC储蓄账户
+    GENERIC_CSV = "generic_csv"    # 按列映射导入的通用CSV
+    OFX = "ofx"                    # OFX/QFX（SGML 1.x 和 XML 2.x）
+    XLSX = "xlsx"                  # Excel 工作簿（按标题行或列映射导入）
 
 class TransactionDirection(str, Enum):
     """交易方向"""
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, String, ForeignKey, DateTime, Numeric, Enum, Text, Index
+from sqlalchemy import Column, String, ForeignKey, DateTime, Numeric, Enum, Text, Index, JSON
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from app.models.base import Base
 from app.models.enums import (
@@ -30,6 +30,11 @@ class FinanceAccount(Base):
         default=FinanceAccountStatus.ACTIVE,
         nullable=False
     )
+    # 通用 CSV 导入的列映射配置（ColumnMapping.to_dict()）
+    import_mapping: Mapped[dict] = mapped_column(JSON, nullable=True)
+    # 导入水位：已导入交易的最晚入账日期及该日期上已导入交易的指纹，重复下载的对账单据此跳过已导入的行
+    import_watermark_date: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    import_watermark_fingerprints: Mapped[list] = mapped_column(JSON, nullable=True)
     
     user: Mapped["User"] = relationship("User", back_populates="finance_accounts")
     transactions: Mapped[list["Transaction"]] = relationship(
@@ -60,7 +65,9 @@ class FinanceAccount(Base):
             "cardType": self.card_type.value if self.card_type else None,
             "accountNumber": self.account_number,
             "userId": self.user_id,
-            "status": self.status.value
+            "status": self.status.value,
+            "importMapping": self.import_mapping,
+            "importWatermarkDate": self.import_watermark_date.date().isoformat() if self.import_watermark_date else None
         }
 
 class Budget(Base):
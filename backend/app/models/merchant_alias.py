@@ -0,0 +1,28 @@
+from sqlalchemy import ForeignKey, String, UniqueConstraint
+from sqlalchemy.orm import relationship, Mapped, mapped_column
+from app.models.base import Base
+
+
+class MerchantAlias(Base):
+    """User-defined mapping from a normalized merchant key to a canonical merchant name"""
+    __tablename__ = "merchant_alias"
+    __table_args__ = (
+        UniqueConstraint("user_id", "alias", name="uq_merchant_alias_user_alias"),
+    )
+
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True)
+    alias: Mapped[str] = mapped_column(String(255), nullable=False)  # Merchant key produced by the normalizer
+    merchant_name: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    # Relationships
+    user = relationship("User", back_populates="merchant_aliases")
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "userId": self.user_id,
+            "alias": self.alias,
+            "merchantName": self.merchant_name,
+            "createdAt": self.created_at.isoformat() if self.created_at else None,
+            "updatedAt": self.updated_at.isoformat() if self.updated_at else None
+        }
@@ -1,7 +1,7 @@
 from datetime import datetime
-from sqlalchemy import Column, String, ForeignKey, DateTime, Numeric, Enum, JSON, ARRAY, Float, Integer, Boolean
+from sqlalchemy import Column, String, ForeignKey, DateTime, Numeric, Enum, JSON, ARRAY, Float, Integer, Boolean, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
-from typing import List
+from typing import List, Optional
 from app.models.base import Base
 from app.models.enums import (
     Currency,
@@ -60,6 +60,12 @@ class TransactionCategory(Base):
 class Transaction(Base):
     """交易记录"""
     __tablename__ = "transaction"
+    __table_args__ = (
+        # 导入去重按账户 + 指纹批量查找
+        Index("ix_transaction_account_fingerprint", "account_id", "fingerprint"),
+        # 导入对账按账户 + 日期范围一次查询
+        Index("ix_transaction_account_date", "account_id", "transaction_date"),
+    )
 
     user_id = Column(String, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
     account_id = Column(String, ForeignKey("finance_account.id", ondelete="CASCADE"), nullable=False)
@@ -79,6 +85,7 @@ class Transaction(Base):
     import_batch_id = Column(String, ForeignKey("import_batch.id", ondelete="SET NULL"))
     raw_transaction_id = Column(String, ForeignKey("raw_transaction.id", ondelete="SET NULL"))
     transaction_metadata = Column(JSON)
+    fingerprint = Column(String(40))  # 去重指纹，见 services/transaction_fingerprint.py
 
     user: Mapped["User"] = relationship("User", back_populates="transactions")
     account = relationship("FinanceAccount", foreign_keys=[account_id], back_populates="transactions")
@@ -114,6 +121,7 @@ class Transaction(Base):
             "import_batch_id": self.import_batch_id,
             "raw_transaction_id": self.raw_transaction_id,
             "transaction_metadata": self.transaction_metadata,
+            "fingerprint": self.fingerprint,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat()
         }
@@ -121,16 +129,35 @@ class Transaction(Base):
 class ImportBatch(Base):
     """导入批次"""
     __tablename__ = "import_batch"
+    __table_args__ = (
+        # 批次列表按用户 + 创建时间键集分页
+        Index("ix_import_batch_user_created", "user_id", "created_at"),
+    )
 
     user_id = Column(String, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
     account_id = Column(String, ForeignKey("finance_account.id", ondelete="CASCADE"), nullable=False)
     statement_format = Column(Enum(BankStatementFormat), nullable=False)
     file_name = Column(String, nullable=False)
-    file_content = Column(String, nullable=False)
+    file_hash = Column(String(64), index=True)  # 原始文件在对账单存储中的 SHA-256
+    file_size = Column(Integer)
     status = Column(String, nullable=False, default="pending")
     error_message = Column(String)
     processed_count = Column(Integer, default=0)
 
+    # 后台导入任务状态
+    parsed_count = Column(Integer, default=0)
+    categorized_count = Column(Integer, default=0)
+    deduplicated_count = Column(Integer, default=0)
+    reconciled_count = Column(Integer, default=0)  # 与手工录入的交易对上、不再新建的行数
+    skipped_count = Column(Integer, default=0)  # 早于账户导入水位、解析后直接跳过的行数
+    category_key_count = Column(Integer, default=0)  # 自动分类时去重后的不同描述数（实际匹配次数）
+    inserted_count = Column(Integer, default=0)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    # 各次操作（import / process / confirm）的行数和分阶段耗时（秒），用于诊断慢导入
+    timings = Column(JSON)
+
     user = relationship("User", back_populates="import_batches")
     account = relationship("FinanceAccount", back_populates="import_batches")
     raw_transactions: Mapped[list["RawTransaction"]] = relationship(
@@ -142,6 +169,13 @@ class ImportBatch(Base):
         "Transaction",
         back_populates="import_batch"
     )
+    # 多文件（或 zip）导入时批次包含的各个文件
+    files: Mapped[list["ImportBatchFile"]] = relationship(
+        "ImportBatchFile",
+        back_populates="import_batch",
+        cascade="all, delete-orphan",
+        order_by="ImportBatchFile.position"
+    )
 
     def to_dict(self):
         return {
@@ -150,16 +184,80 @@ class ImportBatch(Base):
             "accountId": self.account_id,
             "statementFormat": self.statement_format.value,
             "fileName": self.file_name,
+            "fileHash": self.file_hash,
+            "fileSize": self.file_size,
             "status": self.status,
             "errorMessage": self.error_message,
             "processedCount": self.processed_count,
+            "files": [batch_file.to_dict() for batch_file in self.files],
+            "timings": self.timings or {},
+            **self.to_progress_dict(),
             "createdAt": self.created_at.isoformat(),
             "updatedAt": self.updated_at.isoformat()
         }
 
+    @property
+    def category_dedupe_ratio(self) -> Optional[float]:
+        """平均每次分类匹配覆盖的行数"""
+        if not self.category_key_count:
+            return None
+        return round((self.categorized_count or 0) / self.category_key_count, 2)
+
+    def to_progress_dict(self):
+        return {
+            "status": self.status,
+            "errorMessage": self.error_message,
+            "parsedCount": self.parsed_count or 0,
+            "categorizedCount": self.categorized_count or 0,
+            "deduplicatedCount": self.deduplicated_count or 0,
+            "reconciledCount": self.reconciled_count or 0,
+            "skippedCount": self.skipped_count or 0,
+            "categoryKeyCount": self.category_key_count or 0,
+            "categoryDedupeRatio": self.category_dedupe_ratio,
+            "insertedCount": self.inserted_count or 0,
+            "cancelRequested": bool(self.cancel_requested),
+            "startedAt": self.started_at.isoformat() if self.started_at else None,
+            "finishedAt": self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class ImportBatchFile(Base):
+    """多文件导入批次中的单个文件及其解析状态"""
+    __tablename__ = "import_batch_file"
+
+    import_batch_id = Column(String, ForeignKey("import_batch.id", ondelete="CASCADE"), nullable=False, index=True)
+    position = Column(Integer, nullable=False)  # 上传（或 zip 内）的顺序
+    file_name = Column(String, nullable=False)
+    file_hash = Column(String(64), nullable=False)  # 文件在对账单存储中的 SHA-256
+    file_size = Column(Integer)
+    statement_format = Column(Enum(BankStatementFormat))  # 无法识别格式时为空
+    status = Column(String, nullable=False, default="pending")  # pending / parsed / error
+    error_message = Column(String)
+    parsed_count = Column(Integer, default=0)
+    duplicate_count = Column(Integer, default=0)  # 与批次中其他文件重叠而被跳过的行数
+
+    import_batch: Mapped["ImportBatch"] = relationship("ImportBatch", back_populates="files")
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "position": self.position,
+            "fileName": self.file_name,
+            "fileHash": self.file_hash,
+            "fileSize": self.file_size,
+            "statementFormat": self.statement_format.value if self.statement_format else None,
+            "status": self.status,
+            "errorMessage": self.error_message,
+            "parsedCount": self.parsed_count or 0,
+            "duplicateCount": self.duplicate_count or 0
+        }
+
 class RawTransaction(Base):
     """原始交易记录"""
     __tablename__ = "raw_transaction"
+    __table_args__ = (
+        # 导入流程按 row_number 键集分块读取
+        Index("ix_raw_transaction_batch_row", "import_batch_id", "row_number"),
+    )
 
     import_batch_id = Column(String, ForeignKey("import_batch.id", ondelete="CASCADE"), nullable=False)
     row_number = Column(Integer, nullable=False)
@@ -168,6 +266,7 @@ class RawTransaction(Base):
     status = Column(String, nullable=False, default="pending")
     error_message = Column(String)
     transaction_id = Column(String, ForeignKey("transaction.id", ondelete="SET NULL"))
+    fingerprint = Column(String(40), index=True)
 
     import_batch: Mapped["ImportBatch"] = relationship("ImportBatch", back_populates="raw_transactions")
     transaction: Mapped["Transaction"] = relationship("Transaction",
@@ -185,6 +284,8 @@ class RawTransaction(Base):
             "status": self.status,
             "errorMessage": self.error_message,
             "transactionId": self.transaction_id,
+            "fingerprint": self.fingerprint,
+            "isDuplicate": self.status == "duplicate",
             "createdAt": self.created_at.isoformat(),
             "updatedAt": self.updated_at.isoformat()
         }
\ No newline at end of file
@@ -93,6 +93,18 @@ class User(Base):
         cascade="all, delete-orphan"
     )
 
+    merchant_aliases: Mapped[List["MerchantAlias"]] = relationship(
+        "MerchantAlias",
+        back_populates="user",
+        cascade="all, delete-orphan"
+    )
+
+    watched_folders: Mapped[List["WatchedFolder"]] = relationship(
+        "WatchedFolder",
+        back_populates="user",
+        cascade="all, delete-orphan"
+    )
+
     # 密码处理方法
     def set_password(self, password: str) -> None:
         """设置用户密码"""
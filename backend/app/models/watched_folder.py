@@ -0,0 +1,84 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import Base
+
+
+class WatchedFolder(Base):
+    """监视目录：其中新出现或有变化的对账单自动导入到对应账户"""
+    __tablename__ = "watched_folder"
+    __table_args__ = (
+        UniqueConstraint("user_id", "path", name="uq_watched_folder_user_path"),
+    )
+
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True)
+    account_id: Mapped[str] = mapped_column(String(36), ForeignKey("finance_account.id", ondelete="CASCADE"), nullable=False)
+    path: Mapped[str] = mapped_column(String(1024), nullable=False)  # 目录的绝对路径
+    pattern: Mapped[str] = mapped_column(String(255), nullable=False, default="*")  # 文件名匹配模式
+    recursive: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    auto_create: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)  # 处理后直接创建交易
+    is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    last_scanned_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+
+    user = relationship("User", back_populates="watched_folders")
+    account = relationship("FinanceAccount")
+    files: Mapped[List["WatchedFile"]] = relationship(
+        "WatchedFile",
+        back_populates="folder",
+        cascade="all, delete-orphan"
+    )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "userId": self.user_id,
+            "accountId": self.account_id,
+            "path": self.path,
+            "pattern": self.pattern,
+            "recursive": self.recursive,
+            "autoCreate": self.auto_create,
+            "isActive": self.is_active,
+            "lastScannedAt": self.last_scanned_at.isoformat() if self.last_scanned_at else None,
+            "lastError": self.last_error,
+            "createdAt": self.created_at.isoformat() if self.created_at else None,
+            "updatedAt": self.updated_at.isoformat() if self.updated_at else None
+        }
+
+
+class WatchedFile(Base):
+    """监视目录中已见过的文件：大小和修改时间用于判断是否变化，内容哈希用于识别内容未变或重复下载的文件"""
+    __tablename__ = "watched_file"
+    __table_args__ = (
+        UniqueConstraint("folder_id", "path", name="uq_watched_file_folder_path"),
+    )
+
+    folder_id: Mapped[str] = mapped_column(String(36), ForeignKey("watched_folder.id", ondelete="CASCADE"), nullable=False)
+    path: Mapped[str] = mapped_column(String(1024), nullable=False)  # 相对于监视目录的路径
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    mtime_ns: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    file_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)
+    # baseline（添加目录时已存在，不导入）/ imported / duplicate（内容与已导入的文件相同）/ error
+    status: Mapped[str] = mapped_column(String, nullable=False)
+    error_message: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    import_batch_id: Mapped[Optional[str]] = mapped_column(
+        String(36), ForeignKey("import_batch.id", ondelete="SET NULL"), nullable=True
+    )
+
+    folder: Mapped["WatchedFolder"] = relationship("WatchedFolder", back_populates="files")
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "folderId": self.folder_id,
+            "path": self.path,
+            "size": self.size,
+            "fileHash": self.file_hash,
+            "status": self.status,
+            "errorMessage": self.error_message,
+            "importBatchId": self.import_batch_id,
+            "updatedAt": self.updated_at.isoformat() if self.updated_at else None
+        }
@@ -1,21 +1,66 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
-from decimal import Decimal
-from typing import List, Dict, Optional
+from typing import IO, Any, ClassVar, List, Dict, Iterator, Optional, TextIO, Tuple, Type, TypeVar
 import csv
+import importlib
+import re
 from io import StringIO
 
 from app.models.enums import (
-    BankStatementFormat, TransactionType, Currency, TransactionStatus
+    BankStatementFormat, TransactionType, Currency,
+    SystemTransactionCategory
 )
-from app.models.transaction import TransactionCategory
+from app.services.keyword_engine import KeywordAutomaton
+from app.services.merchant_normalizer import canonical_merchant
+from app.services.parsed_row import LineRecorder, ParsedRow
+from app.services.row_decoder import RowDecoder, is_amount, peek_rows
+from app.services.text_sniffer import decode_sample, open_text_stream, sample_lines, sniff_text, stream_delimiter
+
+# 格式识别时读取的文件头字节数（识别开销与文件大小无关）
+DETECT_SAMPLE_SIZE = 8 * 1024
+# 识别结果的最低置信度，低于该值视为无法识别
+MIN_DETECT_CONFIDENCE = 0.5
+
+RBC_HEADER_PREFIX = ("account type", "account number")
+CARD_NUMBER_PATTERN = re.compile(r"^\d{4}\*+\d{4}$")
+# RBC 导出的金额列及对应币种
+RBC_AMOUNT_COLUMNS = {"CAD$": Currency.CAD, "USD$": Currency.USD}
+# 定义在其他模块中、需要注册到 ParserFactory 的解析器
+PARSER_MODULES = ("app.services.ofx_parser", "app.services.xlsx_parser")
+
+
+def sample_rows(sample: bytes) -> List[List[str]]:
+    """按识别出的编码和分隔符把文件头样本解码为 CSV 行（丢弃可能被截断的最后一行和空行）"""
+    text_format = sniff_text(sample)
+    lines = sample_lines(decode_sample(sample, text_format.encoding))
+    try:
+        return list(csv.reader(lines, delimiter=text_format.delimiter))
+    except csv.Error:
+        # 不是 CSV 文本（如含 NUL 的二进制文件），各 CSV 格式的置信度为 0
+        return []
+
+
+def _is_iso_date(value: str) -> bool:
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
 
 class BankStatementParser(ABC):
     """银行对账单解析器基类"""
-    
+
+    # 为 True 时 iter_rows 直接读取二进制文件（如 Excel 工作簿），否则读取按识别出的编码转码后的文本流
+    binary: ClassVar[bool] = False
+
+    def parse(self, content: str) -> List[ParsedRow]:
+        """解析对账单内容（一次性读入，适用于小文件）"""
+        return list(self.iter_rows(StringIO(content)))
+
     @abstractmethod
-    def parse(self, content: str) -> List[Dict]:
-        """解析对账单内容"""
+    def iter_rows(self, stream: TextIO) -> Iterator[ParsedRow]:
+        """逐行解析文本流，按需产出交易记录，内存占用与文件大小无关"""
         pass
 
     @abstractmethod
@@ -23,245 +68,361 @@ class BankStatementParser(ABC):
         """获取对账单格式"""
         pass
 
+    def detect(self, sample: bytes) -> float:
+        """根据文件头样本给出该格式的置信度（0~1）"""
+        return 0.0
 
-class CIBCCreditParser(BankStatementParser):
-    """CIBC信用卡对账单解析器"""
-    
-    def get_statement_format(self) -> BankStatementFormat:
-        return BankStatementFormat.CIBC_CREDIT
-    
-    def parse(self, content: str) -> List[Dict]:
-        results = []
-        reader = csv.reader(StringIO(content))
-        
-        for row in reader:
-            if len(row) != 5:  # 日期,描述,支出,收入,卡号
+
+def open_statement_stream(parser: BankStatementParser, file: IO[bytes]) -> IO:
+    """按解析器的需要提供输入：二进制格式直接读取文件，其余按文件头识别的编码增量转码为文本流"""
+    if parser.binary:
+        return file
+    return open_text_stream(file)
+
+
+ParserType = TypeVar("ParserType", bound=Type[BankStatementParser])
+
+
+class ParserFactory:
+    """解析器注册表"""
+
+    _parsers: ClassVar[Dict[BankStatementFormat, BankStatementParser]] = {}
+    _modules_loaded: ClassVar[bool] = False
+
+    @classmethod
+    def _load_modules(cls) -> None:
+        """导入其他模块中的解析器以完成注册（它们依赖本模块，首次查询注册表时再导入）"""
+        if not cls._modules_loaded:
+            cls._modules_loaded = True
+            for module in PARSER_MODULES:
+                importlib.import_module(module)
+
+    @classmethod
+    def register(cls, parser_cls: ParserType) -> ParserType:
+        """注册解析器（类装饰器）"""
+        parser = parser_cls()
+        cls._parsers[parser.get_statement_format()] = parser
+        return parser_cls
+
+    @classmethod
+    def get_parser(cls, format: BankStatementFormat) -> Optional[BankStatementParser]:
+        """获取指定格式的解析器"""
+        cls._load_modules()
+        return cls._parsers.get(format)
+
+    @classmethod
+    def formats(cls) -> List[BankStatementFormat]:
+        """已注册的对账单格式"""
+        cls._load_modules()
+        return list(cls._parsers)
+
+    @classmethod
+    def score(cls, sample: bytes) -> List[Tuple[BankStatementFormat, float]]:
+        """对样本计算各格式的置信度，按置信度从高到低排列"""
+        cls._load_modules()
+        sample = sample[:DETECT_SAMPLE_SIZE]
+        scores = [(format, parser.detect(sample)) for format, parser in cls._parsers.items()]
+        return sorted(scores, key=lambda item: item[1], reverse=True)
+
+    @classmethod
+    def detect_format(cls, sample: bytes) -> Optional[BankStatementFormat]:
+        """根据文件头样本识别格式"""
+        scores = cls.score(sample)
+        if scores and scores[0][1] >= MIN_DETECT_CONFIDENCE:
+            return scores[0][0]
+        return None
+
+
+class CIBCStatementParser(BankStatementParser):
+    """CIBC对账单解析器基类（无标题行，日期,描述,支出,收入[,卡号]）"""
+
+    column_count: ClassVar[int]
+
+    def detect(self, sample: bytes) -> float:
+        rows = sample_rows(sample)
+        if not rows:
+            return 0.0
+        return sum(1 for row in rows if self._is_data_row(row)) / len(rows)
+
+    def _is_data_row(self, row: List[str]) -> bool:
+        return (
+            len(row) == self.column_count
+            and _is_iso_date(row[0])
+            and any(row[2:4])
+            and all(is_amount(value) for value in row[2:4] if value)
+        )
+
+    def iter_rows(self, stream: TextIO) -> Iterator[ParsedRow]:
+        delimiter = stream_delimiter(stream)
+        recorder = LineRecorder(stream)
+        sample, records = peek_rows(recorder.records(csv.reader(recorder, delimiter=delimiter)))
+        decoder = RowDecoder.compile(
+            [row for row, _ in sample if len(row) == self.column_count],
+            date_columns={0: "%Y-%m-%d"},
+            amount_columns=(2, 3),  # 支出,收入
+        )
+
+        for row, line in records:
+            if len(row) != self.column_count:
                 continue
-                
-            date_str, description, debit, credit, card = row
-            
-            # 解析日期
+
+            # 解析日期和金额（整数分）
             try:
-                transaction_date = datetime.strptime(date_str, "%Y-%m-%d")
+                transaction_date = decoder.date(row, 0)
+                amount = decoder.first_amount(row)
             except ValueError:
                 continue
-                
-            # 解析金额
-            try:
-                if debit:
-                    amount = abs(Decimal(debit.replace(",", "")))
-                    type = TransactionType.EXPENSE
-                elif credit:
-                    amount = abs(Decimal(credit.replace(",", "")))
-                    type = TransactionType.INCOME if "PAYMENT" not in description.upper() else TransactionType.TRANSFER
-                else:
-                    continue
-            except (ValueError, decimal.InvalidOperation):
+            if amount is None:
                 continue
-                
+
             # 清理描述（去除多余的引号）
-            description = description.strip('"')
-            
-            # 构建原始数据
-            raw_data = {
-                "date": date_str,
-                "description": description,
-                "debit": debit,
-                "credit": credit,
-                "card": card
-            }
-            
-            # 构建处理后的数据
-            processed_data = {
-                "transaction_date": transaction_date.isoformat(),
-                "posted_date": None,  # CIBC不提供过账日期
-                "amount": float(amount),
-                "currency": Currency.CAD.value,
-                "type": type.value,
-                "category": self._guess_category(description),
-                "merchant": self._extract_merchant(description),
-                "description": description,
-                "notes": None,
-                "tags": [],
-                "status": TransactionStatus.PENDING.value,
-                "metadata": {
-                    "card_last_4": card[-4:] if card else None,
-                    "original_amount": debit or credit,
-                }
-            }
-            
-            results.append({
-                "raw_data": raw_data,
-                "processed_data": processed_data
-            })
-            
-        return results
-    
+            description = row[1].strip('"')
+
+            column, cents = amount
+            type = self._debit_type(description) if column == 2 else self._credit_type(description)
+
+            yield ParsedRow(
+                line,
+                transaction_date,  # CIBC不提供过账日期
+                abs(cents),
+                type.value,
+                description,
+                category=self._guess_category(description),
+                merchant=canonical_merchant(description),
+                metadata=self._metadata(row),
+                delimiter=delimiter,
+            )
+
+    def _metadata(self, row: List[str]) -> Tuple[Tuple[str, Any], ...]:
+        return ()
+
+    def _debit_type(self, description: str) -> TransactionType:
+        return TransactionType.EXPENSE
+
+    def _credit_type(self, description: str) -> TransactionType:
+        return TransactionType.INCOME
+
     def _guess_category(self, description: str) -> str:
-        """根据描述猜测交易类别"""
-        description = description.upper()
-        
-        # 收入类别
-        if "PAYMENT" in description:
-            return TransactionCategory.TRANSFER.value
-        elif "REFUND" in description:
-            return TransactionCategory.REFUND.value
-            
-        # 支出类别
-        if "COSTCO" in description:
-            return TransactionCategory.FOOD.value if "WHOLESALE" in description else TransactionCategory.TRANSPORTATION.value
-        elif any(store in description for store in ["T&T", "FOOD BASICS", "WALMART", "SOBEYS"]):
-            return TransactionCategory.FOOD.value
-        elif "LCBO" in description or "RESTAURANT" in description:
-            return TransactionCategory.ENTERTAINMENT.value
-        elif "GAS" in description or "ESSO" in description or "SHELL" in description:
-            return TransactionCategory.TRANSPORTATION.value
-        elif "INSURANCE" in description:
-            return TransactionCategory.INSURANCE.value
-        elif "MEDICAL" in description or "PHARMACY" in description:
-            return TransactionCategory.HEALTHCARE.value
-        elif "AMAZON" in description or "SHOPPING" in description:
-            return TransactionCategory.SHOPPING.value
-        
-        return TransactionCategory.OTHER.value
-    
-    def _extract_merchant(self, description: str) -> Optional[str]:
-        """从描述中提取商家名称"""
-        # 移除通用前缀和后缀
-        parts = description.split()
-        if len(parts) > 1:
-            return parts[0]  # 通常第一个词是商家名称
-        return None
+        return SystemTransactionCategory.OTHER.value
 
 
-class RBCCheckingParser(BankStatementParser):
-    """RBC支票账户对账单解析器"""
-    
+@ParserFactory.register
+class CIBCCreditParser(CIBCStatementParser):
+    """CIBC信用卡对账单解析器"""
+
+    column_count = 5  # 日期,描述,支出,收入,卡号
+
     def get_statement_format(self) -> BankStatementFormat:
-        return BankStatementFormat.RBC_CHECKING
-    
-    def parse(self, content: str) -> List[Dict]:
-        results = []
-        reader = csv.DictReader(StringIO(content))
-        
-        for row in reader:
-            # 解析日期
+        return BankStatementFormat.CIBC_CREDIT
+
+    def _is_data_row(self, row: List[str]) -> bool:
+        return super()._is_data_row(row) and bool(CARD_NUMBER_PATTERN.match(row[4].strip()))
+
+    def _metadata(self, row: List[str]) -> Tuple[Tuple[str, Any], ...]:
+        return (("card_last_4", row[4][-4:] if row[4] else None),)
+
+    def _credit_type(self, description: str) -> TransactionType:
+        return TransactionType.INCOME if "PAYMENT" not in description.upper() else TransactionType.TRANSFER_IN
+
+    def _guess_category(self, description: str) -> str:
+        return guess_card_category(description)
+
+
+@ParserFactory.register
+class CIBCDebitParser(CIBCStatementParser):
+    """CIBC借记卡（储蓄/支票）对账单解析器"""
+
+    column_count = 4  # 日期,描述,支出,收入
+
+    def get_statement_format(self) -> BankStatementFormat:
+        return BankStatementFormat.CIBC_DEBIT
+
+    def _debit_type(self, description: str) -> TransactionType:
+        return TransactionType.TRANSFER_OUT if "TRANSFER" in description.upper() else TransactionType.EXPENSE
+
+    def _credit_type(self, description: str) -> TransactionType:
+        return TransactionType.TRANSFER_IN if "TRANSFER" in description.upper() else TransactionType.INCOME
+
+    def _guess_category(self, description: str) -> str:
+        return guess_banking_category(description)
+
+
+class RBCStatementParser(BankStatementParser):
+    """RBC对账单解析器基类（同一种导出格式，按 Account Type 区分账户类型）"""
+
+    account_types: ClassVar[Tuple[str, ...]]
+
+    def detect(self, sample: bytes) -> float:
+        rows = sample_rows(sample)
+        if not rows:
+            return 0.0
+        header = tuple(column.strip().lower() for column in rows[0][:2])
+        if header != RBC_HEADER_PREFIX:
+            return 0.0
+        data_rows = [row for row in rows[1:] if row]
+        if not data_rows:
+            return MIN_DETECT_CONFIDENCE
+        # 标题行确定是 RBC，再按 Account Type 列确定具体账户类型
+        matched = sum(1 for row in data_rows if row[0].strip().lower() in self.account_types)
+        return MIN_DETECT_CONFIDENCE + (1 - MIN_DETECT_CONFIDENCE) * matched / len(data_rows)
+
+    def iter_rows(self, stream: TextIO) -> Iterator[ParsedRow]:
+        delimiter = stream_delimiter(stream)
+        recorder = LineRecorder(stream)
+        reader = csv.DictReader(recorder, delimiter=delimiter)
+        if reader.fieldnames is None:
+            return
+        recorder.take()  # 丢弃标题行
+        sample, records = peek_rows(recorder.records(reader))
+        decoder = RowDecoder.compile(
+            [row for row, _ in sample],
+            date_columns={"Transaction Date": "%m/%d/%Y", "Posting Date": "%m/%d/%Y"},
+            amount_columns=tuple(RBC_AMOUNT_COLUMNS),
+        )
+
+        for row, line in records:
+            # 解析日期和金额（整数分，CAD$ 为空时取 USD$）
             try:
-                transaction_date = datetime.strptime(row["Transaction Date"], "%m/%d/%Y")
-                posted_date = datetime.strptime(row["Posting Date"], "%m/%d/%Y") if "Posting Date" in row else None
-            except ValueError:
+                transaction_date = decoder.date(row, "Transaction Date")
+                posted_date = decoder.date(row, "Posting Date") if row.get("Posting Date") else None
+                amount = decoder.first_amount(row)
+            except (ValueError, TypeError, KeyError, AttributeError):
                 continue
-                
-            # 合并描述
+            if amount is None:
+                continue
+
+            # 合并描述（Description 1 多为交易类型，Description 2 才是商家/对方）
             description = f"{row['Description 1']}"
-            if row.get("Description 2", "").strip():
+            counterparty = (row.get("Description 2") or "").strip()
+            if counterparty:
                 description += f" - {row['Description 2']}"
-                
-            # 解析金额和类型
-            try:
-                amount = abs(Decimal(row["CAD$"].replace(",", "")))
-                if "DEPOSIT" in description.upper() or "CREDIT" in description.upper():
-                    type = TransactionType.INCOME
-                elif "TRANSFER" in description.upper():
-                    type = TransactionType.TRANSFER
-                else:
-                    type = TransactionType.EXPENSE
-            except (ValueError, decimal.InvalidOperation):
-                continue
-                
-            # 构建原始数据
-            raw_data = dict(row)
-            
-            # 构建处理后的数据
-            processed_data = {
-                "transaction_date": transaction_date.isoformat(),
-                "posted_date": posted_date.isoformat() if posted_date else None,
-                "amount": float(amount),
-                "currency": Currency.CAD.value,
-                "type": type.value,
-                "category": self._guess_category(description),
-                "merchant": self._extract_merchant(description),
-                "description": description,
-                "notes": None,
-                "tags": [],
-                "status": TransactionStatus.PENDING.value,
-                "metadata": {
-                    "account_number": f"****{row['Account Number'][-4:]}" if row.get("Account Number") else None,
-                    "balance": row.get("Balance", None),
-                }
-            }
-            
-            results.append({
-                "raw_data": raw_data,
-                "processed_data": processed_data
-            })
-            
-        return results
-    
-    def _guess_category(self, description: str) -> str:
-        """根据描述猜测交易类别"""
+
+            column, signed_cents = amount
+            account_number = row.get("Account Number")
+
+            yield ParsedRow(
+                line,
+                transaction_date,
+                abs(signed_cents),
+                self._transaction_type(signed_cents, description).value,
+                description,
+                category=self._guess_category(description),
+                merchant=canonical_merchant(counterparty or row["Description 1"]),
+                posted_date=posted_date,
+                currency=RBC_AMOUNT_COLUMNS[column].value,
+                metadata=(
+                    ("account_number", f"****{account_number[-4:]}" if account_number else None),
+                    ("balance", row.get("Balance")),
+                ),
+                delimiter=delimiter,
+            )
+
+    def _transaction_type(self, signed_cents: int, description: str) -> TransactionType:
         description = description.upper()
-        
-        # 收入类别
-        if "PAYROLL" in description or "SALARY" in description:
-            return TransactionCategory.SALARY.value
-        elif "INTEREST" in description:
-            return TransactionCategory.INTEREST.value
-        elif "REFUND" in description:
-            return TransactionCategory.REFUND.value
-            
-        # 支出类别
-        if "MORTGAGE" in description or "RENT" in description:
-            return TransactionCategory.HOUSING.value
-        elif "INSURANCE" in description:
-            return TransactionCategory.INSURANCE.value
-        elif "HYDRO" in description or "WATER" in description or "GAS" in description:
-            return TransactionCategory.UTILITIES.value
-        elif "TRANSFER" in description or "E-TRANSFER" in description:
-            return TransactionCategory.TRANSFER.value
-        elif "INVESTMENT" in description or "TFSA" in description or "RSP" in description:
-            return TransactionCategory.INVESTMENT.value
-        elif "DONATION" in description or "CHARITY" in description:
-            return TransactionCategory.CHARITY.value
-        
-        return TransactionCategory.OTHER.value
-    
-    def _extract_merchant(self, description: str) -> Optional[str]:
-        """从描述中提取商家名称"""
-        parts = description.split('-')
-        if len(parts) > 1:
-            return parts[0].strip()
-        return None
+        if "TRANSFER" in description:
+            return TransactionType.TRANSFER_IN if signed_cents > 0 else TransactionType.TRANSFER_OUT
+        elif signed_cents > 0 or "DEPOSIT" in description or "CREDIT" in description:
+            return TransactionType.INCOME
+        return TransactionType.EXPENSE
 
+    def _guess_category(self, description: str) -> str:
+        return guess_banking_category(description)
 
-class ParserFactory:
-    """解析器工厂"""
-    
-    _parsers = {
-        BankStatementFormat.CIBC_CREDIT: CIBCCreditParser(),
-        BankStatementFormat.RBC_CHECKING: RBCCheckingParser()
-    }
-    
-    @classmethod
-    def get_parser(cls, format: BankStatementFormat) -> Optional[BankStatementParser]:
-        """获取指定格式的解析器"""
-        return cls._parsers.get(format)
-    
-    @classmethod
-    def guess_format(cls, content: str) -> Optional[BankStatementFormat]:
-        """根据内容猜测格式"""
-        # 读取第一行
-        first_line = content.split('\n')[0].strip()
-        
-        # RBC格式有固定的标题行
-        if first_line.startswith('"Account Type","Account Number"'):
-            return BankStatementFormat.RBC_CHECKING
-            
-        # CIBC格式是日期开头的数据行
-        try:
-            datetime.strptime(first_line.split(',')[0], "%Y-%m-%d")
-            return BankStatementFormat.CIBC_CREDIT
-        except (ValueError, IndexError):
-            pass
-            
-        return None
+
+@ParserFactory.register
+class RBCCheckingParser(RBCStatementParser):
+    """RBC支票账户对账单解析器"""
+
+    account_types = ("chequing", "checking")
+
+    def get_statement_format(self) -> BankStatementFormat:
+        return BankStatementFormat.RBC_CHECKING
+
+
+@ParserFactory.register
+class RBCSavingParser(RBCStatementParser):
+    """RBC储蓄账户对账单解析器"""
+
+    account_types = ("savings", "saving")
+
+    def get_statement_format(self) -> BankStatementFormat:
+        return BankStatementFormat.RBC_SAVING
+
+
+@ParserFactory.register
+class RBCCreditParser(RBCStatementParser):
+    """RBC信用卡对账单解析器（负数为消费，正数为还款/退款）"""
+
+    account_types = ("visa", "mastercard")
+
+    def get_statement_format(self) -> BankStatementFormat:
+        return BankStatementFormat.RBC_CREDIT
+
+    def _transaction_type(self, signed_cents: int, description: str) -> TransactionType:
+        if signed_cents < 0:
+            return TransactionType.EXPENSE
+        return TransactionType.TRANSFER_IN if "PAYMENT" in description.upper() else TransactionType.INCOME
+
+    def _guess_category(self, description: str) -> str:
+        return guess_card_category(description)
+
+
+# 信用卡交易的类别关键词，越靠前优先级越高
+CARD_CATEGORY_KEYWORDS = [
+    # 收入类别
+    ("PAYMENT", SystemTransactionCategory.TRANSFER),
+    ("REFUND", SystemTransactionCategory.INCOME_REFUND),
+    # 支出类别
+    ("COSTCO WHOLESALE", SystemTransactionCategory.SHOPPING_GROCERY),
+    ("COSTCO", SystemTransactionCategory.TRANSPORT_FUEL),  # Costco 加油站
+    ("T&T", SystemTransactionCategory.SHOPPING_GROCERY),
+    ("FOOD BASICS", SystemTransactionCategory.SHOPPING_GROCERY),
+    ("WALMART", SystemTransactionCategory.SHOPPING_GROCERY),
+    ("SOBEYS", SystemTransactionCategory.SHOPPING_GROCERY),
+    ("LCBO", SystemTransactionCategory.ENTERTAINMENT),
+    ("RESTAURANT", SystemTransactionCategory.ENTERTAINMENT),
+    ("GAS", SystemTransactionCategory.TRANSPORT_FUEL),
+    ("ESSO", SystemTransactionCategory.TRANSPORT_FUEL),
+    ("SHELL", SystemTransactionCategory.TRANSPORT_FUEL),
+    ("INSURANCE", SystemTransactionCategory.HEALTHCARE_INSURANCE),
+    ("MEDICAL", SystemTransactionCategory.HEALTHCARE_MEDICAL),
+    ("PHARMACY", SystemTransactionCategory.HEALTHCARE_MEDICAL),
+    ("AMAZON", SystemTransactionCategory.SHOPPING),
+    ("SHOPPING", SystemTransactionCategory.SHOPPING),
+]
+
+# 银行账户交易的类别关键词，越靠前优先级越高
+BANKING_CATEGORY_KEYWORDS = [
+    # 收入类别
+    ("PAYROLL", SystemTransactionCategory.INCOME_SALARY),
+    ("SALARY", SystemTransactionCategory.INCOME_SALARY),
+    ("INTEREST", SystemTransactionCategory.INCOME_INVESTMENT),
+    ("REFUND", SystemTransactionCategory.INCOME_REFUND),
+    # 支出类别
+    ("MORTGAGE", SystemTransactionCategory.HOUSING),
+    ("RENT", SystemTransactionCategory.HOUSING),
+    ("INSURANCE", SystemTransactionCategory.HEALTHCARE_INSURANCE),
+    ("HYDRO", SystemTransactionCategory.HOUSING_UTILITIES),
+    ("WATER", SystemTransactionCategory.HOUSING_UTILITIES),
+    ("GAS", SystemTransactionCategory.HOUSING_UTILITIES),
+    ("TRANSFER", SystemTransactionCategory.TRANSFER),
+    ("INVESTMENT", SystemTransactionCategory.OTHER),
+    ("TFSA", SystemTransactionCategory.OTHER),
+    ("RSP", SystemTransactionCategory.OTHER),
+    ("DONATION", SystemTransactionCategory.OTHER),
+    ("CHARITY", SystemTransactionCategory.OTHER),
+]
+
+# 进程内只构建一次，每次查找只扫描一遍描述
+_CARD_CATEGORIES = KeywordAutomaton((keyword, category.value) for keyword, category in CARD_CATEGORY_KEYWORDS)
+_BANKING_CATEGORIES = KeywordAutomaton((keyword, category.value) for keyword, category in BANKING_CATEGORY_KEYWORDS)
+
+
+def guess_card_category(description: str) -> str:
+    """根据描述猜测信用卡交易类别"""
+    return _CARD_CATEGORIES.match(description) or SystemTransactionCategory.OTHER.value
+
+
+def guess_banking_category(description: str) -> str:
+    """根据描述猜测银行账户交易类别"""
+    return _BANKING_CATEGORIES.match(description) or SystemTransactionCategory.OTHER.value
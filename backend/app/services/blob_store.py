@@ -0,0 +1,93 @@
+import gzip
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import IO, Optional
+
+from app.core.config import settings
+
+
+class BlobWriter:
+    """边写入边计算 SHA-256 并 gzip 压缩的临时文件，提交时按内容哈希落位"""
+
+    def __init__(self, store: "StatementBlobStore"):
+        self._store = store
+        self._hasher = hashlib.sha256()
+        self.size = 0
+        self.digest: Optional[str] = None
+        store.root.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=store.root, suffix=".tmp")
+        self._tmp = os.fdopen(fd, "wb")
+        # mtime=0 保证相同内容得到相同的压缩结果
+        self._gzip = gzip.GzipFile(fileobj=self._tmp, mode="wb", mtime=0)
+
+    def write(self, chunk: bytes) -> None:
+        self._hasher.update(chunk)
+        self._gzip.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self) -> str:
+        """完成写入；相同内容已存在时直接丢弃临时文件（天然去重）"""
+        self._gzip.close()
+        self._tmp.close()
+        self.digest = self._hasher.hexdigest()
+        target = self._store.path_for(self.digest)
+        if target.exists():
+            os.remove(self._tmp_path)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(self._tmp_path, target)
+        return self.digest
+
+    def abort(self) -> None:
+        self._gzip.close()
+        self._tmp.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def __enter__(self) -> "BlobWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+
+class StatementBlobStore:
+    """上传对账单的内容寻址压缩存储（位于 USER_DATA_PATH 下，按 SHA-256 命名）"""
+
+    def __init__(self, root: Optional[Path] = None):
+        self._root = Path(root) if root else None
+
+    @property
+    def root(self) -> Path:
+        # 延迟解析默认目录，只在真正读写文件时才创建用户数据目录
+        if self._root is None:
+            self._root = settings.USER_DATA_PATH / "statements"
+        return self._root
+
+    def path_for(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.gz"
+
+    def exists(self, digest: str) -> bool:
+        return self.path_for(digest).exists()
+
+    def writer(self) -> BlobWriter:
+        """以流的方式写入新文件"""
+        return BlobWriter(self)
+
+    def put_bytes(self, data: bytes) -> str:
+        """写入一段完整内容，返回内容哈希"""
+        with self.writer() as blob:
+            blob.write(data)
+        return blob.digest
+
+    def open(self, digest: str) -> IO[bytes]:
+        """以解压后的二进制流打开文件"""
+        path = self.path_for(digest)
+        if not path.exists():
+            raise FileNotFoundError(f"Statement blob not found: {digest}")
+        return gzip.open(path, "rb")
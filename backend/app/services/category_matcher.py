@@ -1,11 +1,14 @@
 import re
 import logging
-from typing import Dict, List, Optional, Set, Tuple
+from typing import ClassVar, Dict, List, Optional, Set, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.models.transaction import TransactionCategory
 from app.models.user import User
 from app.models.category_rule import CategoryRule
+from app.models.enums import SystemTransactionCategory
+from app.services.keyword_engine import KeywordAutomaton
 
 logger = logging.getLogger(__name__)
 
@@ -15,10 +18,33 @@ class CategoryMatcher:
     based on keyword matching.
     """
 
+    # System keywords only depend on the seeded system categories, so the
+    # mapping and its automaton are shared across instances. They are tagged
+    # with the version of the system category set they were built from and
+    # rebuilt when categories are added, edited or reseeded.
+    _keyword_cache: ClassVar[Dict[str, str]] = {}
+    _keyword_engine: ClassVar[Optional[KeywordAutomaton[str]]] = None
+    _keyword_version: ClassVar[Optional[Tuple]] = None
+
     def __init__(self, db: Session):
         self.db = db
-        self._keyword_cache = {}  # Cache for keyword mappings
         self._user_rules_cache = {}  # Cache for user-defined rules
+        self._keyword_checked = False  # The shared cache is validated once per instance
+
+    @classmethod
+    def reset_keyword_cache(cls) -> None:
+        """Drop the shared system keyword mappings (e.g. after reseeding categories)"""
+        cls._keyword_cache = {}
+        cls._keyword_engine = None
+        cls._keyword_version = None
+
+    def _system_category_version(self) -> Tuple:
+        """Row count, max id and latest update of the system categories"""
+        return tuple(self.db.query(
+            func.count(TransactionCategory.id),
+            func.max(TransactionCategory.id),
+            func.max(TransactionCategory.updated_at)
+        ).filter(TransactionCategory.is_system == True).one())
 
     def match_category(self, user: User, description: str, merchant: Optional[str] = None) -> Optional[str]:
         """
@@ -84,26 +110,29 @@ class CategoryMatcher:
 
     def _match_keywords(self, description: str, merchant: Optional[str] = None) -> Optional[str]:
         """Match using system-defined keywords"""
-        # Load keyword mappings if not cached
-        if not self._keyword_cache:
+        # Load keyword mappings if not cached, or if the system categories changed since
+        if not self._keyword_checked:
+            version = self._system_category_version()
+            if version != CategoryMatcher._keyword_version:
+                CategoryMatcher.reset_keyword_cache()
+                CategoryMatcher._keyword_version = version
+            self._keyword_checked = True
+        if self._keyword_engine is None:
             self._load_keyword_mappings()
+            if not self._keyword_cache:
+                return None
 
-        # Convert inputs to lowercase for case-insensitive matching
-        description_lower = description.lower()
-        merchant_lower = merchant.lower() if merchant else ""
+        # One pass over each text; earlier keywords in the mapping win,
+        # same as checking them one by one in order
+        engine = self._keyword_engine
 
         # Check merchant first (more specific)
-        if merchant:
-            for keyword, category_id in self._keyword_cache.items():
-                if keyword in merchant_lower:
-                    return category_id
+        category_id = engine.match(merchant)
+        if category_id:
+            return category_id
 
         # Then check description
-        for keyword, category_id in self._keyword_cache.items():
-            if keyword in description_lower:
-                return category_id
-
-        return None
+        return engine.match(description)
 
     def _load_user_rules(self, user_id: str) -> None:
         """Load user-defined categorization rules from database"""
@@ -128,6 +157,8 @@ class CategoryMatcher:
 
     def _load_keyword_mappings(self) -> None:
         """Load system-defined keyword to category mappings"""
+        keyword_cache: Dict[str, str] = {}
+
         # Query all system categories
         system_categories = self.db.query(TransactionCategory).filter(
             TransactionCategory.is_system == True
@@ -142,10 +173,15 @@ class CategoryMatcher:
 
             # Add the keywords to the cache
             for keyword in keywords:
-                self._keyword_cache[keyword] = category_id
+                keyword_cache[keyword] = category_id
 
         # Add additional common keywords for specific categories
-        self._add_common_keywords()
+        self._add_common_keywords(keyword_cache)
+
+        # Nothing seeded yet: keep loading on demand instead of caching an empty engine
+        if keyword_cache:
+            CategoryMatcher._keyword_cache = keyword_cache
+            CategoryMatcher._keyword_engine = KeywordAutomaton(keyword_cache.items())
 
     def _generate_keywords_for_category(self, category_name: str) -> List[str]:
         """Generate keywords based on category name"""
@@ -158,7 +194,7 @@ class CategoryMatcher:
 
         return keywords
 
-    def _add_common_keywords(self) -> None:
+    def _add_common_keywords(self, keyword_cache: Dict[str, str]) -> None:
         """Add common keywords for specific categories"""
         # This is where we define common keywords for each category
         # These are based on common merchant names and transaction descriptions
@@ -223,16 +259,20 @@ class CategoryMatcher:
             ]
         }
 
+        # Find the category IDs for all category keys in one query
+        system_categories = [SystemTransactionCategory(key) for key in common_keywords]
+        category_ids = dict(
+            self.db.query(TransactionCategory.system_category, TransactionCategory.id).filter(
+                TransactionCategory.system_category.in_(system_categories)
+            ).all()
+        )
+
         # Add these keywords to the cache
         for category_key, keywords in common_keywords.items():
-            # Find the category ID for this category key
-            category = self.db.query(TransactionCategory).filter(
-                TransactionCategory.system_category == category_key
-            ).first()
-
-            if category:
+            category_id = category_ids.get(SystemTransactionCategory(category_key))
+            if category_id:
                 for keyword in keywords:
-                    self._keyword_cache[keyword.lower()] = category.id
+                    keyword_cache[keyword.lower()] = category_id
 
     def add_user_rule(self, user_id: str, field: str, pattern: str, match_type: str, category_id: str) -> bool:
         """
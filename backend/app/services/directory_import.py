@@ -0,0 +1,82 @@
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.enums import BankStatementFormat
+from app.models.finance import FinanceAccount
+from app.models.transaction import ImportBatch
+from app.services.blob_store import StatementBlobStore
+from app.services.import_metrics import StageTimer
+from app.services.import_service import ImportService
+from app.services.statement_archive import ARCHIVE_READ_SIZE, StoredFile, is_archive, store_archive_members
+
+
+@dataclass
+class DirectoryImportReport:
+    """目录导入的结果和各阶段耗时"""
+    batch: ImportBatch
+    file_count: int
+    row_count: int
+    elapsed: float
+    stages: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.row_count / self.elapsed if self.elapsed else 0.0
+
+
+def collect_statement_files(directory: Path, pattern: str = "*", recursive: bool = False) -> List[Path]:
+    """目录中待导入的文件（按路径排序，跳过隐藏文件）"""
+    paths = directory.rglob(pattern) if recursive else directory.glob(pattern)
+    return sorted(path for path in paths if path.is_file() and not path.name.startswith("."))
+
+
+def store_statement_file(path: Path, blob_store: StatementBlobStore) -> List[StoredFile]:
+    """把本地文件流式写入对账单存储，zip 压缩包展开为其中的各个文件"""
+    with path.open("rb") as file:
+        if is_archive(file):
+            return store_archive_members(file, blob_store)
+        with blob_store.writer() as blob:
+            while chunk := file.read(ARCHIVE_READ_SIZE):
+                blob.write(chunk)
+    return [StoredFile(path.name, blob.digest, blob.size)]
+
+
+def import_directory(
+    db: Session,
+    account_id: str,
+    paths: List[Path],
+    source: Optional[BankStatementFormat] = None,
+    auto_create: bool = False,
+    blob_store: Optional[StatementBlobStore] = None,
+    ignore_watermark: bool = False
+) -> DirectoryImportReport:
+    """不经过 HTTP，直接用 ImportService 把一组文件导入为一个批次并完成处理"""
+    account = db.get(FinanceAccount, account_id)
+    if account is None:
+        raise ValueError(f"Account not found: {account_id}")
+    if not paths:
+        raise ValueError("No statement files to import")
+
+    timer = StageTimer()
+    service = ImportService(db, blob_store, timer)
+    started = time.perf_counter()
+
+    with timer.stage("store"):
+        stored = [item for path in paths for item in store_statement_file(path, service.blob_store)]
+    batch = service.import_stored_files(
+        account.user, account, f"{len(stored)} files", stored, source, ignore_watermark=ignore_watermark
+    )
+    with timer.stage("process"):
+        batch = service.process_import_batch(account.user, batch.id, auto_create)
+
+    return DirectoryImportReport(
+        batch=batch,
+        file_count=len(stored),
+        row_count=batch.processed_count or 0,
+        elapsed=time.perf_counter() - started,
+        stages=dict(timer.stages),
+    )
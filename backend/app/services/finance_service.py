@@ -6,6 +6,7 @@ from app.api.v1.endpoints.api_models import (
     FinanceAccountCreate, FinanceAccountUpdate,
     TransactionCreate, TransactionUpdate
 )
+from app.services.generic_csv_parser import ColumnMapping
 from fastapi import HTTPException
 
 class FinanceService:
@@ -34,6 +35,12 @@ class FinanceService:
             raise HTTPException(status_code=404, detail="Account not found")
 
         for field, value in account_data.dict(exclude_unset=True).items():
+            if field == "import_mapping" and value:
+                # 保存前校验并规范化通用 CSV 列映射
+                try:
+                    value = ColumnMapping.from_dict(value).to_dict()
+                except (ValueError, TypeError) as e:
+                    raise HTTPException(status_code=400, detail=f"Invalid import mapping: {e}")
             setattr(account, field, value)
 
         self.db.commit()
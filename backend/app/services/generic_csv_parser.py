@@ -0,0 +1,256 @@
+import csv
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple, Union
+
+from app.models.enums import BankStatementFormat, Currency, TransactionType
+from app.services.bank_parsers import BankStatementParser, guess_banking_category, guess_card_category
+from app.services.merchant_normalizer import canonical_merchant
+from app.services.parsed_row import LineRecorder, ParsedRow
+from app.services.row_decoder import DateDecoder, RowDecoder, parse_cents, peek_rows
+from app.services.text_sniffer import DEFAULT_DELIMITER, stream_delimiter
+
+ColumnRef = Union[int, str]
+RowBuilder = Callable[[List[str], str], Optional[ParsedRow]]
+
+# 映射中可以指定的字段
+MAPPING_FIELDS = ("transaction_date", "posted_date", "description", "merchant", "amount", "debit", "credit")
+
+# 识别标题行时各字段常见的列名（小写）
+HEADER_SYNONYMS: Dict[str, Tuple[str, ...]] = {
+    "transaction_date": ("transaction date", "date", "trans date", "txn date", "交易日期", "日期"),
+    "posted_date": ("posted date", "posting date", "post date", "记账日期"),
+    "description": ("description", "description 1", "description 2", "details", "transaction details",
+                    "memo", "payee", "name", "描述", "摘要"),
+    "merchant": ("merchant", "商家"),
+    "amount": ("amount", "cad$", "amount (cad)", "transaction amount", "金额"),
+    "debit": ("debit", "debits", "withdrawal", "withdrawals", "money out", "支出"),
+    "credit": ("credit", "credits", "deposit", "deposits", "money in", "收入"),
+}
+_HEADER_FIELDS = {name: field for field, names in HEADER_SYNONYMS.items() for name in names}
+
+
+@dataclass(frozen=True)
+class ColumnMapping:
+    """通用 CSV 的列映射（可保存为账户的导入配置）
+
+    列可以用标题名（不区分大小写）或从 0 开始的列号表示；description 可以由多列拼接。
+    金额二选一：amount 为有符号金额列，或 debit/credit 分别为支出/收入列。
+    """
+
+    transaction_date: ColumnRef
+    description: Tuple[ColumnRef, ...]
+    amount: Optional[ColumnRef] = None
+    debit: Optional[ColumnRef] = None
+    credit: Optional[ColumnRef] = None
+    posted_date: Optional[ColumnRef] = None
+    merchant: Optional[ColumnRef] = None
+    date_format: Optional[str] = None  # 为空时根据样本推断
+    negative_is_expense: bool = True  # 有符号金额中负数表示支出（部分信用卡导出相反）
+    has_header: bool = True
+    skip_rows: int = 0  # 标题行（无标题时为数据行）之前要跳过的行数
+    delimiter: Optional[str] = None  # 为空时根据文件头样本识别
+    currency: str = Currency.CAD.value
+
+    def __post_init__(self):
+        if not self.description:
+            raise ValueError("Mapping requires a description column")
+        if self.amount is None and self.debit is None and self.credit is None:
+            raise ValueError("Mapping requires an amount column or debit/credit columns")
+        if self.amount is not None and (self.debit is not None or self.credit is not None):
+            raise ValueError("Mapping cannot combine a signed amount column with debit/credit columns")
+        if self.delimiter is not None and len(self.delimiter) != 1:
+            raise ValueError("Delimiter must be a single character")
+        Currency(self.currency)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ColumnMapping":
+        """从 JSON 配置构建映射
+
+        支持两种写法：{"columns": {"Date": "transaction_date", ...}, "date_format": ..., ...}，
+        或只有列映射的扁平写法 {"Date": "transaction_date", ...}。
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Mapping must be an object")
+        if "columns" in data:
+            columns, options = data["columns"], {k: v for k, v in data.items() if k != "columns"}
+        else:
+            columns, options = data, {}
+        if not isinstance(columns, dict):
+            raise ValueError("Mapping columns must be an object")
+
+        has_header = bool(options.get("has_header", True))
+        fields: Dict[str, Any] = {"description": []}
+        for column, field_name in columns.items():
+            if field_name not in MAPPING_FIELDS:
+                raise ValueError(f"Unknown mapping field: {field_name}")
+            ref: ColumnRef = column
+            if isinstance(column, int) or not has_header:
+                try:
+                    ref = int(column)
+                except ValueError:
+                    raise ValueError(f"Column {column!r} must be an index when the file has no header")
+            if field_name == "description":
+                fields["description"].append(ref)
+            elif field_name in fields:
+                raise ValueError(f"Field {field_name} is mapped more than once")
+            else:
+                fields[field_name] = ref
+        if "transaction_date" not in fields:
+            raise ValueError("Mapping requires a transaction_date column")
+        fields["description"] = tuple(fields["description"])
+
+        unknown = set(options) - {f for f in cls.__dataclass_fields__ if f not in MAPPING_FIELDS}
+        if unknown:
+            raise ValueError(f"Unknown mapping options: {', '.join(sorted(unknown))}")
+        return cls(**fields, **options)
+
+    @classmethod
+    def sniff(cls, header: Sequence[str]) -> Optional["ColumnMapping"]:
+        """根据常见列名从标题行推断映射，不像标题行（缺少日期、描述或金额列）时返回 None"""
+        fields: Dict[str, Any] = {"description": []}
+        for index, name in enumerate(header):
+            field_name = _HEADER_FIELDS.get(str(name or "").strip().lower())
+            if field_name == "description":
+                fields["description"].append(index)
+            elif field_name and field_name not in fields:
+                fields[field_name] = index
+        if "amount" in fields and ("debit" in fields or "credit" in fields):
+            del fields["amount"]
+        if "transaction_date" not in fields or not fields["description"]:
+            return None
+        if not {"amount", "debit", "credit"} & set(fields):
+            return None
+        fields["description"] = tuple(fields["description"])
+        return cls(**fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """保存用的 JSON 配置（from_dict 的逆操作）"""
+        values = asdict(self)
+        columns: Dict[str, str] = {}
+        for field_name in MAPPING_FIELDS:
+            refs = values.pop(field_name)
+            for ref in (refs if field_name == "description" else (refs,)):
+                if ref is not None:
+                    columns[str(ref)] = field_name
+        return {"columns": columns, **values}
+
+    def compile(self, header: Optional[Sequence[str]], sample: Sequence[List[str]]) -> RowBuilder:
+        """按文件标题和样本行编译出专用的行转换函数（列位置、日期格式、金额方式只确定一次）"""
+        names = {name.strip().lower(): index for index, name in enumerate(header or [])}
+
+        def index_of(ref: Optional[ColumnRef]) -> Optional[int]:
+            if ref is None:
+                return None
+            if isinstance(ref, int):
+                return ref
+            if ref.strip().lower() not in names:
+                if ref.strip().isdigit():
+                    return int(ref)
+                raise ValueError(f"Column {ref!r} not found in file header")
+            return names[ref.strip().lower()]
+
+        date_index = index_of(self.transaction_date)
+        posted_index = index_of(self.posted_date)
+        merchant_index = index_of(self.merchant)
+        description_indexes = tuple(index_of(ref) for ref in self.description)
+        amount_index, debit_index, credit_index = index_of(self.amount), index_of(self.debit), index_of(self.credit)
+        width = 1 + max(i for i in (date_index, posted_index, merchant_index, amount_index,
+                                    debit_index, credit_index, *description_indexes) if i is not None)
+
+        if self.date_format:
+            decode_date = DateDecoder(self.date_format)
+        else:
+            decode_date = RowDecoder.compile(sample, {date_index: "%Y-%m-%d"}, ()).dates[date_index]
+        decode_posted = DateDecoder(decode_date.layout)
+        currency = self.currency
+
+        # 描述：单列直接取值，多列用 " - " 拼接非空值
+        if len(description_indexes) == 1:
+            description_index = description_indexes[0]
+
+            def read_description(row: List[str]) -> str:
+                return row[description_index].strip()
+        else:
+            def read_description(row: List[str]) -> str:
+                return " - ".join(part for part in (row[i].strip() for i in description_indexes) if part)
+
+        # 金额：返回 (分, 是否流入)，行没有金额时返回 None
+        if amount_index is not None:
+            inflow_sign = -1 if not self.negative_is_expense else 1
+
+            def read_amount(row: List[str]) -> Optional[Tuple[int, bool]]:
+                value = row[amount_index]
+                if not value.strip():
+                    return None
+                cents = parse_cents(value) * inflow_sign
+                return abs(cents), cents > 0
+        else:
+            def read_amount(row: List[str]) -> Optional[Tuple[int, bool]]:
+                if debit_index is not None and row[debit_index].strip():
+                    return abs(parse_cents(row[debit_index])), False
+                if credit_index is not None and row[credit_index].strip():
+                    return abs(parse_cents(row[credit_index])), True
+                return None
+
+        def build(row: List[str], line: str) -> Optional[ParsedRow]:
+            if len(row) < width:
+                return None
+            try:
+                transaction_date = decode_date(row[date_index])
+                posted = row[posted_index] if posted_index is not None else ""
+                posted_date = decode_posted(posted) if posted.strip() else None
+                amount = read_amount(row)
+            except ValueError:
+                return None
+            if amount is None:
+                return None
+
+            cents, inflow = amount
+            description = read_description(row)
+            if "TRANSFER" in description.upper():
+                type = TransactionType.TRANSFER_IN if inflow else TransactionType.TRANSFER_OUT
+            else:
+                type = TransactionType.INCOME if inflow else TransactionType.EXPENSE
+
+            return ParsedRow(
+                line,
+                transaction_date,
+                cents,
+                type.value,
+                description,
+                category=guess_banking_category(description) if inflow else guess_card_category(description),
+                merchant=canonical_merchant(row[merchant_index] if merchant_index is not None else description),
+                posted_date=posted_date,
+                currency=currency,
+                delimiter=self.delimiter or DEFAULT_DELIMITER,
+            )
+
+        return build
+
+
+class GenericCSVParser(BankStatementParser):
+    """按列映射解析任意银行导出的 CSV"""
+
+    def __init__(self, mapping: ColumnMapping):
+        self.mapping = mapping
+
+    def get_statement_format(self) -> BankStatementFormat:
+        return BankStatementFormat.GENERIC_CSV
+
+    def iter_rows(self, stream: TextIO) -> Iterator[ParsedRow]:
+        mapping = self.mapping
+        if mapping.delimiter is None:
+            mapping = replace(mapping, delimiter=stream_delimiter(stream))
+        recorder = LineRecorder(stream)
+        reader = csv.reader(recorder, delimiter=mapping.delimiter)
+        for _ in range(mapping.skip_rows):
+            next(reader, None)
+        header = next(reader, None) if mapping.has_header else None
+        recorder.take()  # 丢弃跳过的行和标题行
+
+        sample, records = peek_rows(recorder.records(reader))
+        build = mapping.compile(header, [row for row, _ in sample])
+        for row, line in records:
+            parsed = build(row, line)
+            if parsed is not None:
+                yield parsed
@@ -0,0 +1,52 @@
+import logging
+from typing import Dict, Optional, Tuple
+
+from app.models.user import User
+from app.services.category_matcher import CategoryMatcher
+from app.services.transaction_fingerprint import normalize_description
+
+logger = logging.getLogger(__name__)
+
+
+def description_key(description: str, merchant: Optional[str] = None) -> Tuple[str, str]:
+    """分类去重的键：规范化后的 (商家, 描述)，只有大小写、标点或空白不同的行共用一次匹配"""
+    return normalize_description(merchant or ""), normalize_description(description or "")
+
+
+class ImportCategorizer:
+    """导入时的自动分类
+
+    对账单中几百行通常只对应几十个不同的商家，按规范化描述去重后，
+    每个不同的键只调用一次 CategoryMatcher（以首次出现的行的原文匹配），结果复用到其余各行。
+    """
+
+    def __init__(self, matcher: CategoryMatcher, user: User):
+        self.matcher = matcher
+        self.user = user
+        self.categories: Dict[Tuple[str, str], Optional[str]] = {}
+        self.row_count = 0
+
+    def category_id(self, processed_data: Dict) -> Optional[str]:
+        """行的分类 ID（用户规则或系统关键词均未命中时为 None）"""
+        description = processed_data.get("description") or ""
+        merchant = processed_data.get("merchant")
+        key = description_key(description, merchant)
+        self.row_count += 1
+        if key not in self.categories:
+            try:
+                self.categories[key] = self.matcher.match_category(self.user, description, merchant)
+            except Exception:
+                # 匹配失败（如分类数据无法读取）不影响导入：该键不再重试，沿用解析器猜测的分类
+                logger.warning(f"Category matching failed for {description!r}", exc_info=True)
+                self.categories[key] = None
+        return self.categories[key]
+
+    @property
+    def key_count(self) -> int:
+        """实际调用 CategoryMatcher 的次数"""
+        return len(self.categories)
+
+    @property
+    def dedupe_ratio(self) -> float:
+        """平均每次匹配覆盖的行数"""
+        return self.row_count / self.key_count if self.key_count else 1.0
@@ -0,0 +1,96 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.user import User
+from app.services.import_service import ImportService
+
+logger = logging.getLogger(__name__)
+
+
+class ImportJobRunner:
+    """后台导入任务执行器：有界线程池 + 协作式取消
+
+    任务状态与进度计数保存在 ImportBatch 上，每个任务使用独立的数据库会话，
+    因此 API 请求可以随时从数据库读取进度。
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        session_factory: Optional[Callable[[], Session]] = None
+    ):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.IMPORT_MAX_WORKERS,
+            thread_name_prefix="import-job"
+        )
+        self._session_factory = session_factory
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, batch_id: str, user_id: str, auto_create: bool = False) -> Future:
+        """提交一个处理导入批次的任务"""
+        with self._lock:
+            cancel_event = self._cancel_events.setdefault(batch_id, threading.Event())
+        return self._executor.submit(self._run, batch_id, user_id, auto_create, cancel_event)
+
+    def cancel(self, batch_id: str) -> bool:
+        """通知正在运行的任务在下一个块边界停止"""
+        with self._lock:
+            cancel_event = self._cancel_events.get(batch_id)
+        if cancel_event:
+            cancel_event.set()
+        return cancel_event is not None
+
+    def recover(self) -> None:
+        """启动时把上次退出时遗留的排队/处理中批次标记为出错（它们的任务已随进程结束）"""
+        session = self._create_session()
+        try:
+            count = ImportService(session).recover_interrupted_batches()
+            if count:
+                logger.warning(f"Marked {count} interrupted import batch(es) as error")
+        except Exception:
+            # 首次启动时数据库可能尚未初始化，不影响应用启动
+            logger.exception("Recovering interrupted import batches failed")
+        finally:
+            session.close()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for cancel_event in self._cancel_events.values():
+                cancel_event.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _create_session(self) -> Session:
+        if self._session_factory is None:
+            from app.db.session import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def _run(self, batch_id: str, user_id: str, auto_create: bool, cancel_event: threading.Event) -> None:
+        session = self._create_session()
+        try:
+            user = session.get(User, user_id)
+            ImportService(session).process_import_batch(
+                user,
+                batch_id,
+                auto_create,
+                should_cancel=cancel_event.is_set
+            )
+        except HTTPException as e:
+            logger.warning(f"Import job {batch_id} failed: {e.detail}")
+        except Exception:
+            logger.exception(f"Import job {batch_id} crashed")
+        finally:
+            session.close()
+            with self._lock:
+                self._cancel_events.pop(batch_id, None)
+
+
+# 进程内共享的导入任务执行器
+import_job_runner = ImportJobRunner()
@@ -0,0 +1,82 @@
+import json
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class StageTimer:
+    """按阶段累计导入耗时（秒），同名阶段多次进入时累加
+
+    阶段可以嵌套，耗时只计入最内层的阶段（例如流式解析中穿插的写库时间不计入解析），
+    因此各阶段耗时之和等于总耗时。
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self._stack: List[List] = []  # [阶段名, 上次计时的时间点]
+
+    def _charge(self, entry: List, now: float) -> None:
+        self.stages[entry[0]] = self.stages.get(entry[0], 0.0) + now - entry[1]
+        entry[1] = now
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        now = time.perf_counter()
+        if self._stack:
+            self._charge(self._stack[-1], now)
+        self._stack.append([name, now])
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self._charge(self._stack.pop(), now)
+            if self._stack:
+                self._stack[-1][1] = now
+
+    def iterate(self, name: str, items: Iterable[T]) -> Iterator[T]:
+        """逐个产出元素，取下一个元素（如从数据库读取下一块）的耗时计入该阶段"""
+        iterator = iter(items)
+        while True:
+            with self.stage(name):
+                item = next(iterator, _DONE)
+            if item is _DONE:
+                return
+            yield item
+
+    def mark(self) -> Dict[str, float]:
+        """当前各阶段累计耗时的快照，配合 since 计算一段操作的分阶段耗时"""
+        return dict(self.stages)
+
+    def since(self, mark: Dict[str, float]) -> Dict[str, float]:
+        return {
+            name: round(seconds - mark.get(name, 0.0), 6)
+            for name, seconds in self.stages.items()
+            if seconds > mark.get(name, 0.0)
+        }
+
+    @property
+    def total(self) -> float:
+        return sum(self.stages.values())
+
+
+_DONE = object()
+
+
+def log_import_timings(batch_id: str, phase: str, rows: int, stages: Dict[str, float], status: Optional[str]) -> Dict:
+    """输出一行 JSON 格式的导入耗时日志，返回保存到批次上的记录"""
+    total = round(sum(stages.values()), 6)
+    record = {"rows": rows, "seconds": total, "stages": stages}
+    logger.info(json.dumps({
+        "event": "import_timings",
+        "batch_id": batch_id,
+        "phase": phase,
+        "status": status,
+        "rows_per_second": round(rows / total) if total else None,
+        **record,
+    }))
+    return record
@@ -0,0 +1,74 @@
+import queue
+import threading
+from itertools import islice
+from typing import Iterable, Iterator, List, NamedTuple, TypeVar
+
+T = TypeVar("T")
+
+# 相邻阶段之间的队列最多缓存的块数：下游（通常是写库）较慢时上游在此阻塞，内存中的数据量有上限
+PIPELINE_QUEUE_SIZE = 4
+# 阶段线程等待队列空位时检查下游是否已停止的间隔（秒）
+_PUT_TIMEOUT = 0.1
+
+_DONE = object()
+
+
+class _Failure(NamedTuple):
+    """上游阶段抛出的异常，交给下游在调用方线程中重新抛出"""
+    error: BaseException
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """把逐行产出的数据切成固定大小的块（最后一块可能较小），阶段之间按块交接以减少队列开销"""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def staged(items: Iterable[T], name: str, queue_size: int = PIPELINE_QUEUE_SIZE) -> Iterator[T]:
+    """在独立线程中迭代 items（一个阶段），经有界队列按顺序交给调用方
+
+    多个 staged 串联即组成流水线，各阶段同时运行；队列写满时上游阻塞（背压），
+    整体耗时接近最慢的阶段。上游的异常在调用方线程中重新抛出；调用方提前停止时
+    通知阶段线程退出并关闭它的上游，不会留下阻塞的线程。
+    阶段中不能使用数据库会话，写库留在会话所在的线程。
+    """
+    channel: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                channel.put(item, timeout=_PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run() -> None:
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(_Failure(e))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    worker = threading.Thread(target=run, name=name, daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = channel.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stopped.set()
+        worker.join()
@@ -1,23 +1,202 @@
-from typing import List, Dict, Optional, Tuple
+from typing import IO, Callable, Iterable, Iterator, List, Dict, Optional, Tuple
 from fastapi import UploadFile, HTTPException
+from sqlalchemy import Row, and_, bindparam, case, delete, func, or_, select, update
 from sqlalchemy.orm import Session
-from datetime import datetime
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+import asyncio
+import os
+import tempfile
 import uuid
 
 from app.models.user import User
 from app.models.finance import FinanceAccount
 from app.models.transaction import (
     ImportBatch,
+    ImportBatchFile,
     RawTransaction,
     Transaction
 )
-from app.models.enums import BankStatementFormat, TransactionDirection
-from app.services.bank_parsers import ParserFactory, BankStatementParser
+from app.models.enums import (
+    BankStatementFormat,
+    Currency,
+    SystemTransactionCategory,
+    TransactionStatus,
+    TransactionType
+)
+from app.services.bank_parsers import (
+    DETECT_SAMPLE_SIZE,
+    ParserFactory,
+    BankStatementParser,
+    open_statement_stream
+)
+from app.services.blob_store import StatementBlobStore
+from app.services.category_matcher import CategoryMatcher
+from app.services.generic_csv_parser import ColumnMapping, GenericCSVParser
+from app.services.import_categorizer import ImportCategorizer
+from app.services.merchant_normalizer import MerchantNormalizer
+from app.services.parsed_row import ParsedRow
+from app.services.reconciliation import day_window, ledger_entry, reconcile, statement_entry
+from app.services.import_metrics import StageTimer, log_import_timings
+from app.services.import_pipeline import chunked, staged
+from app.services.import_watermark import ImportWatermark, skip_watermarked, watermark_start
+from app.services.statement_archive import (
+    SpilledFile,
+    StoredFile,
+    drop_overlaps,
+    is_archive,
+    iter_spill,
+    merge_by_date,
+    statement_parse_pool,
+    store_archive_members
+)
+from app.services.transaction_fingerprint import fingerprint_parsed_row
+from app.services.xlsx_parser import XLSXParser
+
+# 每次刷入数据库的原始交易行数
+IMPORT_CHUNK_SIZE = 1000
+# 预览分页的默认和最大行数
+PREVIEW_PAGE_SIZE = 200
+MAX_PREVIEW_PAGE_SIZE = IMPORT_CHUNK_SIZE
+# 上传文件落盘时每次读取的字节数
+SPOOL_CHUNK_SIZE = 1024 * 1024
+# 批次列表每页的默认和最大批次数
+BATCH_PAGE_SIZE = 50
+MAX_BATCH_PAGE_SIZE = 200
+# 批次列表只查询的元数据列
+_BATCH_SUMMARY_COLUMNS = (
+    ImportBatch.id,
+    ImportBatch.account_id,
+    ImportBatch.statement_format,
+    ImportBatch.file_name,
+    ImportBatch.file_size,
+    ImportBatch.status,
+    ImportBatch.error_message,
+    ImportBatch.processed_count,
+    ImportBatch.inserted_count,
+    ImportBatch.created_at,
+    ImportBatch.updated_at,
+)
+# 原始交易的各个状态，批次列表中没有对应行的状态计为 0
+RAW_ROW_STATUSES = ("pending", "processed", "duplicate", "reconciled", "error")
+# 允许（重新）开始处理的批次状态
+PROCESSABLE_STATUSES = ["pending", "error", "cancelled", "undone"]
+# 由后台导入任务持有的批次状态（任务只存在于进程内存中）
+RUNNING_STATUSES = ["queued", "processing"]
+# 已创建交易、可以整体撤销的批次状态
+UNDOABLE_STATUSES = ["processed", "completed"]
+# 各交易类型对账户余额的影响方向（与 TransactionService._update_account_balance 一致，退款和调整不计入）
+BALANCE_SIGNS = {
+    TransactionType.EXPENSE: -1,
+    TransactionType.TRANSFER_OUT: -1,
+    TransactionType.INCOME: 1,
+    TransactionType.TRANSFER_IN: 1,
+}
+
+
+def _preview_row(row: Row) -> Dict:
+    """预览中的一行：与处理结果一致，成功处理的行状态为 success"""
+    item = {
+        "id": row.id,
+        "rowNumber": row.row_number,
+        "rawData": row.raw_data,
+        "processedData": row.processed_data,
+        "status": "success" if row.status == "processed" else row.status,
+        "duplicate": row.status == "duplicate"
+    }
+    if row.error_message:
+        item["error"] = row.error_message
+    return item
+
+
+def _raw_transaction_chunks(
+    batch_id: str,
+    account_id: str,
+    merchants: MerchantNormalizer,
+    chunks: Iterable[List[ParsedRow]]
+) -> Iterator[List[Dict]]:
+    """整理阶段：归一商家名、序列化解析结果并计算指纹，把每块 ParsedRow 转换为 raw_transaction 表的行"""
+    row_number = 0
+    for chunk in chunks:
+        now = datetime.now(timezone.utc)
+        values = []
+        for row in chunk:
+            row_number += 1
+            row.merchant = merchants.resolve(row.merchant)
+            values.append({
+                "id": str(uuid.uuid4()),
+                "import_batch_id": batch_id,
+                "row_number": row_number,
+                "raw_data": row.raw_data(),
+                "processed_data": row.processed_data(),
+                "fingerprint": fingerprint_parsed_row(account_id, row),
+                "status": "pending",
+                "created_at": now,
+                "updated_at": now
+            })
+        yield values
+
+
+def _balance_delta(transactions: Iterable[Dict]) -> Decimal:
+    """一组待写入的交易对账户余额的总影响"""
+    return sum(
+        (BALANCE_SIGNS.get(values["type"], 0) * Decimal(str(values["amount"])) for values in transactions),
+        Decimal(0)
+    )
+
+
+def _balance_effect():
+    """SQL 表达式：单笔交易对账户余额的影响（带符号的金额）"""
+    return case(
+        *((Transaction.type == transaction_type, sign * Transaction.amount)
+          for transaction_type, sign in BALANCE_SIGNS.items()),
+        else_=0
+    )
+
+
+def _batch_cursor(row: Row) -> str:
+    """批次列表的键集游标：最后一个批次的创建时间和 ID"""
+    return f"{row.created_at.isoformat()}|{row.id}"
+
+
+def _parse_batch_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        created_at, batch_id = cursor.split("|", 1)
+        return datetime.fromisoformat(created_at), batch_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _batch_summary(row: Row, counts: Dict[str, int]) -> Dict:
+    """批次列表中的一项：批次元数据和原始交易按状态的行数"""
+    return {
+        "id": row.id,
+        "accountId": row.account_id,
+        "statementFormat": row.statement_format.value if row.statement_format else None,
+        "fileName": row.file_name,
+        "fileSize": row.file_size,
+        "status": row.status,
+        "errorMessage": row.error_message,
+        "processedCount": row.processed_count or 0,
+        "insertedCount": row.inserted_count or 0,
+        "rowCounts": {status: counts.get(status, 0) for status in RAW_ROW_STATUSES},
+        "createdAt": row.created_at.isoformat(),
+        "updatedAt": row.updated_at.isoformat()
+    }
 
 
 class ImportService:
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        blob_store: Optional[StatementBlobStore] = None,
+        timer: Optional[StageTimer] = None
+    ):
         self.db = db
+        self.blob_store = blob_store or StatementBlobStore()
+        # 创建批次各阶段（落盘、识别、解析、写入）的耗时
+        self.timer = timer or StageTimer()
 
     async def create_import_batch(
         self,
@@ -25,54 +204,382 @@ class ImportService:
         account_id: str,
         file: UploadFile,
         source: Optional[BankStatementFormat] = None,
-        mapping: Optional[Dict[str, str]] = None
+        mapping: Optional[Dict[str, str]] = None,
+        ignore_watermark: bool = False
     ) -> ImportBatch:
-        """创建导入批次"""
-        # 读取文件内容
-        content = await file.read()
-        content_str = content.decode('utf-8')
+        """创建导入批次（流式解析，内存占用与文件大小无关）
 
-        # 如果没有指定格式，尝试猜测
-        if not source:
-            source = ParserFactory.guess_format(content_str)
-            if not source:
-                raise HTTPException(status_code=400, detail="无法识别的文件格式")
+        默认跳过账户导入水位之前已导入的行；补导更早的对账单时指定 ignore_watermark。
+        """
+        account = self._get_account(user, account_id)
+        mark = self.timer.mark()
 
-        # 获取解析器
-        parser = ParserFactory.get_parser(source)
-        if not parser:
-            raise HTTPException(status_code=400, detail="不支持的文件格式")
+        # 上传文件分块落盘（同时写入内容寻址存储），再以文本流的方式逐行解析
+        with self.timer.stage("spool"):
+            spool, file_hash, file_size = await self._spool_upload(file)
+        # 识别、解析和写库都是同步操作，在工作线程中执行，不阻塞事件循环
+        batch = await asyncio.to_thread(
+            self._import_spool, user, account, file.filename, spool, file_hash, file_size,
+            source, mapping, ignore_watermark
+        )
+        await asyncio.to_thread(self._record_timings, batch, "import", mark, batch.processed_count)
+        return batch
+
+    async def create_multi_file_import_batch(
+        self,
+        user: User,
+        account_id: str,
+        files: List[UploadFile],
+        source: Optional[BankStatementFormat] = None,
+        mapping: Optional[Dict[str, str]] = None,
+        ignore_watermark: bool = False
+    ) -> ImportBatch:
+        """一次导入多个文件（可包含 zip 压缩包），作为一个批次写入"""
+        account = self._get_account(user, account_id)
+        mark = self.timer.mark()
+
+        spooled: List[Tuple[str, IO[bytes], str, int]] = []
+        try:
+            with self.timer.stage("spool"):
+                for file in files:
+                    spooled.append((file.filename, *await self._spool_upload(file)))
+            stored = await asyncio.to_thread(self._store_spooled, spooled)
+        finally:
+            for _, spool, _, _ in spooled:
+                spool.close()
+        batch = await asyncio.to_thread(
+            self._import_stored_files,
+            user, account, f"{len(stored)} files", stored, source, mapping, ignore_watermark
+        )
+        await asyncio.to_thread(self._record_timings, batch, "import", mark, batch.processed_count)
+        return batch
+
+    def import_stored_files(
+        self,
+        user: User,
+        account: FinanceAccount,
+        file_name: str,
+        stored: List[StoredFile],
+        source: Optional[BankStatementFormat] = None,
+        mapping: Optional[Dict] = None,
+        ignore_watermark: bool = False
+    ) -> ImportBatch:
+        """把已写入对账单存储的文件导入为一个批次
+
+        各文件在进程池中并行解码和解析，按交易日期归并、跳过文件之间重叠的交易后写入同一批次。
+        同步执行，供不在事件循环中的调用方（目录导入、监视目录扫描）使用。
+        """
+        mark = self.timer.mark()
+        batch = self._import_stored_files(user, account, file_name, stored, source, mapping, ignore_watermark)
+        self._record_timings(batch, "import", mark, batch.processed_count)
+        return batch
+
+    def _import_spool(
+        self,
+        user: User,
+        account: FinanceAccount,
+        file_name: str,
+        spool: IO[bytes],
+        file_hash: str,
+        file_size: int,
+        source: Optional[BankStatementFormat],
+        mapping: Optional[Dict],
+        ignore_watermark: bool
+    ) -> ImportBatch:
+        """把落盘的上传文件解析并写入新批次（zip 压缩包展开后按其中的各个文件导入）"""
+        if is_archive(spool):
+            try:
+                with self.timer.stage("spool"):
+                    stored = store_archive_members(spool, self.blob_store)
+            finally:
+                spool.close()
+            return self._import_stored_files(user, account, file_name, stored, source, mapping, ignore_watermark)
+
+        stream: IO = spool
+        try:
+            with self.timer.stage("detect"):
+                source, parser = self._resolve_parser(spool, source, account, mapping)
+            stream = open_statement_stream(parser, spool)
+
+            # 创建导入批次
+            batch = ImportBatch(
+                id=str(uuid.uuid4()),
+                user_id=user.id,
+                account_id=account.id,
+                statement_format=source,
+                file_name=file_name,
+                file_hash=file_hash,
+                file_size=file_size,
+                status="pending"
+            )
+            self.db.add(batch)
+            with self.timer.stage("parse"):
+                self._parse_into_batch(
+                    batch, parser.iter_rows(stream), self._watermark(account, ignore_watermark)
+                )
+        finally:
+            stream.close()
+        return batch
+
+    def _store_spooled(self, spooled: List[Tuple[str, IO[bytes], str, int]]) -> List[StoredFile]:
+        """落盘的上传文件对应的存储文件（zip 压缩包展开为其中的各个文件）"""
+        stored: List[StoredFile] = []
+        with self.timer.stage("spool"):
+            for file_name, spool, file_hash, file_size in spooled:
+                if is_archive(spool):
+                    stored.extend(store_archive_members(spool, self.blob_store))
+                else:
+                    stored.append(StoredFile(file_name, file_hash, file_size))
+        return stored
+
+    def _import_stored_files(
+        self,
+        user: User,
+        account: FinanceAccount,
+        file_name: str,
+        stored: List[StoredFile],
+        source: Optional[BankStatementFormat],
+        mapping: Optional[Dict],
+        ignore_watermark: bool
+    ) -> ImportBatch:
+        if not stored:
+            raise HTTPException(status_code=400, detail="上传内容中没有可导入的文件")
 
-        # 创建导入批次
         batch = ImportBatch(
             id=str(uuid.uuid4()),
             user_id=user.id,
-            account_id=account_id,
-            statement_format=source,
-            file_name=file.filename,
-            file_content=content_str,
+            account_id=account.id,
+            file_name=file_name,
+            file_size=sum(item.file_size for item in stored),
             status="pending"
         )
+        with self.timer.stage("detect"):
+            jobs = self._resolve_batch_files(batch, stored, source, account, mapping)
         self.db.add(batch)
+        with self.timer.stage("parse"):
+            spilled = statement_parse_pool.parse(
+                [(parser, record.file_hash) for record, parser in jobs],
+                self.blob_store.root
+            )
+        with self.timer.stage("merge"):
+            self._merge_into_batch(batch, jobs, spilled, self._watermark(account, ignore_watermark))
+        return batch
+
+    def _resolve_batch_files(
+        self,
+        batch: ImportBatch,
+        stored: List[StoredFile],
+        source: Optional[BankStatementFormat],
+        account: FinanceAccount,
+        mapping: Optional[Dict] = None
+    ) -> List[Tuple[ImportBatchFile, BankStatementParser]]:
+        """确定批次中每个文件的格式和解析器，无法识别的文件标记为错误；批次格式取第一个可解析的文件"""
+        jobs: List[Tuple[ImportBatchFile, BankStatementParser]] = []
+        for position, item in enumerate(stored):
+            record = ImportBatchFile(
+                position=position,
+                file_name=item.file_name,
+                file_hash=item.file_hash,
+                file_size=item.file_size,
+                status="pending"
+            )
+            batch.files.append(record)
+            with self.blob_store.open(item.file_hash) as blob:
+                try:
+                    record.statement_format, parser = self._resolve_parser(blob, source, account, mapping)
+                except HTTPException as e:
+                    record.status = "error"
+                    record.error_message = e.detail
+                    continue
+            jobs.append((record, parser))
+
+        if not jobs:
+            raise HTTPException(status_code=400, detail="无法识别上传文件的格式")
+        batch.statement_format = jobs[0][0].statement_format
+        return jobs
+
+    def _merge_into_batch(
+        self,
+        batch: ImportBatch,
+        jobs: List[Tuple[ImportBatchFile, BankStatementParser]],
+        spilled: List[SpilledFile],
+        watermark: Optional[ImportWatermark] = None
+    ) -> None:
+        """归并各文件已排序的解析结果并分块写入批次，记录每个文件的解析状态和跳过的重复行数"""
+        parsed: List[Tuple[ImportBatchFile, str]] = []
+        for (record, _), result in zip(jobs, spilled):
+            record.parsed_count = result.row_count
+            record.duplicate_count = 0
+            if result.error:
+                record.status = "error"
+                record.error_message = result.error
+            else:
+                record.status = "parsed"
+                record.error_message = None
+                parsed.append((record, result.path))
+
+        # 归并在解析阶段的线程中进行，先计数，写入完成后再更新到文件记录
+        duplicates = [0] * len(parsed)
+
+        def count_duplicate(index: int) -> None:
+            duplicates[index] += 1
 
         try:
-            # 解析文件内容
-            transactions = parser.parse(content_str)
-            
-            # 创建原始交易记录
-            for i, trans_data in enumerate(transactions):
-                raw_trans = RawTransaction(
-                    import_batch_id=batch.id,
-                    row_number=i + 1,
-                    raw_data=trans_data,
-                    status="pending"
-                )
-                self.db.add(raw_trans)
-            
-            batch.processed_count = len(transactions)
-            self.db.commit()
+            merged = merge_by_date([iter_spill(path) for _, path in parsed])
+            self._parse_into_batch(batch, drop_overlaps(merged, count_duplicate), watermark)
+            for (record, _), count in zip(parsed, duplicates):
+                record.duplicate_count = count
+        finally:
+            for result in spilled:
+                if result.path:
+                    os.remove(result.path)
+
+    def reparse_import_batch(
+        self,
+        user: User,
+        batch_id: str,
+        source: Optional[BankStatementFormat] = None,
+        ignore_watermark: bool = False
+    ) -> ImportBatch:
+        """从存储的原始文件重新解析导入批次（例如更换对账单格式后）"""
+        batch = self.get_import_batch(user, batch_id)
+
+        if batch.status not in PROCESSABLE_STATUSES:
+            raise HTTPException(status_code=400, detail="Batch already processed")
+        mark = self.timer.mark()
+        if batch.files:
+            self._reparse_files(user, batch, source, ignore_watermark)
+            self._record_timings(batch, "import", mark, batch.processed_count)
             return batch
-            
+        if not batch.file_hash or not self.blob_store.exists(batch.file_hash):
+            raise HTTPException(status_code=404, detail="Original statement file not found")
+
+        account = self._get_account(user, batch.account_id)
+        blob = self.blob_store.open(batch.file_hash)
+        stream: IO = blob
+        try:
+            with self.timer.stage("detect"):
+                source, parser = self._resolve_parser(blob, source, account)
+            stream = open_statement_stream(parser, blob)
+            self.db.execute(delete(RawTransaction).where(RawTransaction.import_batch_id == batch.id))
+            batch.statement_format = source
+            batch.status = "pending"
+            batch.error_message = None
+            with self.timer.stage("parse"):
+                self._parse_into_batch(batch, parser.iter_rows(stream), self._watermark(account, ignore_watermark))
+        finally:
+            stream.close()
+        self._record_timings(batch, "import", mark, batch.processed_count)
+        return batch
+
+    def _reparse_files(
+        self,
+        user: User,
+        batch: ImportBatch,
+        source: Optional[BankStatementFormat],
+        ignore_watermark: bool = False
+    ) -> ImportBatch:
+        """重新解析多文件批次中的全部文件（指定格式时应用于每个文件）"""
+        stored = [StoredFile(f.file_name, f.file_hash, f.file_size) for f in batch.files]
+        missing = [item.file_name for item in stored if not self.blob_store.exists(item.file_hash)]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Original statement file not found: {', '.join(missing)}")
+
+        account = self._get_account(user, batch.account_id)
+        self.db.execute(delete(RawTransaction).where(RawTransaction.import_batch_id == batch.id))
+        batch.files.clear()
+        self.db.flush()
+        with self.timer.stage("detect"):
+            jobs = self._resolve_batch_files(batch, stored, source, account)
+        batch.status = "pending"
+        batch.error_message = None
+        with self.timer.stage("parse"):
+            spilled = statement_parse_pool.parse(
+                [(parser, record.file_hash) for record, parser in jobs],
+                self.blob_store.root
+            )
+        with self.timer.stage("merge"):
+            self._merge_into_batch(batch, jobs, spilled, self._watermark(account, ignore_watermark))
+        return batch
+
+    def _resolve_parser(
+        self,
+        file: IO[bytes],
+        source: Optional[BankStatementFormat],
+        account: FinanceAccount,
+        mapping: Optional[Dict] = None
+    ) -> Tuple[BankStatementFormat, BankStatementParser]:
+        """确定对账单格式和解析器（只读取文件头样本，需在文本流开始读取前调用）"""
+        mapped_formats = (None, BankStatementFormat.GENERIC_CSV, BankStatementFormat.XLSX)
+        detected = None
+        if source is None:
+            # 先根据文件头样本识别；识别为具体银行格式（如 OFX）时不使用账户保存的列映射
+            detected = ParserFactory.detect_format(file.read(DETECT_SAMPLE_SIZE))
+            file.seek(0)
+            if mapping is None and detected not in mapped_formats:
+                source = detected
+
+        # 指定了列映射，或账户保存过通用 CSV 的列映射配置（Excel 工作簿同样按映射解析）
+        if source in mapped_formats and (mapping is not None or account.import_mapping):
+            try:
+                column_mapping = ColumnMapping.from_dict(mapping if mapping is not None else account.import_mapping)
+            except (ValueError, TypeError) as e:
+                raise HTTPException(status_code=400, detail=f"无效的列映射: {e}")
+            if mapping is not None:
+                # 保存为账户的导入配置，之后同一账户的导入无需再次指定
+                account.import_mapping = column_mapping.to_dict()
+            if source is None:
+                source = BankStatementFormat.XLSX if detected == BankStatementFormat.XLSX else BankStatementFormat.GENERIC_CSV
+            if source == BankStatementFormat.XLSX:
+                return source, XLSXParser(column_mapping)
+            return source, GenericCSVParser(column_mapping)
+        if source == BankStatementFormat.GENERIC_CSV:
+            raise HTTPException(status_code=400, detail="通用 CSV 导入需要指定列映射")
+
+        if not source:
+            source = detected
+            if not source:
+                raise HTTPException(status_code=400, detail="无法识别的文件格式")
+
+        # 获取解析器
+        parser = ParserFactory.get_parser(source)
+        if not parser:
+            raise HTTPException(status_code=400, detail="不支持的文件格式")
+        return source, parser
+
+    def _get_account(self, user: User, account_id: str) -> FinanceAccount:
+        """获取用户的账户"""
+        account = self.db.query(FinanceAccount).filter(
+            FinanceAccount.id == account_id,
+            FinanceAccount.user_id == user.id
+        ).first()
+        if not account:
+            raise HTTPException(status_code=404, detail="Account not found")
+        return account
+
+    def _parse_into_batch(
+        self,
+        batch: ImportBatch,
+        rows: Iterable[ParsedRow],
+        watermark: Optional[ImportWatermark] = None
+    ) -> None:
+        """把解析器产出的交易写入批次的原始交易（有水位时先跳过已导入的行，不计算指纹也不写库）"""
+        batch.skipped_count = 0
+        skipped = 0
+        if watermark is not None:
+            # 在解析阶段的线程中调用，不直接修改 ORM 对象
+            def count_skipped() -> None:
+                nonlocal skipped
+                skipped += 1
+
+            rows = skip_watermarked(rows, batch.account_id, watermark, count_skipped)
+        try:
+            batch.processed_count = self._ingest_rows(batch, rows)
+            batch.parsed_count = batch.processed_count
+            batch.skipped_count = skipped
+            with self.timer.stage("commit"):
+                self.db.commit()
+
         except Exception as e:
             self.db.rollback()
             batch.status = "error"
@@ -81,6 +588,165 @@ class ImportService:
             self.db.commit()
             raise HTTPException(status_code=400, detail=str(e))
 
+    def _record_timings(self, batch: ImportBatch, phase: str, mark: Dict[str, float], rows: Optional[int]) -> None:
+        """把本次操作（import / process / confirm）的分阶段耗时和行数保存到批次，并输出结构化日志"""
+        record = log_import_timings(batch.id, phase, rows or 0, self.timer.since(mark), batch.status)
+        batch.timings = {**(batch.timings or {}), phase: record}
+        self.db.commit()
+
+    def _watermark(self, account: FinanceAccount, ignore_watermark: bool = False) -> Optional[ImportWatermark]:
+        return None if ignore_watermark else ImportWatermark.of(account)
+
+    def _update_import_watermark(self, account_id: str) -> None:
+        """按账户中已导入的交易重新计算导入水位（撤销导入后水位也会随之回退）"""
+        account = self.db.get(FinanceAccount, account_id)
+        posted = func.coalesce(Transaction.posted_date, Transaction.transaction_date)
+        imported = Transaction.account_id == account_id, Transaction.import_batch_id.isnot(None)
+        latest = self.db.execute(select(func.max(posted)).where(*imported)).scalar()
+        if latest is None:
+            account.import_watermark_date = None
+            account.import_watermark_fingerprints = None
+            return
+        start = watermark_start(latest)
+        account.import_watermark_date = start
+        account.import_watermark_fingerprints = list(self.db.execute(
+            select(Transaction.fingerprint).where(
+                *imported,
+                Transaction.fingerprint.isnot(None),
+                posted >= start,
+                posted < start + timedelta(days=1)
+            )
+        ).scalars())
+
+    async def _spool_upload(self, file: UploadFile) -> Tuple[IO[bytes], str, int]:
+        """将上传文件分块写入磁盘临时文件，同时存入内容寻址存储"""
+        spool = tempfile.TemporaryFile()
+        with self.blob_store.writer() as blob:
+            while chunk := await file.read(SPOOL_CHUNK_SIZE):
+                spool.write(chunk)
+                blob.write(chunk)
+        spool.seek(0)
+        return spool, blob.digest, blob.size
+
+    def _ingest_rows(self, batch: ImportBatch, rows: Iterable[ParsedRow]) -> int:
+        """按固定大小分块写入原始交易记录，返回写入的行数
+
+        解析（含解码）→ 整理 → 写库三个阶段由有界队列串联、同时运行：前两个阶段在后台线程中，
+        写库留在会话所在的线程。写库较慢时队列写满，上游随之阻塞，内存中最多只有几块数据；
+        等待上游的时间计入调用方所在的阶段（parse / merge）。
+        """
+        merchants = MerchantNormalizer.for_user(self.db, batch.user_id)
+        parsed = staged(chunked(rows, IMPORT_CHUNK_SIZE), name="import-parse")
+        prepared = staged(
+            _raw_transaction_chunks(batch.id, batch.account_id, merchants, parsed), name="import-prepare"
+        )
+        row_count = 0
+        # 写库出错时立即停止上游阶段的线程
+        with closing(prepared):
+            for chunk in prepared:
+                row_count += len(chunk)
+                self._bulk_insert(RawTransaction, chunk)
+        return row_count
+
+    def _bulk_insert(self, model, rows: List[Dict]) -> None:
+        """以 executemany 方式批量写入一块数据（绕过 ORM 工作单元）"""
+        if not rows:
+            return
+        with self.timer.stage("insert"):
+            self.db.execute(model.__table__.insert(), rows)
+        rows.clear()
+
+    def _iter_raw_chunks(
+        self,
+        batch_id: str,
+        row_numbers: Optional[List[int]] = None,
+        after_row: int = 0,
+        chunk_size: Optional[int] = None
+    ) -> Iterator[List[Row]]:
+        """按 row_number 键集分页读取原始交易（从 after_row 之后开始），每次一块"""
+        last_row_number = after_row
+        while True:
+            query = select(
+                RawTransaction.id,
+                RawTransaction.row_number,
+                RawTransaction.raw_data,
+                RawTransaction.processed_data,
+                RawTransaction.status,
+                RawTransaction.error_message,
+                RawTransaction.fingerprint
+            ).where(
+                RawTransaction.import_batch_id == batch_id,
+                RawTransaction.row_number > last_row_number
+            )
+            if row_numbers:
+                query = query.where(RawTransaction.row_number.in_(row_numbers))
+            chunk = self.db.execute(
+                query.order_by(RawTransaction.row_number).limit(chunk_size or IMPORT_CHUNK_SIZE)
+            ).all()
+            if not chunk:
+                return
+            yield chunk
+            last_row_number = chunk[-1].row_number
+
+    def _bulk_update_raw(self, updates: List[Dict]) -> None:
+        """按主键批量更新原始交易的状态和关联交易"""
+        if not updates:
+            return
+        table = RawTransaction.__table__
+        with self.timer.stage("update"):
+            self.db.execute(
+                table.update().where(table.c.id == bindparam("raw_id")).values(
+                    status=bindparam("status"),
+                    error_message=bindparam("error_message"),
+                    transaction_id=bindparam("transaction_id"),
+                    updated_at=bindparam("updated_at")
+                ),
+                updates
+            )
+        updates.clear()
+
+    def _transaction_values(
+        self,
+        batch: ImportBatch,
+        raw_transaction_id: str,
+        processed_data: Dict,
+        fingerprint: Optional[str] = None,
+        category_id: Optional[str] = None
+    ) -> Dict:
+        """将解析结果转换为 transaction 表的一行（主键预先生成）
+
+        分类优先级：解析结果中指定的分类 ID > CategoryMatcher 的匹配结果 > 解析器按描述猜测的系统分类。
+        """
+        now = datetime.now(timezone.utc)
+        category = processed_data.get("category")
+        posted_date = processed_data.get("posted_date")
+        return {
+            "id": str(uuid.uuid4()),
+            "user_id": batch.user_id,
+            "account_id": batch.account_id,
+            "import_batch_id": batch.id,
+            "raw_transaction_id": raw_transaction_id,
+            "transaction_date": datetime.fromisoformat(processed_data["transaction_date"]),
+            "posted_date": datetime.fromisoformat(posted_date) if posted_date else None,
+            "amount": processed_data["amount"],
+            "currency": Currency(processed_data["currency"]),
+            "type": TransactionType(processed_data["type"]),
+            "category_id": processed_data.get("category_id") or category_id or (
+                SystemTransactionCategory(category).id if category else None
+            ),
+            "merchant": processed_data.get("merchant"),
+            "description": processed_data["description"],
+            "notes": processed_data.get("notes"),
+            "tags": processed_data.get("tags"),
+            "status": TransactionStatus(processed_data["status"]),
+            "transaction_metadata": processed_data.get("metadata"),
+            "fingerprint": fingerprint,
+            "linked_account_id": None,
+            "linked_transaction_id": None,
+            "created_at": now,
+            "updated_at": now
+        }
+
     def get_import_batch(self, user: User, batch_id: str) -> ImportBatch:
         """获取导入批次详情"""
         batch = self.db.query(ImportBatch).filter(
@@ -93,17 +759,115 @@ class ImportService:
         
         return batch
 
+    def get_raw_rows_page(
+        self,
+        user: User,
+        batch_id: str,
+        cursor: int = 0,
+        limit: int = PREVIEW_PAGE_SIZE
+    ) -> Tuple[List[Dict], Optional[int]]:
+        """按 row_number 游标分页读取批次的原始交易，返回 (本页各行, 下一页游标)；没有更多行时游标为 None"""
+        batch = self.get_import_batch(user, batch_id)
+        limit = max(1, min(limit, MAX_PREVIEW_PAGE_SIZE))
+        chunk = next(self._iter_raw_chunks(batch.id, after_row=cursor, chunk_size=limit + 1), [])
+        rows = [_preview_row(row) for row in chunk[:limit]]
+        return rows, (rows[-1]["rowNumber"] if len(chunk) > limit else None)
+
+    def iter_raw_row_chunks(self, user: User, batch_id: str, cursor: int = 0) -> Iterator[List[Dict]]:
+        """逐块读取批次的全部原始交易，用于流式输出（批次在调用时即检查，而不是在首次迭代时）"""
+        batch = self.get_import_batch(user, batch_id)
+        return (
+            [_preview_row(row) for row in chunk]
+            for chunk in self._iter_raw_chunks(batch.id, after_row=cursor)
+        )
+
+    def queue_import_batch(self, user: User, batch_id: str) -> ImportBatch:
+        """将导入批次标记为排队，等待后台任务处理"""
+        batch = self.get_import_batch(user, batch_id)
+
+        if batch.status not in PROCESSABLE_STATUSES:
+            raise HTTPException(status_code=400, detail="Batch already processed")
+
+        batch.status = "queued"
+        batch.cancel_requested = False
+        batch.error_message = None
+        batch.started_at = None
+        batch.finished_at = None
+        self.db.commit()
+        return batch
+
+    def cancel_import_batch(self, user: User, batch_id: str) -> ImportBatch:
+        """请求取消正在排队或处理中的导入批次（协作式取消）"""
+        batch = self.get_import_batch(user, batch_id)
+
+        if batch.status not in RUNNING_STATUSES:
+            raise HTTPException(status_code=400, detail="Batch is not being processed")
+
+        batch.cancel_requested = True
+        self.db.commit()
+        return batch
+
+    def finish_orphaned_batch(self, batch: ImportBatch) -> ImportBatch:
+        """结束没有后台任务的排队/处理中批次（例如任务所在的进程已退出），直接标记为已取消
+
+        用带状态条件的 UPDATE 修改状态，任务恰好在此之前结束时不会覆盖它的结果。
+        """
+        finished = self.db.execute(
+            update(ImportBatch)
+            .where(ImportBatch.id == batch.id, ImportBatch.status.in_(RUNNING_STATUSES))
+            .values(status="cancelled", cancel_requested=False, finished_at=datetime.now(timezone.utc))
+        ).rowcount
+        if finished:
+            self._reset_batch_rows(batch)
+        self.db.commit()
+        self.db.refresh(batch)
+        return batch
+
+    def recover_interrupted_batches(self) -> int:
+        """应用启动时调用：上次退出时仍在排队或处理中的批次已没有后台任务，
+        删除已提交的部分结果并标记为出错，之后可以重新处理或撤销。返回恢复的批次数
+        """
+        batches = self.db.query(ImportBatch).filter(ImportBatch.status.in_(RUNNING_STATUSES)).all()
+        now = datetime.now(timezone.utc)
+        for batch in batches:
+            self._reset_batch_rows(batch)
+            batch.status = "error"
+            batch.error_message = "Import was interrupted before it finished"
+            batch.cancel_requested = False
+            batch.finished_at = now
+        self.db.commit()
+        return len(batches)
+
     def process_import_batch(
         self,
         user: User,
         batch_id: str,
-        auto_create: bool = False
-    ) -> Tuple[ImportBatch, List[Dict]]:
-        """处理导入批次"""
+        auto_create: bool = False,
+        should_cancel: Optional[Callable[[], bool]] = None
+    ) -> ImportBatch:
+        """处理导入批次（按块提交并更新进度计数，每块之间检查取消请求）
+
+        各行的处理结果保存在原始交易上，通过 get_raw_rows_page / iter_raw_row_chunks 按需读取。
+        """
         batch = self.get_import_batch(user, batch_id)
         
-        if batch.status not in ["pending", "error"]:
+        if batch.status not in PROCESSABLE_STATUSES + ["queued"]:
             raise HTTPException(status_code=400, detail="Batch already processed")
+
+        if batch.cancel_requested:
+            self._finish_cancelled(batch)
+            return batch
+
+        batch.status = "processing"
+        batch.started_at = datetime.now(timezone.utc)
+        batch.finished_at = None
+        batch.categorized_count = 0
+        batch.deduplicated_count = 0
+        batch.reconciled_count = 0
+        batch.category_key_count = 0
+        batch.inserted_count = 0
+        self.db.commit()
+        mark = self.timer.mark()
         
         try:
             # 获取账户信息
@@ -113,66 +877,230 @@ class ImportService:
             if not account:
                 raise HTTPException(status_code=404, detail="Account not found")
             
-            # 获取解析器
-            parser = ParserFactory.get_parser(batch.statement_format)
-            if not parser:
-                raise HTTPException(status_code=400, detail="Unsupported format")
-            
-            # 处理每个原始交易
-            results = []
-            for raw_trans in batch.raw_transactions:
-                try:
-                    # 解析交易数据
-                    processed_data = parser.process_transaction(
-                        raw_trans.raw_data,
-                        account
-                    )
-                    raw_trans.processed_data = processed_data
-                    raw_trans.status = "processed"
-                    
-                    if auto_create:
-                        # 自动创建交易记录
-                        transaction = Transaction(
-                            user_id=user.id,
-                            account_id=account.id,
-                            import_batch_id=batch.id,
-                            raw_transaction_id=raw_trans.id,
-                            **processed_data
-                        )
-                        self.db.add(transaction)
-                        raw_trans.transaction_id = transaction.id
-                    
-                    results.append({
-                        "id": raw_trans.id,
-                        "rowNumber": raw_trans.row_number,
-                        "rawData": raw_trans.raw_data,
-                        "processedData": processed_data,
-                        "status": "success"
-                    })
-                    
-                except Exception as e:
-                    raw_trans.status = "error"
-                    raw_trans.error_message = str(e)
-                    results.append({
-                        "id": raw_trans.id,
-                        "rowNumber": raw_trans.row_number,
-                        "rawData": raw_trans.raw_data,
-                        "error": str(e),
-                        "status": "error"
-                    })
+            # 账户中已有交易的指纹计数（按块增量加载），用于识别重叠对账单中的重复行
+            existing_fingerprints: Dict[str, int] = {}
+            # 与手工录入的交易对上的行，关联到已有交易而不是新建
+            with self.timer.stage("reconcile"):
+                reconciled = self._reconcile_batch(batch)
+            categorizer = ImportCategorizer(CategoryMatcher(self.db), user)
+
+            balance_delta = Decimal(0)
+            # 按块处理原始交易：校验解析结果、去重，并批量写入状态和交易记录
+            for chunk in self.timer.iterate("read", self._iter_raw_chunks(batch.id)):
+                if should_cancel and should_cancel():
+                    self._reset_batch_rows(batch)
+                    self._finish_cancelled(batch)
+                    return batch
+
+                with self.timer.stage("dedupe"):
+                    self._load_existing_fingerprints(batch, chunk, existing_fingerprints)
+                transactions: List[Dict] = []
+                raw_updates: List[Dict] = []
+                duplicate_count = 0
+                reconciled_count = 0
+                error_count = 0
+                now = datetime.now(timezone.utc)
+                with self.timer.stage("categorize"):
+                    for raw_trans in chunk:
+                        if existing_fingerprints.get(raw_trans.fingerprint, 0) > 0:
+                            # 每条已有交易只抵消一行，同一天的相同消费仍可正常导入
+                            existing_fingerprints[raw_trans.fingerprint] -= 1
+                            duplicate_count += 1
+                            raw_updates.append({
+                                "raw_id": raw_trans.id,
+                                "status": "duplicate",
+                                "error_message": None,
+                                "transaction_id": None,
+                                "updated_at": now
+                            })
+                            continue
+
+                        matched_id = reconciled.get(raw_trans.id)
+                        if matched_id:
+                            reconciled_count += 1
+                            raw_updates.append({
+                                "raw_id": raw_trans.id,
+                                "status": "reconciled",
+                                "error_message": None,
+                                "transaction_id": matched_id,
+                                "updated_at": now
+                            })
+                            continue
+
+                        try:
+                            values = self._transaction_values(
+                                batch, raw_trans.id, raw_trans.processed_data, raw_trans.fingerprint,
+                                categorizer.category_id(raw_trans.processed_data)
+                            )
+                            if auto_create:
+                                transactions.append(values)
+                            raw_updates.append({
+                                "raw_id": raw_trans.id,
+                                "status": "processed",
+                                "error_message": None,
+                                "transaction_id": values["id"] if auto_create else None,
+                                "updated_at": now
+                            })
+
+                        except Exception as e:
+                            error_count += 1
+                            raw_updates.append({
+                                "raw_id": raw_trans.id,
+                                "status": "error",
+                                "error_message": str(e),
+                                "transaction_id": None,
+                                "updated_at": now
+                            })
+
+                batch.categorized_count += len(chunk) - duplicate_count - reconciled_count - error_count
+                batch.deduplicated_count += duplicate_count
+                batch.reconciled_count += reconciled_count
+                batch.category_key_count = categorizer.key_count
+                batch.inserted_count += len(transactions)
+                balance_delta += _balance_delta(transactions)
+                self._bulk_insert(Transaction, transactions)
+                self._bulk_update_raw(raw_updates)
+                with self.timer.stage("commit"):
+                    self.db.commit()
             
-            batch.status = "processed"
-            self.db.commit()
-            return batch, results
+            # 直接创建了交易的批次已完成，不能再确认（否则会重复写入交易和余额）
+            batch.status = "completed" if auto_create else "processed"
+            batch.finished_at = datetime.now(timezone.utc)
+            if auto_create:
+                # 余额和批次状态在同一次提交中更新；中途取消或出错时已创建的交易会被删除，余额无需回退
+                self._adjust_balance(batch.account_id, balance_delta)
+                with self.timer.stage("watermark"):
+                    self._update_import_watermark(batch.account_id)
+            with self.timer.stage("commit"):
+                self.db.commit()
+            self._record_timings(batch, "process", mark, batch.parsed_count)
+            return batch
             
         except Exception as e:
             self.db.rollback()
+            # 之前的块已经提交，回退到可重新处理的状态
+            self._reset_batch_rows(batch)
             batch.status = "error"
             batch.error_message = str(e)
+            batch.finished_at = datetime.now(timezone.utc)
             self.db.add(batch)
             self.db.commit()
             raise HTTPException(status_code=400, detail=str(e))
 
+    def _reconcile_batch(self, batch: ImportBatch) -> Dict[str, str]:
+        """把批次中的行与账户中手工录入的交易对账，返回 {原始交易 id: 已有交易 id}
+
+        已有交易按对账单的日期范围一次查询，然后与批次的行排序归并，不逐行查询。
+        """
+        manual = Transaction.account_id == batch.account_id, Transaction.import_batch_id.is_(None)
+        if self.db.execute(select(Transaction.id).where(*manual).limit(1)).first() is None:
+            return {}
+
+        statement = [
+            entry for chunk in self._iter_raw_chunks(batch.id) for row in chunk
+            if (entry := statement_entry(row.id, row.processed_data)) is not None
+        ]
+        if not statement:
+            return {}
+        start, end = day_window(statement)
+        ledger = [
+            ledger_entry(*row) for row in self.db.execute(
+                select(
+                    Transaction.id,
+                    Transaction.amount,
+                    Transaction.type,
+                    Transaction.transaction_date,
+                    Transaction.merchant,
+                    Transaction.description
+                ).where(
+                    *manual,
+                    Transaction.transaction_date >= datetime.combine(start, datetime.min.time()),
+                    Transaction.transaction_date < datetime.combine(end, datetime.min.time())
+                )
+            )
+        ]
+        return reconcile(statement, ledger)
+
+    def _load_existing_fingerprints(
+        self,
+        batch: ImportBatch,
+        chunk: List[Row],
+        counts: Dict[str, int]
+    ) -> None:
+        """用一次 IN 查询加载本块中首次出现的指纹在账户中已有的交易数"""
+        new_fingerprints = {
+            row.fingerprint for row in chunk
+            if row.fingerprint and row.fingerprint not in counts
+        }
+        if not new_fingerprints:
+            return
+        counts.update(dict.fromkeys(new_fingerprints, 0))
+        counts.update(self.db.execute(
+            select(Transaction.fingerprint, func.count()).where(
+                Transaction.account_id == batch.account_id,
+                Transaction.fingerprint.in_(new_fingerprints),
+                # 排除本批次自动创建的交易
+                or_(Transaction.import_batch_id.is_(None), Transaction.import_batch_id != batch.id)
+            ).group_by(Transaction.fingerprint)
+        ).tuples().all())
+
+    def _reset_batch_rows(self, batch: ImportBatch) -> None:
+        """删除本批次已创建的交易，并将原始交易恢复为待处理"""
+        self.db.execute(
+            update(RawTransaction)
+            .where(RawTransaction.import_batch_id == batch.id)
+            .values(status="pending", error_message=None, transaction_id=None)
+        )
+        self.db.execute(delete(Transaction).where(Transaction.import_batch_id == batch.id))
+        batch.categorized_count = 0
+        batch.deduplicated_count = 0
+        batch.reconciled_count = 0
+        batch.inserted_count = 0
+
+    def _adjust_balance(self, account_id: str, delta: Decimal) -> None:
+        """按一次聚合的金额更新账户余额（单条 UPDATE，不逐笔调整）"""
+        if delta:
+            self.db.execute(
+                update(FinanceAccount)
+                .where(FinanceAccount.id == account_id)
+                .values(balance=FinanceAccount.balance + delta)
+            )
+
+    def undo_import_batch(self, user: User, batch_id: str) -> ImportBatch:
+        """撤销整个导入批次（例如导入到了错误的账户）
+
+        用一条语句删除本批次创建的全部交易，按这些交易的聚合金额一次回退账户余额，
+        原始交易恢复为待处理、导入水位随之回退，全部在同一个数据库事务中完成。
+        撤销后的批次可以重新处理或重新解析。
+        """
+        batch = self.get_import_batch(user, batch_id)
+
+        if batch.status not in UNDOABLE_STATUSES:
+            raise HTTPException(status_code=400, detail="Batch has no imported transactions to undo")
+
+        try:
+            delta = self.db.execute(
+                select(func.coalesce(func.sum(_balance_effect()), 0))
+                .where(Transaction.import_batch_id == batch.id)
+            ).scalar()
+            self._adjust_balance(batch.account_id, -Decimal(str(delta)))
+            self._reset_batch_rows(batch)
+            self._update_import_watermark(batch.account_id)
+            batch.status = "undone"
+            batch.finished_at = datetime.now(timezone.utc)
+            self.db.commit()
+            return batch
+
+        except Exception as e:
+            self.db.rollback()
+            raise HTTPException(status_code=400, detail=str(e))
+
+    def _finish_cancelled(self, batch: ImportBatch) -> None:
+        batch.status = "cancelled"
+        batch.cancel_requested = False
+        batch.finished_at = datetime.now(timezone.utc)
+        self.db.commit()
+
     def confirm_import_batch(
         self,
         user: User,
@@ -185,33 +1113,47 @@ class ImportService:
         if batch.status != "processed":
             raise HTTPException(status_code=400, detail="Batch not processed")
         
+        mark = self.timer.mark()
+        categorizer = ImportCategorizer(CategoryMatcher(self.db), user)
+        balance_delta = Decimal(0)
         try:
-            query = self.db.query(RawTransaction).filter(
-                RawTransaction.import_batch_id == batch_id
-            )
-            
-            if selected_rows:
-                query = query.filter(RawTransaction.row_number.in_(selected_rows))
-            
-            raw_transactions = query.all()
-            
-            for raw_trans in raw_transactions:
-                if raw_trans.status != "processed":
-                    continue
-                
-                # 创建交易记录
-                transaction = Transaction(
-                    user_id=user.id,
-                    account_id=batch.account_id,
-                    import_batch_id=batch.id,
-                    raw_transaction_id=raw_trans.id,
-                    **raw_trans.processed_data
-                )
-                self.db.add(transaction)
-                raw_trans.transaction_id = transaction.id
+            for chunk in self.timer.iterate("read", self._iter_raw_chunks(batch.id, selected_rows)):
+                transactions: List[Dict] = []
+                raw_updates: List[Dict] = []
+                now = datetime.now(timezone.utc)
+                for raw_trans in chunk:
+                    # 被标记为重复的行只有在用户明确勾选时才导入
+                    if raw_trans.status != "processed" and not (
+                        raw_trans.status == "duplicate" and selected_rows
+                    ):
+                        continue
+                    
+                    # 创建交易记录
+                    values = self._transaction_values(
+                        batch, raw_trans.id, raw_trans.processed_data, raw_trans.fingerprint,
+                        categorizer.category_id(raw_trans.processed_data)
+                    )
+                    transactions.append(values)
+                    raw_updates.append({
+                        "raw_id": raw_trans.id,
+                        "status": "processed",
+                        "error_message": None,
+                        "transaction_id": values["id"],
+                        "updated_at": now
+                    })
+
+                batch.inserted_count = (batch.inserted_count or 0) + len(transactions)
+                balance_delta += _balance_delta(transactions)
+                self._bulk_insert(Transaction, transactions)
+                self._bulk_update_raw(raw_updates)
             
             batch.status = "completed"
-            self.db.commit()
+            self._adjust_balance(batch.account_id, balance_delta)
+            with self.timer.stage("watermark"):
+                self._update_import_watermark(batch.account_id)
+            with self.timer.stage("commit"):
+                self.db.commit()
+            self._record_timings(batch, "confirm", mark, batch.inserted_count)
             return batch
             
         except Exception as e:
@@ -223,17 +1165,38 @@ class ImportService:
         user: User,
         account_id: Optional[str] = None,
         status: Optional[str] = None,
-        skip: int = 0,
-        limit: int = 50
-    ) -> List[ImportBatch]:
-        """获取导入批次列表"""
-        query = self.db.query(ImportBatch).filter(
-            ImportBatch.user_id == user.id
-        )
-        
+        cursor: Optional[str] = None,
+        limit: int = BATCH_PAGE_SIZE
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """按创建时间倒序分页列出导入批次，返回 (本页批次摘要, 下一页游标)；没有更多批次时游标为 None
+
+        只查询列表需要的元数据列，不加载 ORM 对象；各批次原始交易按状态的行数
+        由一次 GROUP BY 查询得到。按 (created_at, id) 键集分页，翻页开销与页码无关。
+        """
+        limit = max(1, min(limit, MAX_BATCH_PAGE_SIZE))
+        query = select(*_BATCH_SUMMARY_COLUMNS).where(ImportBatch.user_id == user.id)
         if account_id:
-            query = query.filter(ImportBatch.account_id == account_id)
+            query = query.where(ImportBatch.account_id == account_id)
         if status:
-            query = query.filter(ImportBatch.status == status)
-            
-        return query.offset(skip).limit(limit).all()
+            query = query.where(ImportBatch.status == status)
+        if cursor:
+            created_at, batch_id = _parse_batch_cursor(cursor)
+            query = query.where(or_(
+                ImportBatch.created_at < created_at,
+                and_(ImportBatch.created_at == created_at, ImportBatch.id < batch_id)
+            ))
+        rows = self.db.execute(
+            query.order_by(ImportBatch.created_at.desc(), ImportBatch.id.desc()).limit(limit + 1)
+        ).all()
+        next_cursor = _batch_cursor(rows[limit - 1]) if len(rows) > limit else None
+        rows = rows[:limit]
+
+        counts: Dict[str, Dict[str, int]] = {row.id: {} for row in rows}
+        if rows:
+            for batch_id, row_status, count in self.db.execute(
+                select(RawTransaction.import_batch_id, RawTransaction.status, func.count())
+                .where(RawTransaction.import_batch_id.in_(counts))
+                .group_by(RawTransaction.import_batch_id, RawTransaction.status)
+            ):
+                counts[batch_id][row_status] = count
+        return [_batch_summary(row, counts[row.id]) for row in rows], next_cursor
@@ -0,0 +1,55 @@
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional
+
+from app.models.finance import FinanceAccount
+from app.services.parsed_row import ParsedRow
+from app.services.transaction_fingerprint import fingerprint_parsed_row
+
+
+class ImportWatermark(NamedTuple):
+    """账户的导入水位：已导入交易的最晚入账日期，以及该日期上已导入交易的指纹"""
+    date: str  # ISO 日期（YYYY-MM-DD）
+    fingerprints: List[str]
+
+    @classmethod
+    def of(cls, account: FinanceAccount) -> Optional["ImportWatermark"]:
+        if account.import_watermark_date is None:
+            return None
+        return cls(account.import_watermark_date.date().isoformat(), account.import_watermark_fingerprints or [])
+
+
+def watermark_day(row: ParsedRow) -> str:
+    """行的入账日期（没有入账日期的格式用交易日期），水位按入账日期推进，晚入账的交易不会被误跳过"""
+    return (row.posted_date or row.transaction_date)[:10]
+
+
+def skip_watermarked(
+    rows: Iterable[ParsedRow],
+    account_id: str,
+    watermark: ImportWatermark,
+    on_skip: Callable[[], None]
+) -> Iterator[ParsedRow]:
+    """跳过水位之前已导入的行
+
+    早于水位日期的行只比较日期即可跳过，不计算指纹；水位当天只跳过指纹已导入的行，
+    每个已导入的指纹只抵消一行，同一天的相同消费仍可导入。
+    """
+    boundary = Counter(watermark.fingerprints)
+    for row in rows:
+        day = watermark_day(row)
+        if day < watermark.date:
+            on_skip()
+            continue
+        if day == watermark.date:
+            fingerprint = fingerprint_parsed_row(account_id, row)
+            if boundary[fingerprint] > 0:
+                boundary[fingerprint] -= 1
+                on_skip()
+                continue
+        yield row
+
+
+def watermark_start(day: datetime) -> datetime:
+    """水位日期当天的零点（水位以日期为单位）"""
+    return datetime.combine(day.date(), datetime.min.time())
@@ -0,0 +1,81 @@
+from collections import deque
+from typing import Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# 没有命中任何关键词时的优先级
+_NO_MATCH = float("inf")
+
+
+class KeywordAutomaton(Generic[T]):
+    """多关键词匹配自动机（Aho-Corasick）
+
+    关键词按给定顺序决定优先级（越靠前越优先），与逐个 `in` 判断、取第一个命中的语义一致；
+    重复的关键词保留首次出现的位置、使用最后一次的值（与 dict 赋值语义一致）。
+    匹配时只对文本做一次 O(len(text)) 扫描，与关键词数量无关。匹配不区分大小写。
+    """
+
+    __slots__ = ("_steps", "_best", "_values")
+
+    def __init__(self, keywords: Iterable[Tuple[str, T]]):
+        priorities: Dict[str, int] = {}
+        values: List[T] = []
+        for keyword, value in keywords:
+            keyword = keyword.lower()
+            if not keyword:
+                continue
+            if keyword in priorities:
+                values[priorities[keyword]] = value
+            else:
+                priorities[keyword] = len(values)
+                values.append(value)
+
+        # 构建关键词前缀树
+        goto: List[Dict[str, int]] = [{}]
+        best: List[float] = [_NO_MATCH]
+        for keyword, priority in priorities.items():
+            state = 0
+            for char in keyword:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    goto.append({})
+                    best.append(_NO_MATCH)
+                    next_state = len(goto) - 1
+                    goto[state][char] = next_state
+                state = next_state
+            best[state] = min(best[state], priority)
+
+        # 按广度优先计算失败指针，并展开为完整的状态转移表（匹配时无需回退）
+        delta: List[Dict[str, int]] = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            # 状态的优先级取自身与失败链上所有后缀关键词的最优值
+            best[state] = min(best[state], best[fail[state]])
+            transitions = dict(delta[fail[state]])
+            transitions.update(goto[state])
+            delta[state] = transitions
+            for char, next_state in goto[state].items():
+                fail[next_state] = delta[fail[state]].get(char, 0) if state else 0
+                queue.append(next_state)
+
+        # 预先绑定各状态转移表的 get，减少匹配循环中的属性查找
+        self._steps = [transitions.get for transitions in delta]
+        self._best = best
+        self._values = values
+
+    def match(self, text: Optional[str]) -> Optional[T]:
+        """返回文本中命中的优先级最高的关键词对应的值，没有命中时返回 None"""
+        if not text:
+            return None
+        steps, best = self._steps, self._best
+        state, found = 0, _NO_MATCH
+        for char in text.lower():
+            state = steps[state](char, 0)
+            if best[state] < found:
+                found = best[state]
+                if found == 0:
+                    break
+        return None if found == _NO_MATCH else self._values[found]
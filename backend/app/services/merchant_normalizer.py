@@ -0,0 +1,112 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.merchant_alias import MerchantAlias
+
+# 规范化结果的 LRU 缓存容量（按原始描述缓存，重复出现的描述直接命中）
+MERCHANT_MEMO_SIZE = 16384
+
+# 卡号（5268********3949、****3949）
+_CARD_NUMBER = re.compile(r"\b\d{4}\*+\d{4}\b|\*{2,}\d{2,4}\b")
+# 刷卡/转账等前缀，可能连续出现（如 "POINT OF SALE - INTERAC RETAIL PURCHASE 000001"）；
+# 数字只去掉 4 位以上的纯数字流水号，"7-ELEVEN"、"99 RANCH MARKET" 这类以数字开头的商家名保留
+_PREFIX = re.compile(
+    r"^(?:(?:POINT OF SALE|POS|INTERAC|RETAIL PURCHASE|C-IDP PURCHASE|IDP PURCHASE|PURCHASE|"
+    r"VISA DEBIT|DEBIT CARD|DEBIT|PREAUTHORIZED|PRE-AUTHORIZED|CONTACTLESS|\d{4,})(?=\W|$)"
+    r"|(?:SQ|TST|PP|PAYPAL)\s*\*)[\s*#:-]*"
+)
+# 行尾的省份代码（"WATERLOO, ON"）；美国州代码容易与普通单词混淆，只在带逗号时识别
+_REGION = re.compile(
+    r"(?:,\s*|\s+)(?:ON|QC|BC|AB|MB|SK|NS|NB|NL|PE|YT|NT|NU)$|"
+    r",\s*(?:AL|AK|AZ|AR|CA|CO|CT|DE|FL|GA|HI|ID|IL|IN|IA|KS|KY|LA|ME|MD|MA|MI|MN|MS|MO|MT|NE|NV|NH|NJ|"
+    r"NM|NY|NC|ND|OH|OK|OR|PA|RI|SC|SD|TN|TX|UT|VT|VA|WA|WV|WI|WY)$"
+)
+# 门店编号（#4411、W1248、STORE 12）：编号及其后的城市一并去掉
+_STORE_NUMBER = re.compile(r"\s+(?:#\s*\d+|STORE\s+\d+|[A-Z]?\d{3,})\b.*$")
+_SPACES = re.compile(r"\s+")
+_NON_ALNUM = re.compile(r"[^A-Z0-9]+")
+
+
+def merchant_key(name: str) -> str:
+    """商家的稳定键：大写，标点和空白折叠为单个空格（用于别名、分类和报表）"""
+    return _NON_ALNUM.sub(" ", name.upper()).strip()
+
+
+@lru_cache(maxsize=MERCHANT_MEMO_SIZE)
+def canonical_merchant(description: Optional[str]) -> Optional[str]:
+    """根据交易描述得到规范化的商家名称
+
+    去掉卡号、刷卡前缀、门店编号和城市/省份，例如
+    "STARBUCKS #4411 TORONTO, ON" 和 "STARBUCKS #0912" 都得到 "STARBUCKS"。
+    """
+    if not description:
+        return None
+    text = _SPACES.sub(" ", _CARD_NUMBER.sub(" ", description.upper())).strip()
+
+    while True:
+        stripped = _PREFIX.sub("", text, count=1).strip()
+        if stripped == text or not stripped:
+            break
+        text = stripped
+
+    # 门店编号之后通常是城市；没有门店编号但带省份代码时，省份前面的词是城市
+    text, region_count = _REGION.subn("", text)
+    text, store_count = _STORE_NUMBER.subn("", text)
+    if region_count and not store_count:
+        head, _, _city = text.rpartition(" ")
+        if head:
+            text = head
+
+    text = text.strip(" -*#,.")
+    return text or None
+
+
+class MerchantNormalizer:
+    """商家规范化：规则化的商家名称（进程级 LRU 缓存）+ 用户的商家别名表"""
+
+    def __init__(self, aliases: Optional[Dict[str, str]] = None):
+        self.aliases = aliases or {}
+
+    @classmethod
+    def for_user(cls, db: Session, user_id: str) -> "MerchantNormalizer":
+        """加载用户的商家别名"""
+        rows = db.execute(
+            select(MerchantAlias.alias, MerchantAlias.merchant_name).where(MerchantAlias.user_id == user_id)
+        ).all()
+        return cls({alias: merchant_name for alias, merchant_name in rows})
+
+    def normalize(self, description: Optional[str]) -> Optional[str]:
+        """交易描述 -> 商家名称（命中别名时使用别名）"""
+        return self.resolve(canonical_merchant(description))
+
+    def resolve(self, merchant: Optional[str]) -> Optional[str]:
+        """对已规范化的商家名称应用别名"""
+        if not merchant or not self.aliases:
+            return merchant
+        return self.aliases.get(merchant_key(merchant), merchant)
+
+
+def save_merchant_alias(db: Session, user_id: str, alias: str, merchant_name: str) -> MerchantAlias:
+    """新增或更新商家别名（alias 可以是原始描述，也可以是规范化后的商家名）"""
+    key = merchant_key(canonical_merchant(alias) or alias)
+    record = db.execute(
+        select(MerchantAlias).where(MerchantAlias.user_id == user_id, MerchantAlias.alias == key)
+    ).scalar_one_or_none()
+    if record is None:
+        record = MerchantAlias(user_id=user_id, alias=key, merchant_name=merchant_name)
+        db.add(record)
+    else:
+        record.merchant_name = merchant_name
+    db.commit()
+    return record
+
+
+def list_merchant_aliases(db: Session, user_id: str) -> List[MerchantAlias]:
+    """用户的全部商家别名"""
+    return db.execute(
+        select(MerchantAlias).where(MerchantAlias.user_id == user_id).order_by(MerchantAlias.alias)
+    ).scalars().all()
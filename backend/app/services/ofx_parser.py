@@ -0,0 +1,176 @@
+import re
+from html import unescape
+from typing import Dict, Iterator, Optional, TextIO, Tuple
+
+from app.models.enums import BankStatementFormat, Currency, TransactionType
+from app.services.bank_parsers import (
+    BankStatementParser,
+    ParserFactory,
+    guess_banking_category,
+    guess_card_category,
+)
+from app.services.merchant_normalizer import canonical_merchant
+from app.services.parsed_row import ParsedRow
+from app.services.row_decoder import DateDecoder, parse_cents
+
+# 每次从文本流读取的字符数（内存占用只与此有关，与文件大小无关）
+OFX_READ_SIZE = 64 * 1024
+
+# 标签、处理指令（<?xml ...?>、<?OFX ...?>）、注释和标签之间的文本
+_TOKEN = re.compile(r"<(/?)([A-Za-z0-9._]+)[^>]*>|<[?!][^>]*>|([^<]+)")
+
+# 流入/流出方向由金额符号决定，以下交易类型表示账户间转账
+_TRANSFER_TYPES = {"XFER"}
+# 信用卡对账单中的还款
+_PAYMENT_TYPES = {"PAYMENT"}
+
+_CURRENCIES = {currency.value for currency in Currency}
+
+Token = Tuple[str, str]
+
+
+def iter_ofx_tokens(stream: TextIO, read_size: int = OFX_READ_SIZE) -> Iterator[Token]:
+    """增量切分 OFX 文本，产出 ("start" | "end", 标签名) 和 ("text", 文本)
+
+    同时适用于 SGML（1.x，叶子元素没有结束标签）和 XML（2.x）；
+    每次只在缓冲区中保留最后一个 "<" 之后可能不完整的部分，不构建文档树。
+    """
+    pending = ""
+    while True:
+        chunk = stream.read(read_size)
+        data = pending + chunk
+        if chunk:
+            cut = data.rfind("<")
+            if cut <= 0:
+                pending = data
+                continue
+            data, pending = data[:cut], data[cut:]
+        for match in _TOKEN.finditer(data):
+            closing, tag, text = match.groups()
+            if tag:
+                yield ("end" if closing else "start"), tag.upper()
+            elif text is not None:
+                text = text.strip()
+                if text:
+                    yield "text", unescape(text)
+        if not chunk:
+            return
+
+
+def _ofx_amount(value: str) -> str:
+    """OFX 允许以逗号作小数点（"-12,50"）：没有句点且逗号后只有 1~2 位数字时按小数点处理，
+    否则逗号视为千分位交给 parse_cents
+    """
+    text = value.strip()
+    whole, comma, fraction = text.rpartition(",")
+    if comma and "." not in text and "," not in whole and fraction.isdigit() and len(fraction) <= 2:
+        return f"{whole}.{fraction}"
+    return text
+
+
+def _ofx_date(value: str) -> str:
+    """OFX 日期（YYYYMMDD[HHMMSS[.XXX]][[-5:EST]]）只取日期部分"""
+    return value[:8]
+
+
+@ParserFactory.register
+class OFXParser(BankStatementParser):
+    """OFX/QFX 对账单解析器（银行账户和信用卡账户）"""
+
+    def get_statement_format(self) -> BankStatementFormat:
+        return BankStatementFormat.OFX
+
+    def detect(self, sample: bytes) -> float:
+        head = sample.lstrip(b"\xef\xbb\xbf \t\r\n")[:1024].upper()
+        if head.startswith(b"OFXHEADER:") or b"<?OFX" in head:
+            return 1.0
+        return 0.9 if b"<OFX>" in sample.upper() else 0.0
+
+    def iter_rows(self, stream: TextIO) -> Iterator[ParsedRow]:
+        decode_date = DateDecoder("%Y%m%d")
+        currency = Currency.CAD.value
+        account: Optional[str] = None
+        credit_card = False
+        transaction: Optional[Dict[str, str]] = None
+        leaf: Optional[str] = None
+
+        for kind, value in iter_ofx_tokens(stream):
+            if kind == "text":
+                if leaf is None:
+                    continue
+                if transaction is not None:
+                    # PAYEE 聚合中的 NAME 不覆盖交易本身的 NAME
+                    transaction.setdefault(leaf, value)
+                elif leaf == "CURDEF" and value.upper() in _CURRENCIES:
+                    currency = value.upper()
+                elif leaf == "ACCTID":
+                    account = value
+                leaf = None
+            elif kind == "start":
+                if value == "STMTTRN":
+                    if transaction is not None:
+                        row = self._build_row(transaction, decode_date, currency, account, credit_card)
+                        if row is not None:
+                            yield row
+                    transaction = {}
+                elif value == "CCSTMTRS":
+                    credit_card = True
+                elif value == "STMTRS":
+                    credit_card = False
+                leaf = value
+            else:
+                if value == "STMTTRN" and transaction is not None:
+                    row = self._build_row(transaction, decode_date, currency, account, credit_card)
+                    if row is not None:
+                        yield row
+                    transaction = None
+                leaf = None
+
+    def _build_row(
+        self,
+        fields: Dict[str, str],
+        decode_date: DateDecoder,
+        currency: str,
+        account: Optional[str],
+        credit_card: bool
+    ) -> Optional[ParsedRow]:
+        try:
+            transaction_date = decode_date(_ofx_date(fields.get("DTUSER") or fields["DTPOSTED"]))
+            posted_date = decode_date(_ofx_date(fields["DTPOSTED"])) if "DTPOSTED" in fields else None
+            cents = parse_cents(_ofx_amount(fields["TRNAMT"]))
+        except (KeyError, ValueError):
+            return None
+
+        name, memo = fields.get("NAME", ""), fields.get("MEMO", "")
+        description = f"{name} - {memo}" if name and memo and memo != name else (name or memo)
+        trntype = fields.get("TRNTYPE", "").upper()
+        inflow = cents > 0
+        if trntype in _TRANSFER_TYPES or "TRANSFER" in description.upper():
+            type = TransactionType.TRANSFER_IN if inflow else TransactionType.TRANSFER_OUT
+        elif credit_card and inflow and (trntype in _PAYMENT_TYPES or "PAYMENT" in description.upper()):
+            type = TransactionType.TRANSFER_IN
+        else:
+            type = TransactionType.INCOME if inflow else TransactionType.EXPENSE
+
+        metadata = tuple(
+            (key, value) for key, value in (
+                ("account_number", account),
+                ("trntype", trntype or None),
+                ("check_number", fields.get("CHECKNUM")),
+            ) if value
+        )
+        line = "<STMTTRN>" + "".join(f"<{tag}>{value}" for tag, value in fields.items()) + "</STMTTRN>"
+        return ParsedRow(
+            line,
+            transaction_date,
+            abs(cents),
+            type.value,
+            description,
+            category=guess_card_category(description) if credit_card else guess_banking_category(description),
+            merchant=canonical_merchant(name or memo),
+            posted_date=posted_date,
+            currency=currency,
+            metadata=metadata,
+            delimiter=None,
+            external_id=fields.get("FITID"),
+        )
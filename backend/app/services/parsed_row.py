@@ -0,0 +1,130 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from app.models.enums import Currency, TransactionStatus
+
+T = TypeVar("T")
+
+
+@lru_cache(maxsize=8)
+def _field_pattern(delimiter: str) -> "re.Pattern[str]":
+    """CSV 字段（含引号包裹的字段，允许 "" 转义和换行）"""
+    d = re.escape(delimiter)
+    return re.compile(rf'(?:^|{d})("(?:[^"]|"")*"|[^{d}]*)')
+
+
+def field_spans(line: str, delimiter: str = ",") -> List[Tuple[int, int]]:
+    """计算 CSV 行中每个字段（含引号）在原始文本中的起止位置"""
+    return [match.span(1) for match in _field_pattern(delimiter).finditer(line)]
+
+
+class LineRecorder:
+    """包装文本流，记录 csv.reader 解析每一行时消费的原始文本"""
+
+    __slots__ = ("_lines", "_consumed")
+
+    def __init__(self, stream: Iterable[str]):
+        self._lines = iter(stream)
+        self._consumed: List[str] = []
+
+    def __iter__(self) -> "LineRecorder":
+        return self
+
+    def __next__(self) -> str:
+        line = next(self._lines)
+        self._consumed.append(line)
+        return line
+
+    def take(self) -> str:
+        """取出自上次调用以来消费的原始文本（引号内换行的记录可能跨多行）"""
+        text = "".join(self._consumed).rstrip("\r\n")
+        self._consumed.clear()
+        return text
+
+    def records(self, reader: Iterable[T]) -> Iterator[Tuple[T, str]]:
+        """逐条产出 (解析结果, 原始文本)"""
+        for row in reader:
+            yield row, self.take()
+
+
+class ParsedRow:
+    """解析器产出的一条交易
+
+    用 __slots__ 保存解析结果，原始数据只保留原始文本行；
+    raw_data / processed_data 字典只在写入存储时才生成。
+    非 CSV 格式（如 OFX）的 delimiter 为 None，原始数据中没有字段位置；
+    external_id 是银行给出的交易唯一标识（OFX 的 FITID），用于去重。
+    """
+
+    __slots__ = (
+        "line", "transaction_date", "posted_date", "amount_cents", "currency",
+        "type", "category", "merchant", "description", "metadata", "delimiter",
+        "external_id",
+    )
+
+    def __init__(
+        self,
+        line: str,
+        transaction_date: str,
+        amount_cents: int,
+        type: str,
+        description: str,
+        category: Optional[str] = None,
+        merchant: Optional[str] = None,
+        posted_date: Optional[str] = None,
+        currency: str = Currency.CAD.value,
+        metadata: Tuple[Tuple[str, Any], ...] = (),
+        delimiter: Optional[str] = ",",
+        external_id: Optional[str] = None
+    ):
+        self.line = line
+        self.transaction_date = transaction_date
+        self.posted_date = posted_date
+        self.amount_cents = amount_cents
+        self.currency = currency
+        self.type = type
+        self.category = category
+        self.merchant = merchant
+        self.description = description
+        self.metadata = metadata
+        self.delimiter = delimiter
+        self.external_id = external_id
+
+    @property
+    def amount(self) -> float:
+        return self.amount_cents / 100
+
+    def fields(self) -> List[str]:
+        """原始行中各字段的原文（含引号）"""
+        if self.delimiter is None:
+            return [self.line]
+        return [self.line[start:end] for start, end in field_spans(self.line, self.delimiter)]
+
+    def raw_data(self) -> Dict:
+        """存储用的原始数据：原始文本行及各字段的起止位置"""
+        if self.delimiter is None:
+            return {"line": self.line}
+        return {"line": self.line, "spans": field_spans(self.line, self.delimiter)}
+
+    def processed_data(self) -> Dict:
+        """存储用的解析结果（与 RawTransaction.processed_data 的结构一致）"""
+        return {
+            "transaction_date": self.transaction_date,
+            "posted_date": self.posted_date,
+            "amount": self.amount,
+            "amount_cents": self.amount_cents,
+            "currency": self.currency,
+            "type": self.type,
+            "category": self.category,
+            "merchant": self.merchant,
+            "description": self.description,
+            "notes": None,
+            "tags": [],
+            "status": TransactionStatus.PENDING.value,
+            "metadata": dict(self.metadata),
+            "external_id": self.external_id,
+        }
+
+    def __repr__(self) -> str:
+        return f"ParsedRow({self.transaction_date!r}, {self.amount_cents!r}, {self.type!r}, {self.description!r})"
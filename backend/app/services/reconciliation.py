@@ -0,0 +1,121 @@
+from datetime import date, datetime
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from app.services.transaction_fingerprint import normalize_description, sign_cents, signed_amount_cents
+
+# 对账单日期与手工录入日期允许相差的天数（刷卡日、入账日与记账时间常有出入）
+RECONCILE_WINDOW_DAYS = 3
+# 商家/描述相似度的最低要求（词集合的重叠系数）
+RECONCILE_MIN_SIMILARITY = 0.5
+
+
+class ReconcileEntry(NamedTuple):
+    """参与对账的一笔交易：有符号金额（分）、日期序数和描述词集合"""
+    id: str
+    cents: int
+    day: int
+    tokens: FrozenSet[str]
+
+
+def description_tokens(*texts: Optional[str]) -> FrozenSet[str]:
+    """商家名和描述规范化后的词集合"""
+    return frozenset(word for text in texts if text for word in normalize_description(text).split())
+
+
+def similarity(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """重叠系数：手工录入的描述通常很短（如 "Costco"），只要被对账单描述包含即视为相同"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+def _day(value: Union[str, date, datetime]) -> int:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.toordinal()
+
+
+def statement_entry(raw_id: str, processed_data: Optional[Dict]) -> Optional[ReconcileEntry]:
+    """由原始交易的解析结果构建对账条目，解析结果不完整时返回 None"""
+    try:
+        cents = processed_data.get("amount_cents")
+        return ReconcileEntry(
+            raw_id,
+            sign_cents(cents, processed_data["type"]) if cents is not None
+            else signed_amount_cents(processed_data["amount"], processed_data["type"]),
+            _day(processed_data["transaction_date"]),
+            description_tokens(processed_data.get("merchant"), processed_data.get("description")),
+        )
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def ledger_entry(
+    transaction_id: str,
+    amount: float,
+    transaction_type,
+    transaction_date: datetime,
+    merchant: Optional[str],
+    description: Optional[str]
+) -> ReconcileEntry:
+    """由账户中已有的交易构建对账条目"""
+    return ReconcileEntry(
+        transaction_id,
+        signed_amount_cents(amount, transaction_type),
+        _day(transaction_date),
+        description_tokens(merchant, description),
+    )
+
+
+def day_window(entries: Iterable[ReconcileEntry], window_days: int = RECONCILE_WINDOW_DAYS) -> Tuple[date, date]:
+    """对账需要查询的日期范围 [起始日, 结束日)，覆盖对账单日期前后各 window_days 天"""
+    days = [entry.day for entry in entries]
+    return date.fromordinal(min(days) - window_days), date.fromordinal(max(days) + window_days + 1)
+
+
+def _order(entry: ReconcileEntry) -> Tuple[int, int]:
+    return entry.cents, entry.day
+
+
+def reconcile(
+    statement: List[ReconcileEntry],
+    ledger: List[ReconcileEntry],
+    window_days: int = RECONCILE_WINDOW_DAYS,
+    min_similarity: float = RECONCILE_MIN_SIMILARITY
+) -> Dict[str, str]:
+    """排序归并：把对账单行与已有交易按 (金额, 日期 ± window_days, 描述相似度) 配对
+
+    两边都按 (金额, 日期) 排序后单调推进，每行只与金额相同、日期在窗口内的少数候选比较，
+    总开销为 O(n log n)。每笔已有交易最多匹配一行；候选中取相似度最高、日期最接近的。
+    返回 {对账单行 id: 已有交易 id}。
+    """
+    statement = sorted(statement, key=_order)
+    ledger = sorted(ledger, key=_order)
+    matches: Dict[str, str] = {}
+    used = set()
+    start = 0
+    for entry in statement:
+        # 窗口下界随 (金额, 日期) 单调不减，之前跳过的候选不会再被用到
+        low = (entry.cents, entry.day - window_days)
+        while start < len(ledger) and _order(ledger[start]) < low:
+            start += 1
+
+        best: Optional[ReconcileEntry] = None
+        best_score = (0.0, 0)
+        index = start
+        while index < len(ledger):
+            candidate = ledger[index]
+            if candidate.cents != entry.cents or candidate.day > entry.day + window_days:
+                break
+            if candidate.id not in used:
+                score = (similarity(entry.tokens, candidate.tokens), -abs(candidate.day - entry.day))
+                if score[0] >= min_similarity and (best is None or score > best_score):
+                    best, best_score = candidate, score
+            index += 1
+
+        if best is not None:
+            matches[entry.id] = best.id
+            used.add(best.id)
+    return matches
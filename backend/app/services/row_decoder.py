@@ -0,0 +1,190 @@
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from itertools import chain, islice
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, TypeVar, Union
+
+# 推断日期格式时依次尝试的格式（同时满足多种格式时取靠前的）
+DATE_LAYOUTS = ("%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%Y/%m/%d", "%Y%m%d")
+# 编译解码器时使用的样本行数
+DECODER_SAMPLE_ROWS = 50
+# 候选金额列保留的最低比例：样本中非空值超过该比例能解析为金额即视为金额列
+# （个别 "N/A"、页脚等无法解析的值不会导致整列被丢弃，这些行在解析时跳过）
+AMOUNT_COLUMN_MIN_RATIO = 0.5
+# 单个文件缓存的不同日期字符串上限（对账单中日期重复度很高，通常只有几百个）
+DATE_CACHE_SIZE = 4096
+
+ColumnKey = Union[int, str]
+Row = Union[Sequence[str], Mapping[str, str]]
+T = TypeVar("T")
+
+
+def _iso_dash(value: str) -> datetime:
+    if len(value) != 10 or value[4] != "-" or value[7] != "-":
+        raise ValueError(value)
+    return datetime(int(value[:4]), int(value[5:7]), int(value[8:]))
+
+
+def _slash(order: Tuple[int, int, int]) -> Callable[[str], datetime]:
+    """按 (年, 月, 日) 在 a/b/c 中的位置生成快速解码函数"""
+    year, month, day = order
+
+    def decode(value: str) -> datetime:
+        parts = value.split("/")
+        if len(parts) != 3 or len(parts[year]) != 4:
+            raise ValueError(value)
+        return datetime(int(parts[year]), int(parts[month]), int(parts[day]))
+
+    return decode
+
+
+# 常见格式的快速路径，避免 strptime 的格式解析开销
+_FAST_PATHS: Dict[str, Callable[[str], datetime]] = {
+    "%Y-%m-%d": _iso_dash,
+    "%m/%d/%Y": _slash((2, 0, 1)),
+    "%d/%m/%Y": _slash((2, 1, 0)),
+    "%Y/%m/%d": _slash((0, 1, 2)),
+}
+
+
+class DateDecoder:
+    """按文件推断出的日期格式解码日期，输出 ISO 字符串并缓存结果"""
+
+    __slots__ = ("layout", "_decode", "_cache")
+
+    def __init__(self, layout: str):
+        self.layout = layout
+        self._decode = _FAST_PATHS.get(layout) or (lambda value: datetime.strptime(value, layout))
+        self._cache: Dict[str, str] = {}
+
+    @classmethod
+    def infer(cls, values: Iterable[str], default: str = DATE_LAYOUTS[0]) -> "DateDecoder":
+        """从样本值推断日期格式：取能解析最多非空样本的格式，样本无法判断时使用默认格式"""
+        samples = [value.strip() for value in values if value and value.strip()]
+        best, best_hits = default, 0
+        for layout in DATE_LAYOUTS:
+            hits = sum(1 for value in samples if _parses(layout, value))
+            if hits > best_hits:
+                best, best_hits = layout, hits
+        return cls(best)
+
+    def __call__(self, value: str) -> str:
+        """解码日期字符串，无法解析时抛出 ValueError"""
+        cached = self._cache.get(value)
+        if cached is not None:
+            return cached
+        text = value.strip()
+        try:
+            decoded = self._decode(text)
+        except ValueError:
+            # 快速路径只覆盖定长写法（如 2025-01-05），其余交给 strptime
+            decoded = datetime.strptime(text, self.layout)
+        result = decoded.isoformat()
+        if len(self._cache) < DATE_CACHE_SIZE:
+            self._cache[value] = result
+        return result
+
+
+def _parses(layout: str, value: str) -> bool:
+    try:
+        datetime.strptime(value, layout)
+        return True
+    except ValueError:
+        return False
+
+
+def parse_cents(value: str) -> int:
+    """把金额字符串直接转换为整数分（支持千分位、货币符号、括号负数），无法解析时抛出 ValueError"""
+    text = value.strip().replace(",", "").replace("$", "")
+    negative = False
+    if text.startswith("(") and text.endswith(")"):
+        text, negative = text[1:-1], True
+    if text and text[0] in "+-":
+        negative, text = (text[0] == "-") != negative, text[1:]
+
+    whole, _, fraction = text.partition(".")
+    if (whole.isdigit() or (not whole and fraction)) and (fraction.isdigit() or not fraction) and len(fraction) <= 2:
+        cents = int(whole or 0) * 100 + int(fraction.ljust(2, "0") or 0)
+    else:
+        # 少见的写法（多位小数、科学计数法）交给 Decimal 处理
+        try:
+            cents = int((Decimal(text) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+        except (InvalidOperation, OverflowError):
+            raise ValueError(value)
+    return -cents if negative else cents
+
+
+def is_amount(value: str) -> bool:
+    try:
+        parse_cents(value)
+        return True
+    except ValueError:
+        return False
+
+
+def peek_rows(rows: Iterator[T], size: int = DECODER_SAMPLE_ROWS) -> Tuple[List[T], Iterator[T]]:
+    """取出前 size 行作为样本，并返回包含样本在内的完整行迭代器"""
+    sample = list(islice(rows, size))
+    return sample, chain(sample, rows)
+
+
+def _cell(row: Row, column: ColumnKey) -> str:
+    try:
+        return row[column] or ""
+    except (IndexError, KeyError):
+        return ""
+
+
+class RowDecoder:
+    """按文件编译的行解码器：日期格式和金额列由样本推断一次，之后逐行只做查表和整数运算"""
+
+    __slots__ = ("dates", "amount_columns")
+
+    def __init__(self, dates: Dict[ColumnKey, DateDecoder], amount_columns: Tuple[ColumnKey, ...]):
+        self.dates = dates
+        self.amount_columns = amount_columns
+
+    @classmethod
+    def compile(
+        cls,
+        sample: Sequence[Row],
+        date_columns: Dict[ColumnKey, str],
+        amount_columns: Sequence[ColumnKey]
+    ) -> "RowDecoder":
+        """根据样本行编译解码器
+
+        date_columns 为日期列及其默认格式；amount_columns 为候选金额列，
+        样本中多数非空值无法解析为金额的列会被剔除。
+        """
+        dates = {
+            column: DateDecoder.infer((_cell(row, column) for row in sample), default)
+            for column, default in date_columns.items()
+        }
+        amounts = []
+        for column in amount_columns:
+            values = [value for value in (_cell(row, column).strip() for row in sample) if value]
+            parsed = sum(1 for value in values if is_amount(value))
+            if not values or parsed > len(values) * AMOUNT_COLUMN_MIN_RATIO:
+                amounts.append(column)
+        return cls(dates, tuple(amounts))
+
+    def date(self, row: Row, column: ColumnKey) -> str:
+        """解码日期列为 ISO 字符串"""
+        return self.dates[column](row[column])
+
+    def first_amount(self, row: Row) -> Optional[Tuple[ColumnKey, int]]:
+        """返回第一个能解析的金额列及其金额（分）
+
+        无法解析的值（如 "N/A"）跳过；各金额列都没有值时返回 None，
+        有值但都无法解析时抛出 ValueError（调用方跳过该行）。
+        """
+        invalid = None
+        for column in self.amount_columns:
+            value = _cell(row, column)
+            if value.strip():
+                try:
+                    return column, parse_cents(value)
+                except ValueError:
+                    invalid = value
+        if invalid is not None:
+            raise ValueError(f"Invalid amount: {invalid!r}")
+        return None
@@ -0,0 +1,185 @@
+import heapq
+import multiprocessing
+import os
+import pickle
+import tempfile
+import threading
+import zipfile
+from collections import defaultdict
+from itertools import groupby
+from concurrent.futures import ProcessPoolExecutor
+from operator import attrgetter
+from pathlib import Path
+from typing import IO, Callable, Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.services.bank_parsers import BankStatementParser, open_statement_stream
+from app.services.blob_store import StatementBlobStore
+from app.services.parsed_row import ParsedRow
+from app.services.transaction_fingerprint import normalize_description, sign_cents
+
+# 解析进程的启动方式：服务进程中有多个线程（导入任务、流水线、连接池），
+# fork 会把其他线程持有的锁复制到子进程中导致死锁，因此使用 spawn 启动全新的解释器
+PARSE_START_METHOD = "spawn"
+# 暂存文件中每次序列化的行数
+SPILL_CHUNK_SIZE = 1000
+# 解压 zip 成员时每次读取的字节数
+ARCHIVE_READ_SIZE = 1024 * 1024
+
+_ORDER_KEY = attrgetter("transaction_date")
+
+
+class StoredFile(NamedTuple):
+    """已写入对账单存储的单个文件"""
+    file_name: str
+    file_hash: str
+    file_size: int
+
+
+class SpilledFile(NamedTuple):
+    """子进程解析一个文件的结果：按日期排序的行暂存在本地文件中"""
+    path: Optional[str]
+    row_count: int
+    error: Optional[str]
+
+
+def is_archive(file: IO[bytes]) -> bool:
+    """判断上传文件是否为 zip 压缩包（Excel 工作簿同样是 zip，不视为压缩包）"""
+    try:
+        if not zipfile.is_zipfile(file):
+            return False
+        file.seek(0)
+        with zipfile.ZipFile(file) as archive:
+            return "[Content_Types].xml" not in archive.namelist()
+    finally:
+        file.seek(0)
+
+
+def store_archive_members(file: IO[bytes], blob_store: StatementBlobStore) -> List[StoredFile]:
+    """把 zip 中的每个对账单文件流式写入对账单存储（跳过目录和系统生成的隐藏文件）"""
+    stored: List[StoredFile] = []
+    with zipfile.ZipFile(file) as archive:
+        for member in archive.infolist():
+            name = Path(member.filename).name
+            if member.is_dir() or not name or name.startswith(".") or member.filename.startswith("__MACOSX/"):
+                continue
+            with archive.open(member) as source, blob_store.writer() as blob:
+                while chunk := source.read(ARCHIVE_READ_SIZE):
+                    blob.write(chunk)
+            stored.append(StoredFile(name, blob.digest, blob.size))
+    return stored
+
+
+def parse_to_spill(parser: BankStatementParser, blob_root: str, file_hash: str) -> SpilledFile:
+    """在子进程中解码并解析一个文件，按交易日期排序后分块序列化到暂存文件"""
+    try:
+        stream = open_statement_stream(parser, StatementBlobStore(Path(blob_root)).open(file_hash))
+        try:
+            rows = sorted(parser.iter_rows(stream), key=_ORDER_KEY)
+        finally:
+            stream.close()
+    except Exception as e:
+        return SpilledFile(None, 0, str(e) or type(e).__name__)
+
+    fd, path = tempfile.mkstemp(suffix=".rows")
+    with os.fdopen(fd, "wb") as spill:
+        for start in range(0, len(rows), SPILL_CHUNK_SIZE):
+            pickle.dump(rows[start:start + SPILL_CHUNK_SIZE], spill, protocol=pickle.HIGHEST_PROTOCOL)
+    return SpilledFile(path, len(rows), None)
+
+
+def iter_spill(path: str) -> Iterator[ParsedRow]:
+    """逐块读回暂存文件中的行"""
+    with open(path, "rb") as spill:
+        while True:
+            try:
+                rows = pickle.load(spill)
+            except EOFError:
+                return
+            yield from rows
+
+
+def merge_by_date(streams: List[Iterable[ParsedRow]]) -> Iterator[Tuple[int, ParsedRow]]:
+    """把各文件已排序的行按交易日期归并为 (文件序号, 行)，同一天内按文件顺序排列"""
+    return heapq.merge(*(_tag(index, stream) for index, stream in enumerate(streams)), key=_merge_key)
+
+
+def _tag(index: int, stream: Iterable[ParsedRow]) -> Iterator[Tuple[int, ParsedRow]]:
+    for row in stream:
+        yield index, row
+
+
+def _merge_key(item: Tuple[int, ParsedRow]) -> str:
+    return item[1].transaction_date
+
+
+def drop_overlaps(
+    merged: Iterable[Tuple[int, ParsedRow]],
+    on_duplicate: Callable[[int], None]
+) -> Iterator[ParsedRow]:
+    """去掉重叠对账单之间的重复行
+
+    同一天内，同一交易在每个文件中出现的次数取最大值：单个文件内的相同交易（如同一天两杯咖啡）
+    全部保留，另一个文件重复导出的部分跳过。行已按日期归并，每次只需缓存一天的行；
+    只有一个文件包含的日期直接输出，不必计算交易键。
+    """
+    for _, group in groupby(merged, key=_merge_key):
+        day = list(group)
+        if all(index == day[0][0] for index, _ in day):
+            for _, row in day:
+                yield row
+            continue
+
+        emitted: Dict[Hashable, int] = defaultdict(int)
+        per_file: Dict[Tuple[int, Hashable], int] = defaultdict(int)
+        for index, row in day:
+            key = _overlap_key(row)
+            per_file[index, key] += 1
+            if per_file[index, key] > emitted[key]:
+                emitted[key] += 1
+                yield row
+            else:
+                on_duplicate(index)
+
+
+def _overlap_key(row: ParsedRow) -> Hashable:
+    """同一天内识别同一笔交易的键（与交易指纹的判断一致，但不必计算哈希）"""
+    if row.external_id:
+        return row.external_id
+    return sign_cents(row.amount_cents, row.type), normalize_description(row.description)
+
+
+class StatementParsePool:
+    """多文件导入的解析进程池（首次使用时创建，进程数默认为 CPU 核数）"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self._max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def parse(self, jobs: List[Tuple[BankStatementParser, str]], blob_root: Path) -> List[SpilledFile]:
+        """并行解析 (解析器, 文件哈希) 列表，结果与输入顺序一致；只有一个文件时在当前进程解析"""
+        if len(jobs) <= 1:
+            return [parse_to_spill(parser, str(blob_root), file_hash) for parser, file_hash in jobs]
+        executor = self._get_executor()
+        futures = [executor.submit(parse_to_spill, parser, str(blob_root), file_hash) for parser, file_hash in jobs]
+        return [future.result() for future in futures]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._max_workers or settings.IMPORT_PARSE_PROCESSES or os.cpu_count(),
+                    mp_context=multiprocessing.get_context(PARSE_START_METHOD)
+                )
+            return self._executor
+
+
+# 进程内共享的解析进程池
+statement_parse_pool = StatementParsePool()
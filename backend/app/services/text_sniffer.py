@@ -0,0 +1,125 @@
+import codecs
+import csv
+import io
+from functools import lru_cache
+from typing import IO, List, NamedTuple, TextIO
+
+# 识别编码和分隔符时读取的文件头字节数（与文件大小无关）
+SNIFF_SAMPLE_SIZE = 8 * 1024
+# 识别分隔符时最多检查的样本行数
+SNIFF_MAX_LINES = 50
+# 候选分隔符，一致性相同时取列数多的，再相同时取靠前的
+CANDIDATE_DELIMITERS = (",", ";", "\t", "|")
+DEFAULT_DELIMITER = ","
+
+# UTF-32 LE 的 BOM 以 UTF-16 LE 的 BOM 开头，需先判断
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+# 无 BOM 的 UTF-16：文本以 ASCII 为主时，每两个字节中有一个为 0
+_UTF16_ZERO_RATIO = 0.3
+
+
+class TextFormat(NamedTuple):
+    """从文件头样本识别出的文本编码和 CSV 分隔符"""
+    encoding: str
+    delimiter: str
+
+
+def _decodes(sample: bytes, encoding: str) -> bool:
+    """样本能否按该编码解码（样本末尾被截断的多字节字符不算错误）"""
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def sniff_encoding(sample: bytes) -> str:
+    """按 BOM、UTF-16 的零字节分布、UTF-8 的有效性依次判断编码，都不符合时视为 Windows-1252"""
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    head = sample[:1024]
+    if len(head) >= 4:
+        half = len(head) // 2
+        even_zeros, odd_zeros = head[0::2].count(0), head[1::2].count(0)
+        if odd_zeros > half * _UTF16_ZERO_RATIO and not even_zeros:
+            return "utf-16-le"
+        if even_zeros > half * _UTF16_ZERO_RATIO and not odd_zeros:
+            return "utf-16-be"
+
+    if _decodes(sample, "utf-8"):
+        return "utf-8"
+    # Windows-1252 中有 5 个未定义的字节，出现时退回 Latin-1（任何字节都可解码）
+    return "cp1252" if _decodes(sample, "cp1252") else "latin-1"
+
+
+def decode_sample(sample: bytes, encoding: str) -> str:
+    """解码文件头样本（丢弃 BOM 和末尾被截断的多字节字符）"""
+    text = codecs.getincrementaldecoder(encoding)(errors="replace").decode(sample, final=False)
+    return text.lstrip("\ufeff")
+
+
+def sample_lines(text: str) -> List[str]:
+    """样本中的非空行（丢弃可能被截断的最后一行）"""
+    lines = text.splitlines()
+    if len(lines) > 1 and not text.endswith(("\n", "\r")):
+        lines.pop()
+    return [line for line in lines if line.strip()][:SNIFF_MAX_LINES]
+
+
+def sniff_delimiter(lines: List[str]) -> str:
+    """选出使各行列数最一致的分隔符（只有一列的不考虑）"""
+    best, best_score = DEFAULT_DELIMITER, (0.0, 0)
+    for delimiter in CANDIDATE_DELIMITERS:
+        try:
+            widths = [len(row) for row in csv.reader(lines, delimiter=delimiter)]
+        except csv.Error:
+            # 二进制文件（如 Excel 工作簿）的样本含 NUL 等字符，较早的 Python 版本中 csv 会报错
+            return DEFAULT_DELIMITER
+        if not widths:
+            break
+        width = max(set(widths), key=widths.count)
+        if width < 2:
+            continue
+        score = (widths.count(width) / len(widths), width)
+        if score > best_score:
+            best, best_score = delimiter, score
+    return best
+
+
+@lru_cache(maxsize=16)
+def sniff_text(sample: bytes) -> TextFormat:
+    """识别文件头样本的编码和分隔符（格式识别时各解析器共用同一样本，结果缓存）"""
+    encoding = sniff_encoding(sample)
+    return TextFormat(encoding, sniff_delimiter(sample_lines(decode_sample(sample, encoding))))
+
+
+class StatementTextStream(io.TextIOWrapper):
+    """按识别出的编码增量转码的文本流，并带有识别出的分隔符
+
+    只在读取时逐块解码，不需要先把整个文件转为 UTF-8；
+    样本之后出现的无效字节替换为 U+FFFD，而不是中断整个导入。
+    """
+
+    def __init__(self, file: IO[bytes], text_format: TextFormat):
+        super().__init__(file, encoding=text_format.encoding, errors="replace", newline="")
+        self.delimiter = text_format.delimiter
+
+
+def open_text_stream(file: IO[bytes]) -> StatementTextStream:
+    """读取文件头样本识别编码和分隔符，然后从头包装为文本流"""
+    text_format = sniff_text(file.read(SNIFF_SAMPLE_SIZE))
+    file.seek(0)
+    return StatementTextStream(file, text_format)
+
+
+def stream_delimiter(stream: TextIO) -> str:
+    """文本流的 CSV 分隔符（普通文本流，如 StringIO，使用逗号）"""
+    return getattr(stream, "delimiter", DEFAULT_DELIMITER)
@@ -0,0 +1,81 @@
+import hashlib
+import re
+from datetime import date, datetime
+from typing import Union
+
+from app.models.enums import TransactionType
+from app.services.parsed_row import ParsedRow
+
+_NON_ALNUM = re.compile(r"[^A-Z0-9]+")
+
+# 资金流出的交易类型，指纹中金额取负数
+_OUTFLOW_TYPES = {TransactionType.EXPENSE, TransactionType.TRANSFER_OUT}
+
+
+def normalize_description(description: str) -> str:
+    """大写并把标点、空白折叠为单个空格，消除不同导出格式之间的细微差异"""
+    return _NON_ALNUM.sub(" ", description.upper()).strip()
+
+
+def signed_amount_cents(amount: float, transaction_type: Union[TransactionType, str]) -> int:
+    """以分为单位的有符号金额（流出为负）"""
+    return sign_cents(round(abs(amount) * 100), transaction_type)
+
+
+def sign_cents(cents: int, transaction_type: Union[TransactionType, str]) -> int:
+    """按交易类型给整数分金额加上符号（流出为负）"""
+    cents = abs(cents)
+    return -cents if TransactionType(transaction_type) in _OUTFLOW_TYPES else cents
+
+
+def compute_fingerprint(
+    account_id: str,
+    transaction_date: Union[date, datetime],
+    amount_cents: int,
+    description: str
+) -> str:
+    """交易指纹：账户 + 日期 + 金额（分）+ 规范化描述，用于识别重叠对账单中的重复交易"""
+    key = f"{account_id}|{transaction_date:%Y-%m-%d}|{amount_cents}|{normalize_description(description)}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def transaction_fingerprint(transaction) -> str:
+    """已有交易（手工录入或编辑后）按当前的账户、日期、金额和描述计算指纹"""
+    return compute_fingerprint(
+        transaction.account_id,
+        transaction.transaction_date,
+        signed_amount_cents(transaction.amount, transaction.type),
+        transaction.description or ""
+    )
+
+
+def compute_external_fingerprint(account_id: str, external_id: str) -> str:
+    """银行给出交易唯一标识（OFX 的 FITID）时的指纹：账户 + 标识，不受描述和日期差异影响"""
+    key = f"{account_id}|id|{external_id.strip()}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def fingerprint_processed_data(account_id: str, processed_data: dict) -> str:
+    """根据解析器输出的 processed_data 计算指纹（优先使用交易标识和解析器给出的整数分金额）"""
+    if processed_data.get("external_id"):
+        return compute_external_fingerprint(account_id, processed_data["external_id"])
+    cents = processed_data.get("amount_cents")
+    return compute_fingerprint(
+        account_id,
+        datetime.fromisoformat(processed_data["transaction_date"]),
+        sign_cents(cents, processed_data["type"]) if cents is not None
+        else signed_amount_cents(processed_data["amount"], processed_data["type"]),
+        processed_data["description"]
+    )
+
+
+def fingerprint_parsed_row(account_id: str, row: ParsedRow) -> str:
+    """根据解析器产出的 ParsedRow 计算指纹"""
+    if row.external_id:
+        return compute_external_fingerprint(account_id, row.external_id)
+    return compute_fingerprint(
+        account_id,
+        datetime.fromisoformat(row.transaction_date),
+        sign_cents(row.amount_cents, row.type),
+        row.description
+    )
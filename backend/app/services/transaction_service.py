@@ -17,9 +17,13 @@ from app.models.transaction import (
 from app.models.enums import TransactionType, TransactionStatus
 from app.models.user import User
 from app.services.category_matcher import CategoryMatcher
+from app.services.transaction_fingerprint import transaction_fingerprint
 
 logger = logging.getLogger(__name__)
 
+# 参与去重指纹计算的字段，编辑其中任何一个都要重新计算指纹
+FINGERPRINT_FIELDS = ("account_id", "transaction_date", "amount", "type", "description")
+
 class TransactionService:
     def __init__(self, db: Session):
         self.db = db
@@ -66,6 +70,7 @@ class TransactionService:
 
             # 创建交易记录
             transaction = Transaction(**transaction_data)
+            transaction.fingerprint = transaction_fingerprint(transaction)
             self.db.add(transaction)
 
             # 更新账户余额
@@ -165,6 +170,9 @@ class TransactionService:
             # 更新交易字段
             for field, value in update_data.items():
                 setattr(transaction, field, value)
+            if any(field in update_data for field in FINGERPRINT_FIELDS):
+                # 指纹随交易内容更新，导入去重按编辑后的内容匹配
+                transaction.fingerprint = transaction_fingerprint(transaction)
 
             # 如果金额或类型发生变化，需要调整账户余额
             if (original_amount != transaction.amount or
@@ -285,6 +293,7 @@ class TransactionService:
                 transfer_account_id=from_account.id,
                 transfer_transaction_id=transaction.id
             )
+            transfer_in.fingerprint = transaction_fingerprint(transfer_in)
             self.db.add(transfer_in)
             transaction.transfer_transaction_id = transfer_in.id
 
@@ -302,6 +311,7 @@ class TransactionService:
                 transfer_account_id=from_account.id,
                 transfer_transaction_id=transaction.id
             )
+            transfer_out.fingerprint = transaction_fingerprint(transfer_out)
             self.db.add(transfer_out)
             transaction.transfer_transaction_id = transfer_out.id
 
@@ -0,0 +1,326 @@
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.finance import FinanceAccount
+from app.models.transaction import ImportBatch
+from app.models.user import User
+from app.models.watched_folder import WatchedFile, WatchedFolder
+from app.services.blob_store import StatementBlobStore
+from app.services.directory_import import collect_statement_files, store_statement_file
+from app.services.import_service import ImportService
+from app.services.statement_archive import ARCHIVE_READ_SIZE
+
+logger = logging.getLogger(__name__)
+
+# 文件最后修改后至少静置的秒数，避免导入仍在下载或写入中的文件（下次扫描时再导入）
+SETTLE_SECONDS = 5
+# 浏览器等下载过程中使用的临时文件后缀
+PARTIAL_SUFFIXES = (".crdownload", ".part", ".partial", ".download", ".tmp")
+
+
+class FileState(NamedTuple):
+    """判断文件是否变化的元数据（只来自目录项，不读取文件内容）"""
+    size: int
+    mtime_ns: int
+
+
+def file_state(path: Path) -> FileState:
+    stat = path.stat()
+    return FileState(stat.st_size, stat.st_mtime_ns)
+
+
+def file_digest(path: Path) -> str:
+    """文件内容的 SHA-256（与对账单存储使用的摘要一致）"""
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        while chunk := file.read(ARCHIVE_READ_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def changed_files(
+    directory: Path,
+    pattern: str,
+    recursive: bool,
+    index: Dict[str, FileState]
+) -> Dict[str, FileState]:
+    """与索引对比，返回新出现或大小、修改时间有变化的文件 {相对路径: 元数据}
+
+    只读取目录项的元数据；未变化的文件不打开、不计算哈希，也不访问数据库。
+    """
+    changed: Dict[str, FileState] = {}
+    for path in collect_statement_files(directory, pattern, recursive):
+        if path.name.lower().endswith(PARTIAL_SUFFIXES):
+            continue
+        relative = path.relative_to(directory).as_posix()
+        state = file_state(path)
+        if index.get(relative) != state:
+            changed[relative] = state
+    return changed
+
+
+class WatchedFolderService:
+    """监视目录的增量扫描：变化的对账单导入为批次并交给后台导入任务处理"""
+
+    def __init__(
+        self,
+        db: Session,
+        blob_store: Optional[StatementBlobStore] = None,
+        submit: Optional[Callable[[str, str, bool], object]] = None
+    ):
+        self.db = db
+        self.blob_store = blob_store or StatementBlobStore()
+        if submit is None:
+            from app.services.import_jobs import import_job_runner
+            submit = import_job_runner.submit
+        self._submit = submit
+
+    def create_folder(
+        self,
+        user: User,
+        account_id: str,
+        path: str,
+        pattern: str = "*",
+        recursive: bool = False,
+        auto_create: bool = False,
+        import_existing: bool = False
+    ) -> WatchedFolder:
+        """添加监视目录
+
+        默认把目录中已有的文件记为已见过（不导入），之后只导入新出现或有变化的文件；
+        需要导入已有文件时指定 import_existing。
+        """
+        account = self.db.query(FinanceAccount).filter(
+            FinanceAccount.id == account_id,
+            FinanceAccount.user_id == user.id
+        ).first()
+        if not account:
+            raise HTTPException(status_code=404, detail="Account not found")
+        directory = Path(path).expanduser()
+        if not directory.is_dir():
+            raise HTTPException(status_code=400, detail=f"Directory not found: {path}")
+
+        folder = WatchedFolder(
+            user_id=user.id,
+            account_id=account.id,
+            path=str(directory.resolve()),
+            pattern=pattern or "*",
+            recursive=recursive,
+            auto_create=auto_create,
+            is_active=True
+        )
+        self.db.add(folder)
+        if not import_existing:
+            for relative, state in changed_files(directory, folder.pattern, recursive, {}).items():
+                folder.files.append(WatchedFile(
+                    path=relative, size=state.size, mtime_ns=state.mtime_ns, status="baseline"
+                ))
+            folder.last_scanned_at = datetime.now(timezone.utc)
+        self.db.commit()
+        return folder
+
+    def list_folders(self, user: User) -> List[WatchedFolder]:
+        return self.db.query(WatchedFolder).filter(
+            WatchedFolder.user_id == user.id
+        ).order_by(WatchedFolder.created_at).all()
+
+    def get_folder(self, user: User, folder_id: str) -> WatchedFolder:
+        folder = self.db.query(WatchedFolder).filter(
+            WatchedFolder.id == folder_id,
+            WatchedFolder.user_id == user.id
+        ).first()
+        if not folder:
+            raise HTTPException(status_code=404, detail="Watched folder not found")
+        return folder
+
+    def delete_folder(self, user: User, folder_id: str) -> None:
+        """停止监视并删除目录的文件索引（已导入的批次保留）"""
+        self.db.delete(self.get_folder(user, folder_id))
+        self.db.commit()
+
+    def list_files(self, user: User, folder_id: str) -> List[WatchedFile]:
+        folder = self.get_folder(user, folder_id)
+        return self.db.query(WatchedFile).filter(
+            WatchedFile.folder_id == folder.id
+        ).order_by(WatchedFile.updated_at.desc()).all()
+
+    def scan_all(self) -> List[ImportBatch]:
+        """扫描所有启用的监视目录（同步读取文件和写库，在后台线程或线程池中调用）"""
+        folders = self.db.query(WatchedFolder).filter(WatchedFolder.is_active == True).all()
+        batches: List[ImportBatch] = []
+        for folder in folders:
+            batches.extend(self.scan_folder(folder))
+        return batches
+
+    def scan_folder(self, folder: WatchedFolder) -> List[ImportBatch]:
+        """扫描一个监视目录，返回本次创建的导入批次
+
+        先只按目录项的大小和修改时间找出变化的文件，只有这些文件才读取内容、计算哈希和写库：
+        内容与索引中相同（只是被 touch 过）的只更新元数据，与目录中已导入的文件内容相同的记为重复，
+        其余的每个文件导入为一个批次，提交给后台导入任务处理。
+        """
+        directory = Path(folder.path)
+        scanned_at = datetime.now(timezone.utc)
+        if not directory.is_dir():
+            folder.last_scanned_at = scanned_at
+            folder.last_error = f"Directory not found: {folder.path}"
+            self.db.commit()
+            return []
+
+        index = {
+            path: FileState(size, mtime_ns)
+            for path, size, mtime_ns in self.db.execute(
+                select(WatchedFile.path, WatchedFile.size, WatchedFile.mtime_ns)
+                .where(WatchedFile.folder_id == folder.id)
+            )
+        }
+        settled_before = time.time_ns() - SETTLE_SECONDS * 1_000_000_000
+        batches: List[ImportBatch] = []
+        for relative, state in changed_files(directory, folder.pattern, folder.recursive, index).items():
+            if state.mtime_ns > settled_before:
+                continue
+            try:
+                batch = self._import_file(folder, directory / relative, relative, state)
+            except Exception as e:
+                # 单个文件出错（读取失败、压缩包损坏等）只记入索引，不影响其余文件和目录
+                self.db.rollback()
+                self._index_file(folder.id, relative, state, None, "error", str(e))
+                logger.exception(f"Watched file {directory / relative} was not imported")
+                continue
+            if batch is not None:
+                batches.append(batch)
+        folder.last_scanned_at = scanned_at
+        folder.last_error = None
+        self.db.commit()
+        return batches
+
+    def _import_file(
+        self,
+        folder: WatchedFolder,
+        path: Path,
+        relative: str,
+        state: FileState
+    ) -> Optional[ImportBatch]:
+        folder_id, user_id, account_id = folder.id, folder.user_id, folder.account_id
+        file_hash = file_digest(path)
+        record = self._find_record(folder_id, relative)
+        if record is not None and record.file_hash == file_hash:
+            # 内容未变（例如只是被重新保存），只更新元数据
+            record.size, record.mtime_ns = state
+            self.db.commit()
+            return None
+
+        duplicate_of = self.db.execute(
+            select(WatchedFile.path).where(
+                WatchedFile.folder_id == folder_id,
+                WatchedFile.file_hash == file_hash,
+                WatchedFile.status == "imported",
+                WatchedFile.path != relative
+            ).limit(1)
+        ).scalar()
+        if duplicate_of is not None:
+            self._index_file(folder_id, relative, state, file_hash, "duplicate", f"Same content as {duplicate_of}")
+            return None
+
+        user = self.db.get(User, user_id)
+        service = ImportService(self.db, self.blob_store)
+        try:
+            stored = store_statement_file(path, self.blob_store)
+            batch = service.import_stored_files(user, self.db.get(FinanceAccount, account_id), relative, stored)
+            service.queue_import_batch(user, batch.id)
+        except HTTPException as e:
+            self.db.rollback()
+            self._index_file(folder_id, relative, state, file_hash, "error", str(e.detail))
+            logger.warning(f"Watched file {path} was not imported: {e.detail}")
+            return None
+
+        self._index_file(folder_id, relative, state, file_hash, "imported", import_batch_id=batch.id)
+        self._submit(batch.id, user_id, folder.auto_create)
+        logger.info(f"Watched file {path} imported as batch {batch.id}")
+        return batch
+
+    def _find_record(self, folder_id: str, relative: str) -> Optional[WatchedFile]:
+        return self.db.execute(
+            select(WatchedFile).where(WatchedFile.folder_id == folder_id, WatchedFile.path == relative)
+        ).scalar_one_or_none()
+
+    def _index_file(
+        self,
+        folder_id: str,
+        relative: str,
+        state: FileState,
+        file_hash: Optional[str],
+        status: str,
+        error_message: Optional[str] = None,
+        import_batch_id: Optional[str] = None
+    ) -> None:
+        """写入（或更新）文件的索引记录；出错的文件同样记入索引，内容变化前不再重试"""
+        record = self._find_record(folder_id, relative)
+        if record is None:
+            record = WatchedFile(folder_id=folder_id, path=relative)
+            self.db.add(record)
+        record.size, record.mtime_ns = state
+        record.file_hash = file_hash
+        record.status = status
+        record.error_message = error_message
+        record.import_batch_id = import_batch_id
+        self.db.commit()
+
+
+class FolderWatcher:
+    """按固定间隔在后台线程中扫描所有启用的监视目录（没有监视目录时每次只是一次空查询）"""
+
+    def __init__(
+        self,
+        interval: Optional[float] = None,
+        session_factory: Optional[Callable[[], Session]] = None
+    ):
+        self.interval = interval or settings.IMPORT_WATCH_INTERVAL
+        self._session_factory = session_factory
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="folder-watcher", daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def scan_once(self) -> int:
+        """扫描一次，返回创建的批次数"""
+        if self._session_factory is None:
+            from app.db.session import SessionLocal
+            self._session_factory = SessionLocal
+        session = self._session_factory()
+        try:
+            return len(WatchedFolderService(session).scan_all())
+        except Exception:
+            logger.exception("Watched folder scan failed")
+            return 0
+        finally:
+            session.close()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.scan_once()
+
+
+# 进程内共享的监视目录扫描器
+folder_watcher = FolderWatcher()
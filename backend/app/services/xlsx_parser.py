@@ -0,0 +1,119 @@
+import csv
+import io
+from datetime import date, datetime
+from typing import IO, Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.models.enums import BankStatementFormat
+from app.services.bank_parsers import BankStatementParser, ParserFactory
+from app.services.generic_csv_parser import ColumnMapping
+from app.services.parsed_row import ParsedRow
+from app.services.row_decoder import peek_rows
+from app.services.text_sniffer import DEFAULT_DELIMITER
+
+# 寻找标题行时最多查看的行数（标题行之前可能有账户名称、导出日期等说明行）
+HEADER_SCAN_ROWS = 20
+
+ZIP_SIGNATURE = b"PK\x03\x04"
+
+
+def cell_text(value: Any) -> str:
+    """单元格值转换为与 CSV 一致的文本（日期单元格为 ISO 日期，数字保留完整精度）"""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float):
+        return repr(value)
+    return str(value).strip()
+
+
+class _LineWriter:
+    """把单元格文本编码为一行 CSV，作为原始数据保存"""
+
+    __slots__ = ("_buffer", "_writer")
+
+    def __init__(self, delimiter: str = DEFAULT_DELIMITER):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, delimiter=delimiter, lineterminator="")
+
+    def __call__(self, cells: Sequence[str]) -> str:
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._writer.writerow(cells)
+        return self._buffer.getvalue()
+
+
+@ParserFactory.register
+class XLSXParser(BankStatementParser):
+    """Excel 工作簿解析器
+
+    以只读模式逐行读取工作表，不把整个工作簿载入内存。
+    指定了列映射时按映射解析，否则从前几行中识别标题行并按列名推断映射。
+    """
+
+    binary = True
+
+    def __init__(self, mapping: Optional[ColumnMapping] = None):
+        self.mapping = mapping
+
+    def get_statement_format(self) -> BankStatementFormat:
+        return BankStatementFormat.XLSX
+
+    def detect(self, sample: bytes) -> float:
+        if not sample.startswith(ZIP_SIGNATURE):
+            return 0.0
+        return 1.0 if b"xl/" in sample else 0.6 if b"[Content_Types].xml" in sample else 0.0
+
+    def iter_rows(self, stream: IO[bytes]) -> Iterator[ParsedRow]:
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ValueError("导入 Excel 文件需要安装 openpyxl")
+
+        workbook = load_workbook(stream, read_only=True, data_only=True)
+        try:
+            rows = (
+                [cell_text(value) for value in values]
+                for values in workbook.worksheets[0].iter_rows(values_only=True)
+            )
+            yield from self._parse_sheet(row for row in rows if any(row))
+        finally:
+            workbook.close()
+
+    def _parse_sheet(self, rows: Iterator[List[str]]) -> Iterator[ParsedRow]:
+        header, mapping, rows = self._locate_header(rows)
+        width = len(header) if header else 0
+        to_line = _LineWriter(mapping.delimiter or DEFAULT_DELIMITER)
+
+        def records() -> Iterable[Tuple[List[str], str]]:
+            for row in rows:
+                if len(row) < width:
+                    row = row + [""] * (width - len(row))
+                yield row, to_line(row)
+
+        sample, records_iter = peek_rows(records())
+        build = mapping.compile(header, [row for row, _ in sample])
+        for row, line in records_iter:
+            parsed = build(row, line)
+            if parsed is not None:
+                yield parsed
+
+    def _locate_header(
+        self,
+        rows: Iterator[List[str]]
+    ) -> Tuple[Optional[List[str]], ColumnMapping, Iterator[List[str]]]:
+        """确定标题行和列映射，返回 (标题行, 映射, 剩余数据行)"""
+        mapping = self.mapping
+        if mapping is not None:
+            for _ in range(mapping.skip_rows):
+                next(rows, None)
+            header = next(rows, None) if mapping.has_header else None
+            return header, mapping, rows
+
+        for _, row in zip(range(HEADER_SCAN_ROWS), rows):
+            mapping = ColumnMapping.sniff(row)
+            if mapping is not None:
+                return row, mapping, rows
+        raise ValueError("无法识别工作表的标题行，请指定列映射")
@@ -5,7 +5,7 @@ import signal
 import logging
 import logging.handlers
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -16,6 +16,7 @@ from jwt.exceptions import PyJWTError
 from fastapi.exceptions import HTTPException, RequestValidationError
 
 from app.core.config import settings
+from app.models.enums import BankStatementFormat
 from app.core.runtime_config import RuntimeConfigManager
 from app.core.exception_handlers import (
     jwt_exception_handler,
@@ -26,6 +27,9 @@ from app.core.exception_handlers import (
 from app.api.v1.router import api_router
 from app.db.session import create_start_app_handler, create_stop_app_handler
 from app.core.startup_manager import StartupManager
+from app.services.import_jobs import import_job_runner
+from app.services.statement_archive import statement_parse_pool
+from app.services.watched_folder import folder_watcher
 
 # 初始化 Typer CLI
 cli = typer.Typer()
@@ -110,6 +114,12 @@ def create_app(config_path: str = None) -> FastAPI:
     # 添加生命周期事件
     app.add_event_handler("startup", create_start_app_handler(app))
     app.add_event_handler("shutdown", create_stop_app_handler(app))
+    app.add_event_handler("startup", import_job_runner.recover)
+    app.add_event_handler("startup", folder_watcher.start)
+    # 先停止扫描，不再向导入任务执行器提交新任务
+    app.add_event_handler("shutdown", folder_watcher.shutdown)
+    app.add_event_handler("shutdown", import_job_runner.shutdown)
+    app.add_event_handler("shutdown", statement_parse_pool.shutdown)
 
     # 创建启动管理器并存储在应用状态中
     startup_manager = StartupManager(app)
@@ -234,6 +244,52 @@ def start_prod(config_path: str = typer.Argument(..., help="Path to runtime conf
         log_level="info"
     )
 
+@cli.command("import-dir")
+def import_dir(
+    directory: Path = typer.Argument(..., exists=True, file_okay=False, help="Directory of statement files"),
+    account_id: str = typer.Option(..., "--account", help="Target finance account ID"),
+    statement_format: Optional[BankStatementFormat] = typer.Option(
+        None, "--format", help="Statement format (detected per file when omitted)"
+    ),
+    pattern: str = typer.Option("*", help="Glob pattern for statement files"),
+    recursive: bool = typer.Option(False, help="Include subdirectories"),
+    auto_create: bool = typer.Option(False, help="Create transactions for all non-duplicate rows"),
+    ignore_watermark: bool = typer.Option(False, help="Also import rows before the account's import watermark"),
+    workers: Optional[int] = typer.Option(None, help="Parser processes (defaults to the CPU count)")
+):
+    """批量导入目录中的对账单（不经过 HTTP，直接写入数据库），结束时输出吞吐量和各阶段耗时"""
+    from app.db.session import SessionLocal
+    from app.services.directory_import import collect_statement_files, import_directory
+
+    if workers:
+        settings.IMPORT_PARSE_PROCESSES = workers
+    paths = collect_statement_files(directory, pattern, recursive)
+    typer.echo(f"Importing {len(paths)} files from {directory}")
+
+    session = SessionLocal()
+    try:
+        report = import_directory(
+            session, account_id, paths, statement_format, auto_create, ignore_watermark=ignore_watermark
+        )
+    except (ValueError, HTTPException) as e:
+        typer.echo(f"Import failed: {getattr(e, 'detail', e)}", err=True)
+        raise typer.Exit(code=1)
+    finally:
+        session.close()
+        statement_parse_pool.shutdown()
+
+    batch = report.batch
+    for batch_file in batch.files:
+        detail = batch_file.error_message or f"{batch_file.parsed_count} rows, {batch_file.duplicate_count} overlapping"
+        typer.echo(f"  [{batch_file.status:>6}] {batch_file.file_name}: {detail}")
+    typer.echo(
+        f"Batch {batch.id} ({batch.status}): {report.row_count} rows from {report.file_count} files, "
+        f"{batch.skipped_count or 0} before watermark, {batch.deduplicated_count or 0} duplicates, {batch.inserted_count or 0} transactions created"
+    )
+    for stage, seconds in report.stages.items():
+        typer.echo(f"  {stage:<14} {seconds:8.3f}s")
+    typer.echo(f"Total {report.elapsed:.3f}s, {report.rows_per_second:,.0f} rows/s")
+
 if __name__ == "__main__":
     # 检测Electron环境变量
     if electron_user_data := os.environ.get("ELECTRON_USER_DATA_PATH"):
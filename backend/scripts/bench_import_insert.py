@@ -0,0 +1,155 @@
+# scripts/bench_import_insert.py
+"""对比逐行 ORM 写入与批量 Core 写入的导入吞吐量
+
+用法: python scripts/bench_import_insert.py [--rows 50000]
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+from app.models.base import Base
+from app.models.enums import BankStatementFormat, Currency, FinanceAccountType, FinanceBankName
+from app.models.finance import FinanceAccount
+from app.models.transaction import ImportBatch, RawTransaction, Transaction
+from app.models.user import User
+from app.services.bank_parsers import CIBCCreditParser
+from app.services.blob_store import StatementBlobStore
+from app.services.import_service import ImportService
+
+MERCHANTS = [
+    "LCBO/RAO #702 WATERLOO, ON",
+    "T&T SUPERMARKET #028 WATERLOO, ON",
+    "COSTCO WHOLESALE W1248 WATERLOO, ON",
+    "ESSO CIRCLE K KITCHENER, ON",
+    "AMAZON.CA AMAZON.CA, ON",
+    "SHOPPERS DRUG MART #1234 WATERLOO, ON",
+]
+
+
+def generate_cibc_statement(rows: int) -> str:
+    """生成指定行数的 CIBC 信用卡对账单"""
+    rng = random.Random(42)
+    start = date(2020, 1, 1)
+    lines = []
+    for i in range(rows):
+        day = start + timedelta(days=i // 20)
+        if i % 25 == 0:
+            lines.append(f"{day.isoformat()},PAYMENT THANK YOU/PAIEMEN T MERCI,,{rng.randint(100, 2000)}.00,5268********3949")
+        else:
+            lines.append(f'{day.isoformat()},"{rng.choice(MERCHANTS)}",{rng.randint(1, 50000) / 100:.2f},,5268********3949')
+    return "\n".join(lines)
+
+
+def setup_database(db_path: Path):
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)()
+    user = User(username=f"bench-{db_path.stem}", password_hash="x")
+    session.add(user)
+    session.flush()
+    account = FinanceAccount(
+        account_name="CIBC Visa",
+        bank_name=FinanceBankName.CIBC,
+        account_type=FinanceAccountType.CREDIT,
+        currency=Currency.CAD,
+        balance=0,
+        user_id=user.id
+    )
+    session.add(account)
+    session.flush()
+    batch = ImportBatch(
+        user_id=user.id,
+        account_id=account.id,
+        statement_format=BankStatementFormat.CIBC_CREDIT,
+        file_name="bench.csv",
+        status="processed"
+    )
+    session.add(batch)
+    session.commit()
+    return engine, session, user, batch
+
+
+def orm_path(session, batch, parsed):
+    """旧路径：每行一个 ORM 对象，由工作单元逐个刷入"""
+    started = time.perf_counter()
+    raw_rows = []
+    for i, row in enumerate(parsed, start=1):
+        raw_trans = RawTransaction(
+            import_batch_id=batch.id,
+            row_number=i,
+            raw_data=row.raw_data(),
+            processed_data=row.processed_data(),
+            status="processed"
+        )
+        session.add(raw_trans)
+        raw_rows.append(raw_trans)
+    session.commit()
+    raw_elapsed = time.perf_counter() - started
+
+    service = ImportService(session, StatementBlobStore(Path(tempfile.gettempdir()) / "beaveden-bench"))
+    started = time.perf_counter()
+    for raw_trans in raw_rows:
+        values = service._transaction_values(batch, raw_trans.id, raw_trans.processed_data)
+        transaction = Transaction(**values)
+        session.add(transaction)
+        raw_trans.transaction_id = transaction.id
+    session.commit()
+    return raw_elapsed, time.perf_counter() - started
+
+
+def bulk_path(session, user, batch, parsed):
+    """新路径：预生成主键，分块 executemany 写入"""
+    service = ImportService(session, StatementBlobStore(Path(tempfile.gettempdir()) / "beaveden-bench"))
+    started = time.perf_counter()
+    service._ingest_rows(batch, parsed)
+    session.commit()
+    raw_elapsed = time.perf_counter() - started
+
+    session.execute(RawTransaction.__table__.update().values(status="processed"))
+    session.commit()
+    started = time.perf_counter()
+    service.confirm_import_batch(user, batch.id)
+    return raw_elapsed, time.perf_counter() - started
+
+
+def report(label: str, rows: int, raw_elapsed: float, txn_elapsed: float) -> None:
+    print(
+        f"{label:<6} raw_transaction: {rows / raw_elapsed:>10,.0f} rows/s ({raw_elapsed:.2f}s)   "
+        f"transaction: {rows / txn_elapsed:>10,.0f} rows/s ({txn_elapsed:.2f}s)"
+    )
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=50_000)
+    args = arg_parser.parse_args()
+
+    parsed = CIBCCreditParser().parse(generate_cibc_statement(args.rows))
+    print(f"CIBC statement rows: {len(parsed):,}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, session, _, batch = setup_database(Path(tmp) / "orm.db")
+        report("orm", len(parsed), *orm_path(session, batch, parsed))
+        session.close()
+        engine.dispose()
+
+        engine, session, user, batch = setup_database(Path(tmp) / "bulk.db")
+        report("bulk", len(parsed), *bulk_path(session, user, batch, parsed))
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
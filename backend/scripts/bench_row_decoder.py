@@ -0,0 +1,108 @@
+# scripts/bench_row_decoder.py
+"""对比逐行 strptime/Decimal 解码与按文件编译的行解码器
+
+用法: python scripts/bench_row_decoder.py [--rows 100000]
+"""
+import argparse
+import csv
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from typing import Callable, List
+
+# 添加项目根目录到 Python 路径
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from app.services.bank_parsers import CIBCCreditParser, RBCCheckingParser
+from app.services.row_decoder import RowDecoder, parse_cents, peek_rows
+
+RBC_HEADER = '"Account Type","Account Number","Transaction Date","Cheque Number","Description 1","Description 2","CAD$","USD$"'
+
+
+def generate_rows(rows: int):
+    """生成 CIBC 和 RBC 对账单（每天约 20 笔交易）"""
+    rng = random.Random(42)
+    start = date(2020, 1, 1)
+    cibc, rbc = [], [RBC_HEADER]
+    for i in range(rows):
+        day = start + timedelta(days=i // 20)
+        amount = rng.randint(1, 500000) / 100
+        cibc.append(f'{day.isoformat()},"MERCHANT {i % 50}","{amount:,.2f}",,5268********3949')
+        rbc.append(f'Chequing,09037-5103486,{day.month}/{day.day}/{day.year},,"PURCHASE","MERCHANT {i % 50}",-{amount:.2f},')
+    return "\n".join(cibc), "\n".join(rbc)
+
+
+def legacy_cibc(content: str) -> List:
+    """旧实现：每行 strptime + Decimal，再转 float"""
+    out = []
+    for row in csv.reader(StringIO(content)):
+        out.append((
+            datetime.strptime(row[0], "%Y-%m-%d").isoformat(),
+            float(abs(Decimal(row[2].replace(",", "")))),
+        ))
+    return out
+
+
+def compiled_cibc(content: str) -> List:
+    sample, rows = peek_rows(csv.reader(StringIO(content)))
+    decoder = RowDecoder.compile(sample, {0: "%Y-%m-%d"}, (2, 3))
+    return [(decoder.date(row, 0), abs(decoder.first_amount(row)[1])) for row in rows]
+
+
+def legacy_rbc(content: str) -> List:
+    out = []
+    for row in csv.DictReader(StringIO(content)):
+        out.append((
+            datetime.strptime(row["Transaction Date"], "%m/%d/%Y").isoformat(),
+            float(abs(Decimal(row["CAD$"].replace(",", "")))),
+        ))
+    return out
+
+
+def compiled_rbc(content: str) -> List:
+    sample, rows = peek_rows(csv.DictReader(StringIO(content)))
+    decoder = RowDecoder.compile(sample, {"Transaction Date": "%m/%d/%Y"}, ("CAD$", "USD$"))
+    return [(decoder.date(row, "Transaction Date"), abs(parse_cents(row["CAD$"]))) for row in rows]
+
+
+def timed(fn: Callable[[str], List], content: str):
+    started = time.perf_counter()
+    result = fn(content)
+    return result, time.perf_counter() - started
+
+
+def report(label: str, rows: int, elapsed: float, baseline: float = None) -> None:
+    speedup = f"  x{baseline / elapsed:.2f}" if baseline else ""
+    print(f"{label:<16} {rows / elapsed:>12,.0f} rows/s ({elapsed:.3f}s){speedup}")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=100_000)
+    args = arg_parser.parse_args()
+
+    cibc, rbc = generate_rows(args.rows)
+
+    for name, content, legacy, compiled in (
+        ("cibc", cibc, legacy_cibc, compiled_cibc),
+        ("rbc", rbc, legacy_rbc, compiled_rbc),
+    ):
+        old, old_elapsed = timed(legacy, content)
+        new, new_elapsed = timed(compiled, content)
+        # 两种实现的解码结果必须一致
+        assert [(d, round(a * 100)) for d, a in old] == new
+        report(f"{name} legacy", len(old), old_elapsed)
+        report(f"{name} compiled", len(new), new_elapsed, old_elapsed)
+
+    for name, parser, content in (("cibc parser", CIBCCreditParser(), cibc), ("rbc parser", RBCCheckingParser(), rbc)):
+        parsed, elapsed = timed(parser.parse, content)
+        report(name, len(parsed), elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  确保所有模型注册到 metadata
+from app.models.base import Base
+from app.models.user import User
+from app.models.finance import FinanceAccount
+from app.models.enums import Currency, FinanceAccountType, FinanceBankName
+
+
+@pytest.fixture
+def db_session():
+    """内存 SQLite 会话，每个测试独立建表"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def user(db_session):
+    user = User(username="importer", password_hash="x")
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+@pytest.fixture
+def account(db_session, user):
+    account = FinanceAccount(
+        account_name="CIBC Visa",
+        bank_name=FinanceBankName.CIBC,
+        account_type=FinanceAccountType.CREDIT,
+        currency=Currency.CAD,
+        balance=0,
+        user_id=user.id
+    )
+    db_session.add(account)
+    db_session.commit()
+    return account
+
+
+@pytest.fixture
+def blob_store(tmp_path):
+    from app.services.blob_store import StatementBlobStore
+    return StatementBlobStore(tmp_path / "statements")
@@ -0,0 +1,76 @@
+import pytest
+
+from app.models.enums import BankStatementFormat, TransactionType
+from app.services.bank_parsers import DETECT_SAMPLE_SIZE, ParserFactory
+
+CIBC_CREDIT = """2025-01-15,"LCBO/RAO #702 WATERLOO, ON",102.15,,5268********3949
+2025-01-08,PAYMENT THANK YOU/PAIEMEN T MERCI,,550.00,5268********3949
+"""
+
+CIBC_DEBIT = """2025-01-15,"Point of Sale - Interac RETAIL PURCHASE 000001 FOOD BASICS",42.10,
+2025-01-14,"Internet Banking E-TRANSFER 105 JOHN",,200.00
+2025-01-10,"Payroll Deposit ACME CORP",,2500.00
+"""
+
+RBC_HEADER = '"Account Type","Account Number","Transaction Date","Cheque Number","Description 1","Description 2","CAD$","USD$"\n'
+
+
+def rbc(account_type, *rows):
+    return RBC_HEADER + "".join(f'{account_type},09037-5103486,{row}\n' for row in rows)
+
+
+RBC_CHECKING = rbc("Chequing", '3/26/2024,,"Transfer","WWW TRANSFER - 0653 ",-1000.00,,', '5/24/2024,,"PAYROLL DEPOSIT","CONESTOGA COLLE ",715.29,,')
+RBC_SAVING = rbc("Savings", '3/31/2024,,"Deposit interest",,1.25,,')
+RBC_CREDIT = rbc("Visa", '4/02/2024,,"AMAZON.CA",,-45.99,,', '4/15/2024,,"PAYMENT - THANK YOU",,300.00,,')
+
+
+@pytest.mark.parametrize("content, expected", [
+    (CIBC_CREDIT, BankStatementFormat.CIBC_CREDIT),
+    (CIBC_DEBIT, BankStatementFormat.CIBC_DEBIT),
+    (RBC_CHECKING, BankStatementFormat.RBC_CHECKING),
+    (RBC_SAVING, BankStatementFormat.RBC_SAVING),
+    (RBC_CREDIT, BankStatementFormat.RBC_CREDIT),
+    ("hello,world\n", None),
+])
+def test_detect_format(content, expected):
+    assert ParserFactory.detect_format(content.encode("utf-8")) == expected
+
+
+def test_all_statement_formats_registered():
+    # 通用 CSV 由列映射驱动，不参与格式识别
+    assert set(ParserFactory.formats()) == set(BankStatementFormat) - {BankStatementFormat.GENERIC_CSV}
+
+
+def test_detect_format_only_reads_bounded_sample():
+    # 样本截断在行中间时，残缺的最后一行不应影响识别
+    content = (CIBC_CREDIT * 2000).encode("utf-8")
+    assert len(content) > DETECT_SAMPLE_SIZE
+    assert ParserFactory.detect_format(content[:DETECT_SAMPLE_SIZE]) == BankStatementFormat.CIBC_CREDIT
+
+
+def test_cibc_debit_and_rbc_credit_types():
+    debit = ParserFactory.get_parser(BankStatementFormat.CIBC_DEBIT).parse(CIBC_DEBIT)
+    assert [row.type for row in debit] == [
+        TransactionType.EXPENSE.value,
+        TransactionType.TRANSFER_IN.value,
+        TransactionType.INCOME.value,
+    ]
+
+    credit = ParserFactory.get_parser(BankStatementFormat.RBC_CREDIT).parse(RBC_CREDIT)
+    assert [row.type for row in credit] == [
+        TransactionType.EXPENSE.value,
+        TransactionType.TRANSFER_IN.value,
+    ]
+    assert credit[0].amount_cents == 4599
+    assert credit[0].processed_data()["amount"] == 45.99
+    assert credit[1].fields()[4] == '"PAYMENT - THANK YOU"'
+
+
+def test_parsed_row_keeps_original_line_for_multiline_fields():
+    content = '2025-01-15,"AMAZON.CA\nMARKETPLACE, ON",10.00,,5268********3949\r\n' + CIBC_CREDIT
+    rows = ParserFactory.get_parser(BankStatementFormat.CIBC_CREDIT).parse(content)
+
+    assert len(rows) == 3
+    assert rows[0].line == '2025-01-15,"AMAZON.CA\nMARKETPLACE, ON",10.00,,5268********3949'
+    assert rows[0].fields() == ["2025-01-15", '"AMAZON.CA\nMARKETPLACE, ON"', "10.00", "", "5268********3949"]
+    assert rows[1].raw_data()["line"] == CIBC_CREDIT.splitlines()[0]
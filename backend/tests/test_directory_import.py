@@ -0,0 +1,36 @@
+import pytest
+
+from app.models.transaction import Transaction
+from app.services.directory_import import collect_statement_files, import_directory
+from app.services.statement_archive import statement_parse_pool
+from tests.test_statement_archive import DECEMBER, JANUARY
+
+
+@pytest.fixture(autouse=True)
+def shutdown_parse_pool():
+    yield
+    statement_parse_pool.shutdown()
+
+
+def test_import_directory_reports_stages(tmp_path, db_session, blob_store, account):
+    statements = tmp_path / "statements"
+    statements.mkdir()
+    (statements / "2024-12.csv").write_text("\n".join(DECEMBER))
+    (statements / "2025-01.csv").write_text("\n".join(JANUARY))
+    (statements / ".DS_Store").write_text("junk")
+
+    paths = collect_statement_files(statements)
+    report = import_directory(db_session, account.id, paths, auto_create=True, blob_store=blob_store)
+
+    assert [p.name for p in paths] == ["2024-12.csv", "2025-01.csv"]
+    assert report.file_count == 2
+    assert report.row_count == 5
+    assert report.batch.status == "completed"
+    assert db_session.query(Transaction).count() == 5
+    assert {"store", "detect", "parse", "merge", "insert", "categorize", "commit"} <= set(report.stages)
+    assert report.rows_per_second > 0
+
+
+def test_import_directory_rejects_unknown_account(db_session, blob_store, tmp_path):
+    with pytest.raises(ValueError):
+        import_directory(db_session, "missing", [tmp_path], blob_store=blob_store)
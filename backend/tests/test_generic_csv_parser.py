@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.models.enums import BankStatementFormat, TransactionType
+from app.models.transaction import RawTransaction
+from app.services.generic_csv_parser import ColumnMapping, GenericCSVParser
+from app.services.import_service import ImportService
+from tests.test_import_service import CIBC_ROWS, make_upload
+
+SIGNED_CSV = """Date;Details;Memo;Amount
+26/03/2024;Tim Hortons #123;Toronto;-4.50
+27/03/2024;ACME PAYROLL;;1500.00
+28/03/2024;E-TRANSFER TO JANE;;-200
+"""
+
+SIGNED_MAPPING = {
+    "columns": {"Date": "transaction_date", "Details": "description", "Memo": "description", "Amount": "amount"},
+    "delimiter": ";",
+}
+
+
+def test_signed_amount_mapping_with_inferred_date_layout():
+    rows = GenericCSVParser(ColumnMapping.from_dict(SIGNED_MAPPING)).parse(SIGNED_CSV)
+
+    assert [(r.transaction_date, r.amount_cents, r.type) for r in rows] == [
+        ("2024-03-26T00:00:00", 450, TransactionType.EXPENSE.value),
+        ("2024-03-27T00:00:00", 150000, TransactionType.INCOME.value),
+        ("2024-03-28T00:00:00", 20000, TransactionType.TRANSFER_OUT.value),
+    ]
+    assert rows[0].description == "Tim Hortons #123 - Toronto"
+    assert rows[0].merchant == "TIM HORTONS"
+    assert rows[0].fields() == ["26/03/2024", "Tim Hortons #123", "Toronto", "-4.50"]
+
+
+def test_debit_credit_mapping_without_header():
+    content = "Exported 2025-01-31\n2025-01-15,GROCERY STORE,12.34,\n2025-01-16,REFUND,,5.00\n"
+    mapping = ColumnMapping.from_dict({
+        "columns": {"0": "transaction_date", "1": "description", "2": "debit", "3": "credit"},
+        "has_header": False,
+        "skip_rows": 1,
+        "date_format": "%Y-%m-%d",
+    })
+
+    rows = GenericCSVParser(mapping).parse(content)
+
+    assert [(r.amount_cents, r.type) for r in rows] == [
+        (1234, TransactionType.EXPENSE.value),
+        (500, TransactionType.INCOME.value),
+    ]
+    assert ColumnMapping.from_dict(mapping.to_dict()) == mapping
+
+
+@pytest.mark.parametrize("mapping", [
+    {"Date": "transaction_date", "Amount": "amount"},
+    {"Date": "transaction_date", "Details": "description"},
+    {"Date": "when", "Details": "description", "Amount": "amount"},
+    {"columns": {"Date": "transaction_date", "Details": "description", "Amount": "amount"}, "colour": "red"},
+])
+def test_invalid_mappings_are_rejected(mapping):
+    with pytest.raises(ValueError):
+        ColumnMapping.from_dict(mapping)
+
+
+def test_mapping_profile_is_saved_on_account(db_session, blob_store, user, account):
+    service = ImportService(db_session, blob_store)
+    lines = SIGNED_CSV.strip().splitlines()
+
+    batch = asyncio.run(service.create_import_batch(user, account.id, make_upload(lines), mapping=SIGNED_MAPPING))
+    assert batch.statement_format == BankStatementFormat.GENERIC_CSV
+    assert batch.processed_count == 3
+    assert account.import_mapping == ColumnMapping.from_dict(SIGNED_MAPPING).to_dict()
+
+    # 同一账户之后的导入直接使用保存的配置
+    again = asyncio.run(service.create_import_batch(user, account.id, make_upload(lines)))
+    assert again.statement_format == BankStatementFormat.GENERIC_CSV
+    assert db_session.query(RawTransaction).filter_by(import_batch_id=again.id).count() == 3
+
+    with pytest.raises(Exception) as exc_info:
+        asyncio.run(service.create_import_batch(user, account.id, make_upload(lines), mapping={"Date": "amount"}))
+    assert exc_info.value.status_code == 400
+
+
+def test_recognized_bank_format_ignores_saved_mapping(db_session, blob_store, user, account):
+    service = ImportService(db_session, blob_store)
+    account.import_mapping = ColumnMapping.from_dict(SIGNED_MAPPING).to_dict()
+
+    batch = asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS)))
+    assert batch.statement_format == BankStatementFormat.CIBC_CREDIT
+    assert batch.processed_count == len(CIBC_ROWS)
@@ -0,0 +1,56 @@
+import threading
+import time
+
+import pytest
+
+from app.services.import_pipeline import chunked, staged
+
+
+def test_chunked_splits_into_fixed_size_blocks():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 2)) == []
+
+
+def test_stages_preserve_order():
+    doubled = staged((n * 2 for n in staged(iter(range(100)), "first")), "second")
+    assert list(doubled) == [n * 2 for n in range(100)]
+
+
+def test_slow_consumer_applies_backpressure():
+    produced = []
+
+    def source():
+        for n in range(50):
+            produced.append(n)
+            yield n
+
+    stage = staged(source(), "source", queue_size=2)
+    assert next(stage) == 0
+    time.sleep(0.05)
+    # 一块已交给调用方，队列中最多两块，线程手上最多再有一块
+    assert len(produced) <= 4
+    stage.close()
+
+
+def test_stage_error_is_raised_in_caller():
+    def source():
+        yield 1
+        raise ValueError("bad row")
+
+    stage = staged(source(), "source")
+    assert next(stage) == 1
+    with pytest.raises(ValueError, match="bad row"):
+        next(stage)
+
+
+def test_closing_downstream_stops_upstream_threads():
+    def endless():
+        n = 0
+        while True:
+            yield n
+            n += 1
+
+    stage = staged(staged(endless(), "upstream", queue_size=1), "downstream", queue_size=1)
+    assert next(stage) == 0
+    stage.close()
+    assert not [thread for thread in threading.enumerate() if thread.name in ("upstream", "downstream")]
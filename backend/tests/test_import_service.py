@@ -0,0 +1,357 @@
+import asyncio
+import json
+import logging
+import threading
+from datetime import datetime
+from io import BytesIO
+
+import pytest
+from fastapi import UploadFile
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.models.enums import BankStatementFormat, Currency, SystemTransactionCategory, TransactionType
+from app.models.transaction import ImportBatch, RawTransaction, Transaction
+from app.services import import_metrics, import_service
+from app.services.category_matcher import CategoryMatcher
+from app.services.import_metrics import StageTimer
+from app.services.import_jobs import ImportJobRunner
+from app.services.import_service import ImportService
+from app.services.transaction_service import TransactionService
+
+CIBC_ROWS = [
+    '2025-01-15,"LCBO/RAO #702 WATERLOO, ON",102.15,,5268********3949',
+    '2025-01-14,"T&T SUPERMARKET #028 WATERLOO, ON",85.74,,5268********3949',
+    '2025-01-13,"COSTCO WHOLESALE W1248 WATERLOO, ON",135.67,,5268********3949',
+    '2025-01-08,PAYMENT THANK YOU/PAIEMEN T MERCI,,550.00,5268********3949',
+]
+
+
+def make_upload(lines, filename="cibc.csv"):
+    return UploadFile(file=BytesIO("\n".join(lines).encode("utf-8")), filename=filename)
+
+
+def test_create_import_batch_streams_rows_in_chunks(db_session, blob_store, user, account, monkeypatch):
+    monkeypatch.setattr(import_service, "IMPORT_CHUNK_SIZE", 3)
+    service = ImportService(db_session, blob_store)
+
+    batch = asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS * 5)))
+
+    assert batch.statement_format == BankStatementFormat.CIBC_CREDIT
+    assert batch.processed_count == 20
+    # 已刷入的原始交易不应继续驻留在会话中
+    assert not any(isinstance(obj, RawTransaction) for obj in db_session.identity_map.values())
+    rows = db_session.query(RawTransaction).order_by(RawTransaction.row_number).all()
+    assert [r.row_number for r in rows] == list(range(1, 21))
+    assert rows[0].raw_data["line"] == CIBC_ROWS[0]
+    start, end = rows[0].raw_data["spans"][1]
+    assert CIBC_ROWS[0][start:end] == '"LCBO/RAO #702 WATERLOO, ON"'
+    assert rows[0].processed_data["amount_cents"] == 10215
+    assert rows[3].processed_data["type"] == "transfer_in"
+
+
+def test_create_import_batch_parses_off_the_event_loop(db_session, blob_store, user, account, monkeypatch):
+    threads = []
+    parse_into_batch = ImportService._parse_into_batch
+
+    def record_thread(self, *args):
+        threads.append(threading.current_thread())
+        return parse_into_batch(self, *args)
+
+    monkeypatch.setattr(ImportService, "_parse_into_batch", record_thread)
+    service = ImportService(db_session, blob_store)
+    asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS)))
+    asyncio.run(service.create_multi_file_import_batch(
+        user, account.id, [make_upload(CIBC_ROWS)], ignore_watermark=True
+    ))
+
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+
+
+def test_create_import_batch_rejects_unknown_format(db_session, blob_store, user, account):
+    service = ImportService(db_session, blob_store)
+
+    with pytest.raises(Exception) as exc_info:
+        asyncio.run(service.create_import_batch(user, account.id, make_upload(["hello,world"])))
+
+    assert exc_info.value.status_code == 400
+    assert db_session.query(ImportBatch).count() == 0
+
+
+def test_process_and_confirm_bulk_insert_transactions(db_session, blob_store, user, account, monkeypatch):
+    monkeypatch.setattr(import_service, "IMPORT_CHUNK_SIZE", 3)
+    service = ImportService(db_session, blob_store)
+    batch = asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS * 2)))
+
+    batch = service.process_import_batch(user, batch.id)
+    results, _ = service.get_raw_rows_page(user, batch.id)
+    assert batch.status == "processed"
+    assert [r["status"] for r in results] == ["success"] * 8
+    assert db_session.query(Transaction).count() == 0
+
+    service.confirm_import_batch(user, batch.id, selected_rows=[1, 2, 4])
+
+    transactions = db_session.query(Transaction).order_by(Transaction.transaction_date).all()
+    assert len(transactions) == 3
+    assert {t.type for t in transactions} == {TransactionType.EXPENSE, TransactionType.TRANSFER_IN}
+    raw_rows = db_session.query(RawTransaction).filter(RawTransaction.transaction_id.isnot(None)).all()
+    assert sorted(r.row_number for r in raw_rows) == [1, 2, 4]
+    assert {r.transaction_id for r in raw_rows} == {t.id for t in transactions}
+
+
+def test_uploads_are_deduplicated_in_blob_store_and_reparsable(db_session, blob_store, user, account):
+    service = ImportService(db_session, blob_store)
+    first = asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS)))
+    second = asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS, "again.csv")))
+
+    assert first.file_hash == second.file_hash
+    assert first.file_size == len("\n".join(CIBC_ROWS).encode("utf-8"))
+    assert len(list(blob_store.root.rglob("*.gz"))) == 1
+
+    batch = service.reparse_import_batch(user, first.id)
+
+    assert batch.processed_count == 4
+    assert db_session.query(RawTransaction).filter(RawTransaction.import_batch_id == first.id).count() == 4
+
+
+def test_process_import_batch_honors_cancellation(db_session, blob_store, user, account, monkeypatch):
+    monkeypatch.setattr(import_service, "IMPORT_CHUNK_SIZE", 2)
+    service = ImportService(db_session, blob_store)
+    batch = asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS * 2)))
+    checks = iter([False, True])
+
+    batch = service.process_import_batch(user, batch.id, auto_create=True, should_cancel=lambda: next(checks))
+
+    assert batch.status == "cancelled"
+    assert batch.inserted_count == 0
+    assert db_session.query(Transaction).count() == 0
+    assert {r.status for r in db_session.query(RawTransaction).all()} == {"pending"}
+
+
+def test_import_job_runner_processes_batch_in_background(db_session, blob_store, user, account):
+    service = ImportService(db_session, blob_store)
+    batch = asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS)))
+    service.queue_import_batch(user, batch.id)
+    runner = ImportJobRunner(max_workers=1, session_factory=sessionmaker(bind=db_session.get_bind()))
+
+    runner.submit(batch.id, user.id, auto_create=True).result(timeout=10)
+    runner.shutdown()
+
+    db_session.expire_all()
+    progress = service.get_import_batch(user, batch.id).to_progress_dict()
+    assert progress["status"] == "completed"
+    assert progress["parsedCount"] == 4
+    assert progress["categorizedCount"] == 4
+    assert progress["insertedCount"] == 4
+
+
+def test_runner_recovers_batches_interrupted_by_restart(db_session, blob_store, user, account):
+    service = ImportService(db_session, blob_store)
+    queued = asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS)))
+    service.queue_import_batch(user, queued.id)
+    processing = asyncio.run(service.create_import_batch(
+        user, account.id, make_upload(CIBC_ROWS, "other.csv"), ignore_watermark=True
+    ))
+    processing.status = "processing"
+    db_session.commit()
+
+    ImportJobRunner(max_workers=1, session_factory=sessionmaker(bind=db_session.get_bind())).recover()
+
+    db_session.expire_all()
+    assert service.get_import_batch(user, queued.id).status == "error"
+    assert service.get_import_batch(user, processing.id).status == "error"
+    batch = service.process_import_batch(user, processing.id, auto_create=True)
+    assert batch.status == "completed"
+
+
+def test_cancel_finishes_batch_without_running_job(db_session, blob_store, user, account):
+    service = ImportService(db_session, blob_store)
+    batch = asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS)))
+    service.queue_import_batch(user, batch.id)
+    runner = ImportJobRunner(max_workers=1, session_factory=sessionmaker(bind=db_session.get_bind()))
+
+    batch = service.cancel_import_batch(user, batch.id)
+    assert not runner.cancel(batch.id)
+    batch = service.finish_orphaned_batch(batch)
+    runner.shutdown()
+
+    assert batch.status == "cancelled"
+    assert not batch.cancel_requested
+    assert service.queue_import_batch(user, batch.id).status == "queued"
+
+
+def test_overlapping_statement_rows_are_flagged_as_duplicates(db_session, blob_store, user, account):
+    service = ImportService(db_session, blob_store)
+    repeated = CIBC_ROWS[:1] * 2
+    first = asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS + repeated)))
+    service.process_import_batch(user, first.id, auto_create=True)
+
+    new_row = '2025-01-16,"SHELL C02345 KITCHENER, ON",45.00,,5268********3949'
+    second = asyncio.run(service.create_import_batch(
+        user, account.id, make_upload([new_row] + CIBC_ROWS[2:] + repeated), ignore_watermark=True
+    ))
+    batch = service.process_import_batch(user, second.id, auto_create=True)
+    results, _ = service.get_raw_rows_page(user, second.id)
+
+    assert [r["duplicate"] for r in results] == [False, True, True, True, True]
+    assert batch.deduplicated_count == 4
+    assert batch.inserted_count == 1
+    assert db_session.query(Transaction).count() == 7
+
+
+def test_manual_transactions_are_fingerprinted_on_create_and_update(db_session, blob_store, user, account):
+    transactions = TransactionService(db_session)
+    manual = transactions.create_transaction(user, account.id, {
+        "user_id": user.id,
+        "account_id": account.id,
+        "transaction_date": datetime(2025, 1, 15),
+        "amount": 102.15,
+        "currency": Currency.CAD,
+        "type": TransactionType.EXPENSE,
+        "description": "LCBO/RAO #702 WATERLOO, ON",
+    })
+    assert manual.fingerprint is not None
+
+    service = ImportService(db_session, blob_store)
+    batch = asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS)))
+    assert service.process_import_batch(user, batch.id).deduplicated_count == 1
+
+    # 编辑后按新的日期匹配，不再与原来那一天的对账单行重复
+    transactions.update_transaction(user, manual.id, {"transaction_date": datetime(2025, 1, 20)})
+    again = asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS), ignore_watermark=True))
+    batch = service.process_import_batch(user, again.id)
+    assert batch.deduplicated_count == 0
+
+
+def test_raw_rows_are_paged_by_row_number_cursor(db_session, blob_store, user, account, monkeypatch):
+    monkeypatch.setattr(import_service, "IMPORT_CHUNK_SIZE", 3)
+    service = ImportService(db_session, blob_store)
+    batch = asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS * 2)))
+    service.process_import_batch(user, batch.id)
+
+    pages, cursor = [], 0
+    while cursor is not None:
+        rows, cursor = service.get_raw_rows_page(user, batch.id, cursor, limit=3)
+        pages.append([row["rowNumber"] for row in rows])
+
+    assert pages == [[1, 2, 3], [4, 5, 6], [7, 8]]
+    chunks = list(service.iter_raw_row_chunks(user, batch.id, cursor=2))
+    assert [[row["rowNumber"] for row in chunk] for chunk in chunks] == [[3, 4, 5], [6, 7, 8]]
+    assert chunks[0][0]["status"] == "success"
+    assert chunks[0][0]["processedData"]["amount_cents"] == 13567
+
+
+def test_stage_timer_charges_nested_time_to_innermost_stage(monkeypatch):
+    clock = iter([0.0, 1.0, 3.0, 4.0])
+    monkeypatch.setattr(import_metrics.time, "perf_counter", lambda: next(clock))
+    timer = StageTimer()
+
+    with timer.stage("parse"):
+        with timer.stage("insert"):
+            pass
+
+    assert timer.stages == {"parse": 2.0, "insert": 2.0}
+
+
+def test_batch_records_stage_timings_per_phase(db_session, blob_store, user, account, caplog):
+    service = ImportService(db_session, blob_store)
+    batch = asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS)))
+    with caplog.at_level(logging.INFO, logger="app.services.import_metrics"):
+        service.process_import_batch(user, batch.id)
+    service.confirm_import_batch(user, batch.id)
+
+    timings = batch.to_dict()["timings"]
+    assert {"spool", "detect", "parse", "insert", "commit"} <= set(timings["import"]["stages"])
+    assert {"read", "dedupe", "categorize", "update", "commit"} <= set(timings["process"]["stages"])
+    assert (timings["import"]["rows"], timings["process"]["rows"], timings["confirm"]["rows"]) == (4, 4, 4)
+    event = json.loads(caplog.records[-1].getMessage())
+    assert (event["event"], event["phase"], event["batch_id"]) == ("import_timings", "process", batch.id)
+
+
+def test_categorizes_each_distinct_description_once(db_session, blob_store, user, account, monkeypatch):
+    calls = []
+
+    def match_category(self, user, description, merchant=None):
+        calls.append(description)
+        return "user_costco" if "COSTCO" in description.upper() else None
+
+    monkeypatch.setattr(import_service.CategoryMatcher, "match_category", match_category)
+    rows = [
+        '2025-01-15,"COSTCO WHOLESALE W1248 WATERLOO, ON",135.67,,5268********3949',
+        '2025-01-14,"Costco Wholesale W1248 Waterloo ON",42.10,,5268********3949',
+        '2025-01-13,"COSTCO WHOLESALE W1248 WATERLOO, ON",12.00,,5268********3949',
+        '2025-01-12,"LCBO/RAO #702 WATERLOO, ON",102.15,,5268********3949',
+    ]
+    service = ImportService(db_session, blob_store)
+    batch = asyncio.run(service.create_import_batch(user, account.id, make_upload(rows)))
+    service.process_import_batch(user, batch.id)
+
+    progress = batch.to_progress_dict()
+    assert len(calls) == 2
+    assert (progress["categoryKeyCount"], progress["categoryDedupeRatio"]) == (2, 2.0)
+
+    service.confirm_import_batch(user, batch.id)
+    categories = sorted(
+        category_id or "" for category_id, in db_session.query(Transaction.category_id).filter(
+            Transaction.import_batch_id == batch.id
+        )
+    )
+    assert categories[1:] == ["user_costco"] * 3
+    assert categories[0] != "user_costco"
+
+
+def seed_migrated_system_categories(db_session, user):
+    """按迁移 38fd0b4c5eb0 的方式写入系统分类（system_category 列保存的是小写的枚举值）"""
+    for category in SystemTransactionCategory:
+        db_session.execute(text(
+            "INSERT INTO transaction_category (id, name, description, parent_id, user_id, icon, color, "
+            "system_category, is_system, created_at, updated_at) VALUES "
+            "(:id, :name, '', :parent_id, :user_id, '', '', :value, 1, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+        ), {
+            "id": category.id,
+            "name": category.display_name,
+            "parent_id": (category.parent or category).id,
+            "user_id": user.id,
+            "value": category.value,
+        })
+    db_session.commit()
+
+
+def test_import_falls_back_to_parser_category_when_matcher_fails(db_session, blob_store, user, account):
+    seed_migrated_system_categories(db_session, user)
+    CategoryMatcher.reset_keyword_cache()
+    try:
+        service = ImportService(db_session, blob_store)
+        batch = asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS)))
+        service.process_import_batch(user, batch.id)
+        assert batch.categorized_count == 4
+        assert {r.status for r in db_session.query(RawTransaction).all()} == {"processed"}
+
+        batch = service.confirm_import_batch(user, batch.id)
+    finally:
+        CategoryMatcher.reset_keyword_cache()
+
+    assert batch.inserted_count == 4
+    costco = db_session.query(Transaction).filter(Transaction.description.like("COSTCO%")).one()
+    assert costco.category_id == SystemTransactionCategory.SHOPPING_GROCERY.id
+
+
+def test_list_import_batches_pages_by_created_at_with_row_counts(db_session, blob_store, user, account):
+    service = ImportService(db_session, blob_store)
+    batches = [
+        asyncio.run(service.create_import_batch(
+            user, account.id, make_upload(CIBC_ROWS, f"cibc-{n}.csv"), ignore_watermark=True
+        ))
+        for n in range(3)
+    ]
+    service.process_import_batch(user, batches[2].id)
+
+    first, cursor = service.list_import_batches(user, limit=2)
+    second, end = service.list_import_batches(user, cursor=cursor, limit=2)
+
+    assert [item["fileName"] for item in first + second] == ["cibc-2.csv", "cibc-1.csv", "cibc-0.csv"]
+    assert end is None
+    assert first[0]["rowCounts"] == {"pending": 0, "processed": 4, "duplicate": 0, "reconciled": 0, "error": 0}
+    assert second[0]["rowCounts"]["pending"] == 4
+    assert service.list_import_batches(user, status="processed")[0] == [first[0]]
@@ -0,0 +1,70 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.transaction import RawTransaction, Transaction
+from app.services.import_service import ImportService
+from tests.test_import_service import CIBC_ROWS, make_upload
+
+
+def _import(service, user, account, auto_create=False):
+    batch = asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS)))
+    service.process_import_batch(user, batch.id, auto_create)
+    if not auto_create:
+        service.confirm_import_batch(user, batch.id)
+    return batch
+
+
+def test_confirm_applies_one_balance_delta(db_session, blob_store, user, account):
+    service = ImportService(db_session, blob_store)
+    _import(service, user, account)
+
+    db_session.refresh(account)
+    # 三笔消费共 323.56，信用卡还款 550.00 计为转入
+    assert Decimal(str(account.balance)) == Decimal("226.44")
+
+
+def test_auto_created_batch_cannot_be_confirmed_again(db_session, blob_store, user, account):
+    service = ImportService(db_session, blob_store)
+    batch = _import(service, user, account, auto_create=True)
+    assert batch.status == "completed"
+
+    with pytest.raises(HTTPException):
+        service.confirm_import_batch(user, batch.id)
+
+    db_session.refresh(account)
+    assert db_session.query(Transaction).filter(Transaction.import_batch_id == batch.id).count() == 4
+    assert Decimal(str(account.balance)) == Decimal("226.44")
+
+
+def test_undo_removes_batch_transactions_and_reverses_balance(db_session, blob_store, user, account):
+    service = ImportService(db_session, blob_store)
+    batch = _import(service, user, account)
+    assert account.import_watermark_date is not None
+
+    service.undo_import_batch(user, batch.id)
+
+    db_session.refresh(account)
+    assert batch.status == "undone"
+    assert Decimal(str(account.balance)) == Decimal("0")
+    assert account.import_watermark_date is None
+    assert db_session.query(Transaction).filter(Transaction.import_batch_id == batch.id).count() == 0
+    statuses = {status for status, in db_session.query(RawTransaction.status).filter(
+        RawTransaction.import_batch_id == batch.id
+    )}
+    assert statuses == {"pending"}
+
+    # 撤销后的批次可以重新处理
+    service.process_import_batch(user, batch.id, auto_create=True)
+    db_session.refresh(account)
+    assert Decimal(str(account.balance)) == Decimal("226.44")
+
+
+def test_undo_requires_imported_transactions(db_session, blob_store, user, account):
+    service = ImportService(db_session, blob_store)
+    batch = asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS)))
+
+    with pytest.raises(HTTPException):
+        service.undo_import_batch(user, batch.id)
@@ -0,0 +1,51 @@
+import asyncio
+from datetime import datetime
+
+from app.models.transaction import RawTransaction
+from app.services.import_service import ImportService
+from app.services.import_watermark import ImportWatermark, skip_watermarked
+from app.services.parsed_row import ParsedRow
+from app.services.transaction_fingerprint import fingerprint_parsed_row
+from tests.test_import_service import CIBC_ROWS, make_upload
+
+NEW_ROW = '2025-01-16,"SHELL C02345 KITCHENER, ON",45.00,,5268********3949'
+
+
+def test_skip_watermarked_compares_dates_then_boundary_fingerprints():
+    coffee = ParsedRow("a", "2025-01-15T00:00:00", 450, "expense", "TIM HORTONS")
+    rows = [
+        ParsedRow("b", "2025-01-14T00:00:00", 1000, "expense", "OLD"),
+        coffee,
+        ParsedRow("c", "2025-01-15T00:00:00", 450, "expense", "TIM HORTONS"),
+        ParsedRow("d", "2025-01-13T00:00:00", 800, "expense", "LATE POSTING", posted_date="2025-01-16T00:00:00"),
+    ]
+    watermark = ImportWatermark("2025-01-15", [fingerprint_parsed_row("acc", coffee)])
+    skipped = []
+
+    kept = list(skip_watermarked(rows, "acc", watermark, lambda: skipped.append(1)))
+
+    # 当天已导入的咖啡只抵消一行；交易日期早但入账日期晚于水位的行保留
+    assert [row.line for row in kept] == ["c", "d"]
+    assert len(skipped) == 2
+
+
+def test_repeat_download_skips_rows_before_watermark(db_session, blob_store, user, account):
+    service = ImportService(db_session, blob_store)
+    first = asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS)))
+    service.process_import_batch(user, first.id)
+    service.confirm_import_batch(user, first.id)
+
+    assert account.import_watermark_date == datetime(2025, 1, 15)
+    assert len(account.import_watermark_fingerprints) == 1
+
+    second = asyncio.run(service.create_import_batch(user, account.id, make_upload([NEW_ROW] + CIBC_ROWS)))
+
+    assert second.skipped_count == 4
+    assert second.processed_count == 1
+    rows = db_session.query(RawTransaction).filter(RawTransaction.import_batch_id == second.id).all()
+    assert [r.processed_data["description"] for r in rows] == ["SHELL C02345 KITCHENER, ON"]
+
+    backfill = asyncio.run(service.create_import_batch(
+        user, account.id, make_upload(CIBC_ROWS, "backfill.csv"), ignore_watermark=True
+    ))
+    assert (backfill.skipped_count, backfill.processed_count) == (0, 4)
@@ -0,0 +1,74 @@
+import random
+
+from app.models.enums import SystemTransactionCategory
+from app.models.transaction import TransactionCategory
+from app.services.bank_parsers import guess_banking_category, guess_card_category
+from app.services.category_matcher import CategoryMatcher
+from app.services.keyword_engine import KeywordAutomaton
+
+
+def naive_match(keywords, text):
+    mapping = {}
+    for keyword, value in keywords:
+        mapping[keyword] = value
+    for keyword, value in mapping.items():
+        if keyword in text:
+            return value
+    return None
+
+
+def test_automaton_matches_ordered_substring_checks():
+    rng = random.Random(7)
+    alphabet = "abc "
+    keywords = [("".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))), i) for i in range(40)]
+    automaton = KeywordAutomaton(keywords)
+
+    for _ in range(500):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert automaton.match(text) == naive_match(keywords, text)
+
+
+def test_automaton_priority_and_case():
+    automaton = KeywordAutomaton([("costco wholesale", "grocery"), ("costco", "fuel"), ("gas", "fuel")])
+
+    assert automaton.match("COSTCO WHOLESALE W1248") == "grocery"
+    assert automaton.match("COSTCO GAS W1248") == "fuel"
+    assert automaton.match("AMAZON.CA") is None
+    assert automaton.match(None) is None
+
+
+def test_parser_category_tables():
+    assert guess_card_category("COSTCO WHOLESALE W1248 WATERLOO, ON") == SystemTransactionCategory.SHOPPING_GROCERY.value
+    assert guess_card_category("COSTCO GAS W1248") == SystemTransactionCategory.TRANSPORT_FUEL.value
+    assert guess_card_category("PAYMENT THANK YOU/PAIEMEN T MERCI") == SystemTransactionCategory.TRANSFER.value
+    assert guess_banking_category("PAYROLL DEPOSIT - CONESTOGA COLLE") == SystemTransactionCategory.INCOME_SALARY.value
+    assert guess_banking_category("BILL PAYMENT - VIRGIN PLUS") == SystemTransactionCategory.OTHER.value
+
+
+def test_category_matcher_builds_keyword_engine_once(db_session, user):
+    for category in (SystemTransactionCategory.DINING_CAFE, SystemTransactionCategory.TRANSPORT_FUEL):
+        db_session.add(TransactionCategory(
+            id=category.id, name=category.value, description="", parent_id=category.id, user_id=user.id,
+            icon="", color="", is_system=True, system_category=category
+        ))
+    db_session.commit()
+    CategoryMatcher.reset_keyword_cache()
+    try:
+        matcher = CategoryMatcher(db_session)
+        assert matcher.match_category(user, "STARBUCKS #123 TORONTO") == SystemTransactionCategory.DINING_CAFE.id
+        assert matcher.match_category(user, "POS PURCHASE", merchant="Shell") == SystemTransactionCategory.TRANSPORT_FUEL.id
+        engine = CategoryMatcher._keyword_engine
+        assert CategoryMatcher(db_session).match_category(user, "UNKNOWN") is None
+        assert CategoryMatcher._keyword_engine is engine
+
+        # 运行期间新增的系统分类在下一个 CategoryMatcher 中生效，无需重启
+        category = SystemTransactionCategory.DINING_TAKEOUT
+        db_session.add(TransactionCategory(
+            id=category.id, name=category.value, description="", parent_id=category.id, user_id=user.id,
+            icon="", color="", is_system=True, system_category=category
+        ))
+        db_session.commit()
+        assert CategoryMatcher(db_session).match_category(user, "DOORDASH*ORDER") == category.id
+        assert CategoryMatcher._keyword_engine is not engine
+    finally:
+        CategoryMatcher.reset_keyword_cache()
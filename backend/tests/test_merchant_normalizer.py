@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from app.models.transaction import RawTransaction
+from app.services.import_service import ImportService
+from app.services.merchant_normalizer import (
+    MerchantNormalizer,
+    canonical_merchant,
+    merchant_key,
+    save_merchant_alias,
+)
+from tests.test_import_service import CIBC_ROWS, make_upload
+
+
+@pytest.mark.parametrize("description, merchant", [
+    ("STARBUCKS #4411 TORONTO, ON", "STARBUCKS"),
+    ("STARBUCKS #0912", "STARBUCKS"),
+    ("Point of Sale - Interac RETAIL PURCHASE 000001 FOOD BASICS", "FOOD BASICS"),
+    ("C-IDP PURCHASE-3201 STARBUCKS", "STARBUCKS"),
+    ("COSTCO WHOLESALE W1248 WATERLOO, ON", "COSTCO WHOLESALE"),
+    ("ESSO CIRCLE K KITCHENER, ON", "ESSO CIRCLE K"),
+    ("AMAZON.CA AMAZON.CA, ON", "AMAZON.CA"),
+    ("SQ *BLUE DOG CAFE", "BLUE DOG CAFE"),
+    ("5268********3949 SHELL C12345", "SHELL"),
+    ("POSTMATES", "POSTMATES"),
+    ("7-ELEVEN #123 TORONTO ON", "7-ELEVEN"),
+    ("1-800-FLOWERS.COM", "1-800-FLOWERS.COM"),
+    ("99 RANCH MARKET", "99 RANCH MARKET"),
+    ("3 BROTHERS PIZZA", "3 BROTHERS PIZZA"),
+    ("POS 7-ELEVEN #123", "7-ELEVEN"),
+    ("", None),
+])
+def test_canonical_merchant(description, merchant):
+    assert canonical_merchant(description) == merchant
+
+
+def test_canonical_merchant_is_memoized():
+    canonical_merchant.cache_clear()
+    canonical_merchant("STARBUCKS #4411 TORONTO, ON")
+    canonical_merchant("STARBUCKS #4411 TORONTO, ON")
+    assert canonical_merchant.cache_info().hits == 1
+
+
+def test_aliases_apply_to_imported_rows(db_session, blob_store, user, account):
+    save_merchant_alias(db_session, user.id, "LCBO/RAO #702 WATERLOO, ON", "LCBO")
+    assert MerchantNormalizer.for_user(db_session, user.id).aliases == {merchant_key("LCBO/RAO"): "LCBO"}
+
+    service = ImportService(db_session, blob_store)
+    asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS)))
+
+    rows = db_session.query(RawTransaction).order_by(RawTransaction.row_number).all()
+    assert [r.processed_data["merchant"] for r in rows[:3]] == ["LCBO", "T&T SUPERMARKET", "COSTCO WHOLESALE"]
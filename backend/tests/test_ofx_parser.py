@@ -0,0 +1,150 @@
+import asyncio
+from io import StringIO
+
+import pytest
+
+from app.models.enums import BankStatementFormat, TransactionType
+from app.models.transaction import RawTransaction
+from app.services.bank_parsers import ParserFactory
+from app.services.import_service import ImportService
+from app.services.ofx_parser import OFXParser, iter_ofx_tokens
+from tests.test_import_service import make_upload
+
+OFX_SGML = """OFXHEADER:100
+DATA:OFXSGML
+VERSION:102
+ENCODING:USASCII
+CHARSET:1252
+
+<OFX>
+<SIGNONMSGSRSV1><SONRS><STATUS><CODE>0<SEVERITY>INFO</STATUS><DTSERVER>20250116120000</SONRS></SIGNONMSGSRSV1>
+<BANKMSGSRSV1><STMTTRNRS><TRNUID>1<STMTRS>
+<CURDEF>CAD
+<BANKACCTFROM><BANKID>003<ACCTID>5103486<ACCTTYPE>CHECKING</BANKACCTFROM>
+<BANKTRANLIST><DTSTART>20250101<DTEND>20250116
+<STMTTRN>
+<TRNTYPE>POS
+<DTPOSTED>20250115120000.000[-5:EST]
+<TRNAMT>-42.10
+<FITID>90000010001
+<NAME>FOOD BASICS #612
+<MEMO>Point of Sale - Interac
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20250110
+<TRNAMT>2500.00
+<FITID>90000010002
+<NAME>PAYROLL DEPOSIT ACME &amp; CO
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>XFER
+<DTPOSTED>20250108
+<TRNAMT>-200.00
+<FITID>90000010003
+<NAME>WWW TRF 0653
+</STMTTRN>
+</BANKTRANLIST>
+<LEDGERBAL><BALAMT>2257.90<DTASOF>20250116</LEDGERBAL>
+</STMTRS></STMTTRNRS></BANKMSGSRSV1>
+</OFX>
+"""
+
+OFX_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<?OFX OFXHEADER="200" VERSION="220" SECURITY="NONE" OLDFILEUID="NONE" NEWFILEUID="NONE"?>
+<OFX>
+  <CREDITCARDMSGSRSV1><CCSTMTTRNRS><TRNUID>1</TRNUID><CCSTMTRS>
+    <CURDEF>USD</CURDEF>
+    <CCACCTFROM><ACCTID>4510999988887777</ACCTID></CCACCTFROM>
+    <BANKTRANLIST>
+      <STMTTRN>
+        <TRNTYPE>DEBIT</TRNTYPE>
+        <DTPOSTED>20240402</DTPOSTED>
+        <DTUSER>20240401</DTUSER>
+        <TRNAMT>-45.99</TRNAMT>
+        <FITID>2024040100001</FITID>
+        <PAYEE><NAME>AMAZON.COM</NAME></PAYEE>
+      </STMTTRN>
+      <STMTTRN>
+        <TRNTYPE>PAYMENT</TRNTYPE>
+        <DTPOSTED>20240415</DTPOSTED>
+        <TRNAMT>300.00</TRNAMT>
+        <FITID>2024041500001</FITID>
+        <NAME>PAYMENT - THANK YOU</NAME>
+      </STMTTRN>
+    </BANKTRANLIST>
+  </CCSTMTRS></CCSTMTTRNRS></CREDITCARDMSGSRSV1>
+</OFX>
+"""
+
+
+@pytest.mark.parametrize("content", [OFX_SGML, OFX_XML])
+def test_detect_ofx(content):
+    assert ParserFactory.detect_format(content.encode("utf-8")) == BankStatementFormat.OFX
+
+
+def test_parse_sgml_statement():
+    rows = OFXParser().parse(OFX_SGML)
+
+    assert [(r.transaction_date, r.amount_cents, r.type) for r in rows] == [
+        ("2025-01-15T00:00:00", 4210, TransactionType.EXPENSE.value),
+        ("2025-01-10T00:00:00", 250000, TransactionType.INCOME.value),
+        ("2025-01-08T00:00:00", 20000, TransactionType.TRANSFER_OUT.value),
+    ]
+    assert rows[0].description == "FOOD BASICS #612 - Point of Sale - Interac"
+    assert rows[0].merchant == "FOOD BASICS"
+    assert rows[1].description == "PAYROLL DEPOSIT ACME & CO"
+    assert [r.external_id for r in rows] == ["90000010001", "90000010002", "90000010003"]
+    assert rows[0].processed_data()["metadata"] == {"account_number": "5103486", "trntype": "POS"}
+    assert rows[0].raw_data() == {"line": rows[0].line}
+    assert "<FITID>90000010001" in rows[0].line
+
+
+@pytest.mark.parametrize("amount, cents", [
+    ("-12,50", 1250),
+    ("12,5", 1250),
+    ("-1,234.56", 123456),
+    ("1,234", 123400),
+    ("-42.10", 4210),
+])
+def test_trnamt_decimal_comma(amount, cents):
+    rows = OFXParser().parse(OFX_SGML.replace("<TRNAMT>-42.10", f"<TRNAMT>{amount}", 1))
+    assert rows[0].amount_cents == cents
+
+
+def test_parse_xml_credit_card_statement():
+    rows = OFXParser().parse(OFX_XML)
+
+    assert [(r.transaction_date, r.posted_date, r.type, r.currency) for r in rows] == [
+        ("2024-04-01T00:00:00", "2024-04-02T00:00:00", TransactionType.EXPENSE.value, "USD"),
+        ("2024-04-15T00:00:00", "2024-04-15T00:00:00", TransactionType.TRANSFER_IN.value, "USD"),
+    ]
+    assert rows[0].description == "AMAZON.COM"
+
+
+def test_tokenizer_handles_tags_split_across_reads():
+    tokens = list(iter_ofx_tokens(StringIO(OFX_SGML), read_size=7))
+
+    assert tokens == list(iter_ofx_tokens(StringIO(OFX_SGML)))
+    assert ("text", "-42.10") in tokens
+
+
+def test_fitid_drives_duplicate_detection(db_session, blob_store, user, account):
+    service = ImportService(db_session, blob_store)
+    first = asyncio.run(service.create_import_batch(user, account.id, make_upload([OFX_SGML], "jan.ofx")))
+    service.process_import_batch(user, first.id)
+    service.confirm_import_batch(user, first.id)
+
+    # 银行重新导出时描述变了，但 FITID 不变
+    renamed = OFX_SGML.replace("FOOD BASICS #612", "FOOD BASICS WATERLOO")
+    second = asyncio.run(service.create_import_batch(
+        user, account.id, make_upload([renamed], "again.qfx"), ignore_watermark=True
+    ))
+
+    assert second.statement_format == BankStatementFormat.OFX
+    rows = db_session.query(RawTransaction).filter(RawTransaction.import_batch_id == second.id).all()
+    assert len(rows) == 3
+    assert len({r.fingerprint for r in rows}) == 3
+    service.process_import_batch(user, second.id)
+    results, _ = service.get_raw_rows_page(user, second.id)
+    assert [r["status"] for r in results] == ["duplicate"] * 3
@@ -0,0 +1,65 @@
+import asyncio
+from datetime import datetime
+
+from app.models.enums import Currency, TransactionType
+from app.models.transaction import RawTransaction, Transaction
+from app.services.import_service import ImportService
+from app.services.reconciliation import ReconcileEntry, description_tokens, reconcile
+from tests.test_import_service import CIBC_ROWS, make_upload
+
+
+def entry(id, cents, day, text):
+    return ReconcileEntry(id, cents, day, description_tokens(text))
+
+
+def test_reconcile_matches_amount_within_date_window_by_similarity():
+    statement = [
+        entry("s1", -10215, 100, "LCBO/RAO #702 WATERLOO, ON"),
+        entry("s2", -10215, 110, "LCBO/RAO #702 WATERLOO, ON"),
+        entry("s3", -8574, 100, "T&T SUPERMARKET #028 WATERLOO, ON"),
+        entry("s4", -550, 100, "TIM HORTONS"),
+    ]
+    ledger = [
+        entry("m1", -10215, 102, "LCBO"),
+        entry("m2", -10215, 118, "LCBO"),  # 超出日期窗口
+        entry("m3", -8574, 100, "groceries"),  # 描述不相似
+        entry("m4", -550, 99, "Tim Hortons coffee"),
+        entry("m5", -550, 100, "TIM HORTONS"),  # 同样相似时取日期更近的
+    ]
+
+    assert reconcile(statement, ledger) == {"s1": "m1", "s4": "m5"}
+
+
+def test_each_ledger_transaction_matches_one_row():
+    statement = [entry("s1", -450, 100, "TIM HORTONS"), entry("s2", -450, 100, "TIM HORTONS")]
+    ledger = [entry("m1", -450, 101, "Tim Hortons")]
+
+    assert reconcile(statement, ledger) == {"s1": "m1"}
+
+
+def test_import_links_manually_entered_transactions(db_session, blob_store, user, account):
+    manual = Transaction(
+        user_id=user.id,
+        account_id=account.id,
+        transaction_date=datetime(2025, 1, 13),
+        amount=135.67,
+        currency=Currency.CAD,
+        type=TransactionType.EXPENSE,
+        merchant="Costco",
+        description="Costco run",
+    )
+    db_session.add(manual)
+    db_session.commit()
+    service = ImportService(db_session, blob_store)
+    batch = asyncio.run(service.create_import_batch(user, account.id, make_upload(CIBC_ROWS)))
+
+    batch = service.process_import_batch(user, batch.id)
+
+    assert batch.reconciled_count == 1
+    assert batch.categorized_count == 3
+    row = db_session.query(RawTransaction).filter(RawTransaction.row_number == 3).one()
+    assert (row.status, row.transaction_id) == ("reconciled", manual.id)
+
+    service.confirm_import_batch(user, batch.id)
+    assert batch.inserted_count == 3
+    assert db_session.query(Transaction).count() == 4
@@ -0,0 +1,55 @@
+import pytest
+
+from app.services.row_decoder import DateDecoder, RowDecoder, parse_cents
+
+
+@pytest.mark.parametrize("value, cents", [
+    ("102.15", 10215),
+    ("1,234.5", 123450),
+    ("-38.42", -3842),
+    ("$7", 700),
+    ("(12.00)", -1200),
+    (".99", 99),
+    ("1.005", 101),
+])
+def test_parse_cents(value, cents):
+    assert parse_cents(value) == cents
+
+
+@pytest.mark.parametrize("value", ["", "-", "abc", "1.2.3"])
+def test_parse_cents_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        parse_cents(value)
+
+
+def test_date_decoder_infers_layout_and_caches():
+    decoder = DateDecoder.infer(["3/26/2024", "12/31/2024", "garbage"])
+    assert decoder.layout == "%m/%d/%Y"
+    assert decoder("3/26/2024") == "2024-03-26T00:00:00"
+    assert decoder._cache == {"3/26/2024": "2024-03-26T00:00:00"}
+
+    # 日大于 12 时只能是 日/月/年
+    assert DateDecoder.infer(["26/03/2024"]).layout == "%d/%m/%Y"
+    with pytest.raises(ValueError):
+        DateDecoder("%Y-%m-%d")("2024-13-01")
+
+
+def test_row_decoder_drops_non_amount_columns():
+    sample = [["2025-01-15", "SHOP", "10.00", "", "N/A"], ["2025-01-16", "PAY", "", "5.00", "N/A"]]
+    decoder = RowDecoder.compile(sample, {0: "%Y-%m-%d"}, (2, 3, 4))
+
+    assert decoder.amount_columns == (2, 3)
+    assert decoder.first_amount(sample[1]) == (3, 500)
+    assert decoder.date(sample[0], 0) == "2025-01-15T00:00:00"
+
+
+def test_row_decoder_keeps_amount_column_with_occasional_bad_values():
+    sample = [["2025-01-15", "SHOP", f"{day}.00", ""] for day in range(1, 9)]
+    sample += [["2025-01-16", "PAY", "N/A", "5.00"], ["", "Total", "see statement", ""]]
+    decoder = RowDecoder.compile(sample, {0: "%Y-%m-%d"}, (2, 3))
+
+    assert decoder.amount_columns == (2, 3)
+    assert decoder.first_amount(sample[0]) == (2, 100)
+    assert decoder.first_amount(sample[8]) == (3, 500)
+    with pytest.raises(ValueError):
+        decoder.first_amount(sample[9])
@@ -0,0 +1,102 @@
+import asyncio
+import zipfile
+from io import BytesIO
+
+import pytest
+from fastapi import UploadFile
+
+from app.models.enums import BankStatementFormat
+from app.models.transaction import RawTransaction
+from app.services import import_service
+from app.services.import_service import ImportService
+from app.services.parsed_row import ParsedRow
+from app.services.statement_archive import StatementParsePool, drop_overlaps, merge_by_date
+
+DECEMBER = [
+    '2024-12-30,"NETFLIX.COM",16.99,,5268********3949',
+    '2024-12-31,"TIM HORTONS #1234",2.10,,5268********3949',
+    '2024-12-31,"TIM HORTONS #1234",2.10,,5268********3949',
+    '2025-01-02,"LCBO/RAO #702 WATERLOO, ON",40.00,,5268********3949',
+]
+# 一月的对账单与十二月的重叠了 12/31 和 1/2
+JANUARY = [
+    '2025-01-15,"COSTCO WHOLESALE W1248 WATERLOO, ON",135.67,,5268********3949',
+    '2025-01-02,"LCBO/RAO #702 WATERLOO, ON",40.00,,5268********3949',
+    '2024-12-31,"TIM HORTONS #1234",2.10,,5268********3949',
+]
+
+
+def upload(lines, filename):
+    return UploadFile(file=BytesIO("\n".join(lines).encode("utf-8")), filename=filename)
+
+
+def row(date, description):
+    return ParsedRow("", f"{date}T00:00:00", 100, "expense", description)
+
+
+@pytest.fixture
+def parse_pool(monkeypatch):
+    pool = StatementParsePool(max_workers=2)
+    monkeypatch.setattr(import_service, "statement_parse_pool", pool)
+    yield pool
+    pool.shutdown()
+
+
+def test_parse_workers_are_spawned_not_forked(parse_pool):
+    # 解析进程不能从多线程的服务进程 fork 出来
+    assert parse_pool._get_executor()._mp_context.get_start_method() == "spawn"
+
+
+def test_drop_overlaps_keeps_repeats_within_one_file():
+    first = [row("2025-01-01", "COFFEE"), row("2025-01-01", "COFFEE"), row("2025-01-02", "BOOKS")]
+    second = [row("2025-01-01", "COFFEE"), row("2025-01-03", "RENT")]
+    duplicates = []
+
+    rows = list(drop_overlaps(merge_by_date([first, second]), duplicates.append))
+
+    assert [r.description for r in rows] == ["COFFEE", "COFFEE", "BOOKS", "RENT"]
+    assert duplicates == [1]
+
+
+def test_multi_file_batch_merges_by_date_and_skips_overlaps(db_session, blob_store, user, account, parse_pool):
+    service = ImportService(db_session, blob_store)
+
+    batch = asyncio.run(service.create_multi_file_import_batch(
+        user, account.id, [upload(DECEMBER, "dec.csv"), upload(JANUARY, "jan.csv")]
+    ))
+
+    assert batch.statement_format == BankStatementFormat.CIBC_CREDIT
+    assert [(f.file_name, f.status, f.parsed_count, f.duplicate_count) for f in batch.files] == [
+        ("dec.csv", "parsed", 4, 0),
+        ("jan.csv", "parsed", 3, 2),
+    ]
+    rows = db_session.query(RawTransaction).order_by(RawTransaction.row_number).all()
+    assert [r.processed_data["transaction_date"][:10] for r in rows] == [
+        "2024-12-30", "2024-12-31", "2024-12-31", "2025-01-02", "2025-01-15",
+    ]
+    assert batch.processed_count == 5
+
+
+def test_zip_upload_reports_per_file_status_and_reparses(db_session, blob_store, user, account, parse_pool):
+    archive = BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("statements/dec.csv", "\n".join(DECEMBER))
+        zf.writestr("statements/notes.txt", "not a statement")
+        zf.writestr("__MACOSX/statements/._dec.csv", "junk")
+        zf.writestr("statements/jan.csv", "\n".join(JANUARY))
+    service = ImportService(db_session, blob_store)
+
+    batch = asyncio.run(service.create_import_batch(
+        user, account.id, UploadFile(file=BytesIO(archive.getvalue()), filename="2024.zip")
+    ))
+
+    assert batch.file_name == "2024.zip"
+    assert [(f.file_name, f.status) for f in batch.files] == [
+        ("dec.csv", "parsed"), ("notes.txt", "error"), ("jan.csv", "parsed"),
+    ]
+    assert batch.processed_count == 5
+
+    batch = service.reparse_import_batch(user, batch.id)
+    assert batch.processed_count == 5
+    assert [f.duplicate_count for f in batch.files] == [0, 0, 2]
+    assert db_session.query(RawTransaction).filter(RawTransaction.import_batch_id == batch.id).count() == 5
@@ -0,0 +1,62 @@
+import asyncio
+import codecs
+from io import BytesIO
+
+import pytest
+from fastapi import UploadFile
+
+from app.models.enums import BankStatementFormat
+from app.models.transaction import RawTransaction
+from app.services.bank_parsers import ParserFactory
+from app.services.import_service import ImportService
+from app.services.text_sniffer import SNIFF_SAMPLE_SIZE, TextFormat, open_text_stream, sniff_text
+from tests.test_bank_parsers import CIBC_CREDIT, RBC_CHECKING
+
+ACCENTED = '2025-01-15,"CAFÉ DÉPÔT MONTRÉAL, QC",12.50,,5268********3949\n'
+
+
+@pytest.mark.parametrize("data, expected", [
+    (CIBC_CREDIT.encode("utf-8"), TextFormat("utf-8", ",")),
+    (codecs.BOM_UTF8 + CIBC_CREDIT.encode("utf-8"), TextFormat("utf-8-sig", ",")),
+    (CIBC_CREDIT.encode("utf-16"), TextFormat("utf-16", ",")),
+    (CIBC_CREDIT.encode("utf-16-le"), TextFormat("utf-16-le", ",")),
+    (ACCENTED.encode("cp1252"), TextFormat("cp1252", ",")),
+    (RBC_CHECKING.replace(",", ";").encode("utf-8"), TextFormat("utf-8", ";")),
+    ("Date\tDescription\tAmount\n2025-01-15\tCOFFEE, LARGE\t-4,50\n".encode("utf-8"), TextFormat("utf-8", "\t")),
+])
+def test_sniff_text(data, expected):
+    assert sniff_text(data) == expected
+
+
+def test_sniffing_tolerates_multibyte_character_cut_by_sample():
+    data = ("a" * (SNIFF_SAMPLE_SIZE - 1) + "É").encode("utf-8")
+    assert sniff_text(data[:SNIFF_SAMPLE_SIZE]).encoding == "utf-8"
+
+
+@pytest.mark.parametrize("encoding", ["utf-8-sig", "utf-16", "cp1252"])
+def test_detect_and_parse_non_utf8_statements(encoding):
+    content = (ACCENTED + CIBC_CREDIT).encode(encoding)
+    assert ParserFactory.detect_format(content) == BankStatementFormat.CIBC_CREDIT
+
+    parser = ParserFactory.get_parser(BankStatementFormat.CIBC_CREDIT)
+    rows = list(parser.iter_rows(open_text_stream(BytesIO(content))))
+    assert [row.description for row in rows][:2] == ["CAFÉ DÉPÔT MONTRÉAL, QC", "LCBO/RAO #702 WATERLOO, ON"]
+    assert rows[0].line == ACCENTED.rstrip("\n")
+
+
+def test_semicolon_statement_is_imported_with_its_delimiter(db_session, blob_store, user, account):
+    content = RBC_CHECKING.replace(",", ";").encode("cp1252")
+    service = ImportService(db_session, blob_store)
+    upload = UploadFile(file=BytesIO(content), filename="rbc.csv")
+
+    batch = asyncio.run(service.create_import_batch(user, account.id, upload))
+
+    assert batch.statement_format == BankStatementFormat.RBC_CHECKING
+    rows = db_session.query(RawTransaction).order_by(RawTransaction.row_number).all()
+    assert [r.processed_data["description"] for r in rows] == [
+        "Transfer - WWW TRANSFER - 0653 ",
+        "PAYROLL DEPOSIT - CONESTOGA COLLE ",
+    ]
+    assert rows[1].processed_data["amount_cents"] == 71529
+    start, end = rows[1].raw_data["spans"][4]
+    assert rows[1].raw_data["line"][start:end] == '"PAYROLL DEPOSIT"'
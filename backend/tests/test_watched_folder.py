@@ -0,0 +1,109 @@
+import io
+import os
+import time
+import zipfile
+
+import pytest
+
+from app.models.transaction import ImportBatch
+from app.models.watched_folder import WatchedFile
+from app.services import watched_folder
+from app.services.statement_archive import statement_parse_pool
+from app.services.watched_folder import WatchedFolderService
+from tests.test_statement_archive import DECEMBER, JANUARY
+
+
+@pytest.fixture(autouse=True)
+def shutdown_parse_pool():
+    yield
+    statement_parse_pool.shutdown()
+
+
+def write_settled(path, lines):
+    """写入文件并把修改时间调到静置期之前"""
+    path.write_text("\n".join(lines))
+    settled = time.time() - watched_folder.SETTLE_SECONDS - 60
+    os.utime(path, (settled, settled))
+
+
+def statuses(db_session):
+    return dict(db_session.query(WatchedFile.path, WatchedFile.status))
+
+
+def test_scan_imports_only_new_and_changed_files(tmp_path, db_session, blob_store, user, account, monkeypatch):
+    downloads = tmp_path / "downloads"
+    downloads.mkdir()
+    write_settled(downloads / "old.csv", DECEMBER)
+    submitted = []
+    service = WatchedFolderService(db_session, blob_store, lambda *job: submitted.append(job))
+    folder = service.create_folder(user, account.id, str(downloads))
+    assert statuses(db_session) == {"old.csv": "baseline"}
+
+    write_settled(downloads / "2025-01.csv", JANUARY)
+    write_settled(downloads / "notes.txt", ["not a statement"])
+    (downloads / "2025-02.csv.crdownload").write_text("partial")
+    batches = service.scan_folder(folder)
+
+    assert [batch.file_name for batch in batches] == ["2025-01.csv"]
+    assert batches[0].status == "queued"
+    assert submitted == [(batches[0].id, user.id, False)]
+    assert statuses(db_session) == {"old.csv": "baseline", "2025-01.csv": "imported", "notes.txt": "error"}
+
+    # 没有变化的文件不读取内容
+    hashed = []
+    monkeypatch.setattr(watched_folder, "file_digest", lambda path: hashed.append(path) or "")
+    assert service.scan_folder(folder) == []
+    assert hashed == []
+
+
+def test_scan_skips_touched_and_copied_statements(tmp_path, db_session, blob_store, user, account):
+    downloads = tmp_path / "downloads"
+    downloads.mkdir()
+    service = WatchedFolderService(db_session, blob_store, lambda *job: None)
+    folder = service.create_folder(user, account.id, str(downloads))
+    write_settled(downloads / "statement.csv", JANUARY)
+    assert len(service.scan_folder(folder)) == 1
+
+    # 重新保存（修改时间变化，内容不变）和重复下载的副本都不再导入
+    settled = time.time() - watched_folder.SETTLE_SECONDS - 30
+    os.utime(downloads / "statement.csv", (settled, settled))
+    write_settled(downloads / "statement (1).csv", JANUARY)
+
+    assert service.scan_folder(folder) == []
+    assert statuses(db_session) == {"statement.csv": "imported", "statement (1).csv": "duplicate"}
+    assert db_session.query(ImportBatch).count() == 1
+
+
+def test_scan_records_unreadable_and_corrupt_files_and_continues(
+    tmp_path, db_session, blob_store, user, account, monkeypatch
+):
+    downloads = tmp_path / "downloads"
+    downloads.mkdir()
+    service = WatchedFolderService(db_session, blob_store, lambda *job: None)
+    folder = service.create_folder(user, account.id, str(downloads))
+
+    # 压缩包结构完整，但成员内容损坏（CRC 校验失败）
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("2024-12.csv", "\n".join(DECEMBER))
+    (downloads / "broken.zip").write_bytes(archive.getvalue().replace(b"2024-12-", b"2024-13-", 1))
+    settled = time.time() - watched_folder.SETTLE_SECONDS - 60
+    os.utime(downloads / "broken.zip", (settled, settled))
+    write_settled(downloads / "locked.csv", DECEMBER)
+    write_settled(downloads / "2025-01.csv", JANUARY)
+    file_digest = watched_folder.file_digest
+
+    def digest(path):
+        if path.name == "locked.csv":
+            raise PermissionError(f"Permission denied: {path}")
+        return file_digest(path)
+
+    monkeypatch.setattr(watched_folder, "file_digest", digest)
+    batches = service.scan_folder(folder)
+
+    assert [batch.file_name for batch in batches] == ["2025-01.csv"]
+    assert statuses(db_session) == {"broken.zip": "error", "locked.csv": "error", "2025-01.csv": "imported"}
+    errors = dict(db_session.query(WatchedFile.path, WatchedFile.error_message).filter(WatchedFile.status == "error"))
+    assert "Permission denied" in errors["locked.csv"]
+    assert "CRC" in errors["broken.zip"]
+    assert folder.last_error is None
@@ -0,0 +1,106 @@
+import asyncio
+import csv
+from datetime import datetime
+from io import BytesIO
+
+import pytest
+from fastapi import UploadFile
+from openpyxl import Workbook
+
+from app.models.enums import BankStatementFormat, TransactionType
+from app.models.transaction import RawTransaction
+from app.services.bank_parsers import DETECT_SAMPLE_SIZE, ParserFactory
+from app.services.generic_csv_parser import ColumnMapping
+from app.services.import_service import ImportService
+from app.services.text_sniffer import sniff_text
+from app.services.xlsx_parser import XLSXParser
+
+
+def make_workbook(rows) -> bytes:
+    workbook = Workbook()
+    sheet = workbook.active
+    for row in rows:
+        sheet.append(row)
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+STATEMENT = [
+    ["RBC Chequing 09037-5103486"],
+    [],
+    ["Date", "Description", "Withdrawals", "Deposits", "Balance"],
+    [datetime(2025, 1, 15), "FOOD BASICS #612 WATERLOO, ON", 42.1, None, 2457.9],
+    [datetime(2025, 1, 10), "PAYROLL DEPOSIT ACME", None, 2500, 2500.0],
+    [datetime(2025, 1, 8), "WWW TRANSFER 0653", 0.1 + 0.2, None, 0.0],
+]
+
+
+def test_detect_xlsx():
+    assert ParserFactory.detect_format(make_workbook(STATEMENT)[:DETECT_SAMPLE_SIZE]) == BankStatementFormat.XLSX
+
+
+def test_detect_xlsx_when_csv_rejects_nul(monkeypatch):
+    # Python 3.10 及更早版本的 csv 模块遇到 NUL 会抛出 csv.Error
+    reader = csv.reader
+
+    def strict_reader(lines, **kwargs):
+        lines = list(lines)
+        if any("\0" in line for line in lines):
+            raise csv.Error("line contains NUL")
+        return reader(lines, **kwargs)
+
+    monkeypatch.setattr(csv, "reader", strict_reader)
+    sniff_text.cache_clear()
+    sample = make_workbook(STATEMENT)[:DETECT_SAMPLE_SIZE]
+    assert sniff_text(sample).delimiter == ","
+    assert ParserFactory.detect_format(sample) == BankStatementFormat.XLSX
+    sniff_text.cache_clear()
+
+
+def test_sniffs_header_below_title_rows():
+    rows = list(XLSXParser().iter_rows(BytesIO(make_workbook(STATEMENT))))
+
+    assert [(r.transaction_date, r.amount_cents, r.type) for r in rows] == [
+        ("2025-01-15T00:00:00", 4210, TransactionType.EXPENSE.value),
+        ("2025-01-10T00:00:00", 250000, TransactionType.INCOME.value),
+        ("2025-01-08T00:00:00", 30, TransactionType.TRANSFER_OUT.value),
+    ]
+    assert rows[0].merchant == "FOOD BASICS"
+    assert rows[0].fields()[:3] == ["2025-01-15", '"FOOD BASICS #612 WATERLOO, ON"', "42.1"]
+
+
+def test_explicit_mapping_with_text_dates():
+    content = make_workbook([
+        ["Posted", "Payee", "Amount"],
+        ["01/15/2025", "AMAZON.CA", -45.99],
+        ["01/20/2025", "REFUND AMAZON.CA", 12],
+    ])
+    mapping = ColumnMapping.from_dict({"Posted": "transaction_date", "Payee": "description", "Amount": "amount"})
+
+    rows = list(XLSXParser(mapping).iter_rows(BytesIO(content)))
+
+    assert [(r.transaction_date, r.amount_cents, r.type) for r in rows] == [
+        ("2025-01-15T00:00:00", 4599, TransactionType.EXPENSE.value),
+        ("2025-01-20T00:00:00", 1200, TransactionType.INCOME.value),
+    ]
+
+
+def test_unrecognized_sheet_is_rejected():
+    with pytest.raises(ValueError):
+        list(XLSXParser().iter_rows(BytesIO(make_workbook([["a", "b"], [1, 2]]))))
+
+
+def test_import_workbook(db_session, blob_store, user, account):
+    service = ImportService(db_session, blob_store)
+    upload = UploadFile(file=BytesIO(make_workbook(STATEMENT)), filename="statement.xlsx")
+
+    batch = asyncio.run(service.create_import_batch(user, account.id, upload))
+
+    assert batch.statement_format == BankStatementFormat.XLSX
+    assert batch.processed_count == 3
+    rows = db_session.query(RawTransaction).order_by(RawTransaction.row_number).all()
+    assert rows[1].processed_data["amount_cents"] == 250000
+
+    batch = service.reparse_import_batch(user, batch.id)
+    assert batch.processed_count == 3
@@ -2,7 +2,9 @@ import { getApiClient } from '@/lib/api-client';
 import { 
   FinanceTransaction, 
   ImportBatch, 
-  ImportBatchResult 
+  ImportBatchPage,
+  ImportBatchProgress,
+  ImportRowsPage
 } from '@/types/transaction/transaction.type';
 
 // 基本 CRUD 操作
@@ -41,13 +43,16 @@ export async function deleteTransaction(id: string): Promise<void> {
 
 // 导入相关操作
 export async function createImportBatch(
-  file: File,
+  file: File | File[],
   accountId: string,
   statementFormat?: string
 ): Promise<ImportBatch> {
   const apiClient = await getApiClient();
   const formData = new FormData();
-  formData.append('file', file);
+  // 多个文件（或 zip 压缩包）会合并为一个导入批次
+  for (const item of Array.isArray(file) ? file : [file]) {
+    formData.append('file', item);
+  }
   formData.append('accountId', accountId);
   if (statementFormat) {
     formData.append('statementFormat', statementFormat);
@@ -64,36 +69,87 @@ export async function getImportBatch(batchId: string): Promise<ImportBatch> {
   return await apiClient.getClient().get(`/transactions/import/${batchId}`);
 }
 
+// 按创建时间倒序分页获取批次摘要，nextCursor 为空表示没有更多批次
 export async function listImportBatches(params?: {
   accountId?: string;
   status?: string;
-  skip?: number;
+  cursor?: string;
   limit?: number;
-}): Promise<ImportBatch[]> {
+}): Promise<ImportBatchPage> {
   const apiClient = await getApiClient();
-  return await apiClient.getClient().get('/transactions/import', { params });
+  return await apiClient.getClient().get('/transactions/import', {
+    params: {
+      account_id: params?.accountId,
+      status: params?.status,
+      cursor: params?.cursor,
+      limit: params?.limit,
+    },
+  });
 }
 
 export async function processImportBatch(
   batchId: string,
   autoCreate: boolean = false
-): Promise<ImportBatchResult> {
+): Promise<ImportBatch> {
+  const apiClient = await getApiClient();
+  return await apiClient.getClient().post(`/transactions/import/${batchId}/process`, null, {
+    params: { auto_create: autoCreate },
+  });
+}
+
+export async function getImportRows(
+  batchId: string,
+  cursor: number = 0,
+  limit: number = 200
+): Promise<ImportRowsPage> {
   const apiClient = await getApiClient();
-  return await apiClient.getClient().post(`/transactions/import/${batchId}/process`, {
-    autoCreate,
+  return await apiClient.getClient().get(`/transactions/import/${batchId}/rows`, {
+    params: { cursor, limit },
   });
 }
 
+export async function getImportProgress(batchId: string): Promise<ImportBatchProgress> {
+  const apiClient = await getApiClient();
+  return await apiClient.getClient().get(`/transactions/import/${batchId}/progress`);
+}
+
+export async function cancelImportBatch(batchId: string): Promise<ImportBatchProgress> {
+  const apiClient = await getApiClient();
+  return await apiClient.getClient().post(`/transactions/import/${batchId}/cancel`);
+}
+
+// 轮询导入进度，直到后台任务结束
+export async function waitForImportBatch(
+  batchId: string,
+  onProgress?: (progress: ImportBatchProgress) => void,
+  intervalMs: number = 500
+): Promise<ImportBatchProgress> {
+  for (;;) {
+    const progress = await getImportProgress(batchId);
+    onProgress?.(progress);
+    if (progress.status !== 'queued' && progress.status !== 'processing') {
+      return progress;
+    }
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+}
+
 export async function confirmImportBatch(
   batchId: string,
   selectedRows?: number[]
-): Promise<ImportBatchResult> {
+): Promise<ImportBatch> {
   const apiClient = await getApiClient();
   return await apiClient.getClient().post(`/transactions/import/${batchId}/confirm`, {
     selectedRows,
   });
 }
 
+// 撤销整个导入批次：删除其创建的交易并回退账户余额
+export async function undoImportBatch(batchId: string): Promise<ImportBatch> {
+  const apiClient = await getApiClient();
+  return await apiClient.getClient().post(`/transactions/import/${batchId}/undo`);
+}
+
 // 分析相关操作
 export async function getCategorySummary(params: {
   startDate: string;
@@ -0,0 +1,36 @@
+import { getApiClient } from '@/lib/api-client';
+import { ImportBatch } from '@/types/transaction/transaction.type';
+import { WatchedFile, WatchedFolder, WatchedFolderCreate } from '@/types/transaction/watched-folder.type';
+
+export async function fetchWatchedFolders(): Promise<WatchedFolder[]> {
+    const apiClient = await getApiClient();
+    return await apiClient.getClient().get('/watched-folders');
+}
+
+export async function createWatchedFolder(folder: WatchedFolderCreate): Promise<WatchedFolder> {
+    const apiClient = await getApiClient();
+    return await apiClient.getClient().post('/watched-folders', {
+        account_id: folder.accountId,
+        path: folder.path,
+        pattern: folder.pattern,
+        recursive: folder.recursive,
+        auto_create: folder.autoCreate,
+        import_existing: folder.importExisting,
+    });
+}
+
+export async function fetchWatchedFiles(folderId: string): Promise<WatchedFile[]> {
+    const apiClient = await getApiClient();
+    return await apiClient.getClient().get(`/watched-folders/${folderId}/files`);
+}
+
+// 立即扫描，返回本次创建的导入批次（后台处理进度通过导入批次接口查询）
+export async function scanWatchedFolder(folderId: string): Promise<ImportBatch[]> {
+    const apiClient = await getApiClient();
+    return await apiClient.getClient().post(`/watched-folders/${folderId}/scan`);
+}
+
+export async function deleteWatchedFolder(folderId: string): Promise<void> {
+    const apiClient = await getApiClient();
+    return await apiClient.getClient().delete(`/watched-folders/${folderId}`);
+}
@@ -7,18 +7,20 @@ import {
   TableHeader,
   TableRow,
 } from '@/components/ui/table';
-import { ImportBatch, ImportBatchStatus } from '@/types/transaction/transaction.type';
+import { ImportBatchStatus, ImportBatchSummary } from '@/types/transaction/transaction.type';
 import { formatDate } from '@/lib/utils';
 import { Badge } from '@/components/ui/badge';
 import { Button } from '@/components/ui/button';
 import { cn } from '@/lib/utils';
 
 interface ImportBatchListProps {
-  batches: ImportBatch[];
-  onViewBatch: (batch: ImportBatch) => void;
+  batches: ImportBatchSummary[];
+  onViewBatch: (batch: ImportBatchSummary) => void;
+  hasMore?: boolean;
+  onLoadMore?: () => void;
 }
 
-export function ImportBatchList({ batches, onViewBatch }: ImportBatchListProps) {
+export function ImportBatchList({ batches, onViewBatch, hasMore, onLoadMore }: ImportBatchListProps) {
   const getStatusBadge = (status: ImportBatchStatus) => {
     const statusMap: Record<ImportBatchStatus, { color: string; label: string }> = {
       [ImportBatchStatus.PENDING]: { color: 'bg-yellow-100 text-yellow-800', label: 'Pending' },
@@ -39,7 +41,7 @@ export function ImportBatchList({ batches, onViewBatch }: ImportBatchListProps)
             <TableHead>File Name</TableHead>
             <TableHead>Account</TableHead>
             <TableHead>Status</TableHead>
-            <TableHead>Processed</TableHead>
+            <TableHead>Rows</TableHead>
             <TableHead>Created At</TableHead>
             <TableHead>Action</TableHead>
           </TableRow>
@@ -50,7 +52,13 @@ export function ImportBatchList({ batches, onViewBatch }: ImportBatchListProps)
               <TableCell>{batch.fileName}</TableCell>
               <TableCell>{batch.accountId}</TableCell>
               <TableCell>{getStatusBadge(batch.status)}</TableCell>
-              <TableCell>{batch.processedCount}</TableCell>
+              <TableCell>
+                {batch.rowCounts.processed} processed
+                {!!batch.rowCounts.pending && `, ${batch.rowCounts.pending} pending`}
+                {!!batch.rowCounts.duplicate && `, ${batch.rowCounts.duplicate} duplicate`}
+                {!!batch.rowCounts.reconciled && `, ${batch.rowCounts.reconciled} matched`}
+                {!!batch.rowCounts.error && `, ${batch.rowCounts.error} error`}
+              </TableCell>
               <TableCell>{formatDate(batch.createdAt)}</TableCell>
               <TableCell>
                 <Button
@@ -65,6 +73,13 @@ export function ImportBatchList({ batches, onViewBatch }: ImportBatchListProps)
           ))}
         </TableBody>
       </Table>
+      {hasMore && (
+        <div className="flex justify-center p-2">
+          <Button variant="outline" size="sm" onClick={onLoadMore}>
+            Load more
+          </Button>
+        </div>
+      )}
     </div>
   );
 }
@@ -185,7 +185,7 @@ export function ImportForm({ accounts, onSubmit, onClose, open }: ImportFormProp
                         id="file-upload"
                         type="file"
                         className="hidden"
-                        accept=".csv,.xls,.xlsx"
+                        accept=".csv,.xls,.xlsx,.ofx,.qfx,.zip"
                         onChange={handleFileChange}
                         {...field}
                       />
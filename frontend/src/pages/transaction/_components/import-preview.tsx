@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import {
   Table,
   TableBody,
@@ -10,27 +10,49 @@ import {
 import { Button } from '@/components/ui/button';
 import { Checkbox } from '@/components/ui/checkbox';
 import { Badge } from '@/components/ui/badge';
-import { ImportBatch, ProcessedTransaction, TransactionCategory } from '@/types/transaction/transaction.type';
+import { getImportRows } from '@/api/transaction.api';
+import { ImportBatch, ImportRow, TransactionCategory } from '@/types/transaction/transaction.type';
 import { cn } from '@/lib/utils';
 
 interface ImportPreviewProps {
   batch: ImportBatch;
-  transactions: Array<{
-    id: string;
-    rowNumber: number;
-    processedData: ProcessedTransaction;
-  }>;
   onConfirm: (selectedRows: number[]) => void;
   onCancel: () => void;
 }
 
-export function ImportPreview({ batch, transactions, onConfirm, onCancel }: ImportPreviewProps) {
+export function ImportPreview({ batch, onConfirm, onCancel }: ImportPreviewProps) {
+  const [transactions, setTransactions] = useState<ImportRow[]>([]);
+  const [nextCursor, setNextCursor] = useState<number | null>(0);
+  const [isLoadingRows, setIsLoadingRows] = useState(false);
   const [selectedRows, setSelectedRows] = useState<number[]>([]);
   const [selectAll, setSelectAll] = useState(false);
 
+  // 按页读取原始交易，先显示第一页，其余的按需加载
+  const loadRows = async (cursor: number, reset: boolean = false) => {
+    setIsLoadingRows(true);
+    try {
+      const page = await getImportRows(batch.id, cursor);
+      setTransactions(prev => (reset ? page.rows : [...prev, ...page.rows]));
+      setNextCursor(page.nextCursor);
+    } finally {
+      setIsLoadingRows(false);
+    }
+  };
+
+  useEffect(() => {
+    setSelectedRows([]);
+    setSelectAll(false);
+    loadRows(0, true);
+  }, [batch.id]);
+
   const handleSelectAll = (checked: boolean) => {
     setSelectAll(checked);
-    setSelectedRows(checked ? transactions.map(t => t.rowNumber) : []);
+    // 已导入过的重复行和已与手工记录对上的行默认不勾选
+    setSelectedRows(
+      checked
+        ? transactions.filter(t => !t.duplicate && t.status !== 'reconciled').map(t => t.rowNumber)
+        : []
+    );
   };
 
   const handleSelectRow = (rowNumber: number, checked: boolean) => {
@@ -135,6 +157,7 @@ export function ImportPreview({ batch, transactions, onConfirm, onCancel }: Impo
           <h3 className="text-lg font-semibold">Import Preview</h3>
           <p className="text-sm text-gray-500">
             File: {batch.fileName} | Status: {batch.status} | Records: {batch.processedCount}
+            {!!batch.skippedCount && ` | Skipped (already imported): ${batch.skippedCount}`}
           </p>
         </div>
         <div className="space-x-2">
@@ -180,7 +203,15 @@ export function ImportPreview({ batch, transactions, onConfirm, onCancel }: Impo
                   />
                 </TableCell>
                 <TableCell>{formatDate(trans.processedData.transactionDate)}</TableCell>
-                <TableCell>{trans.processedData.description}</TableCell>
+                <TableCell>
+                  {trans.processedData.description}
+                  {trans.duplicate && (
+                    <Badge className="ml-2 bg-amber-100 text-amber-800">Already imported</Badge>
+                  )}
+                  {trans.status === 'reconciled' && (
+                    <Badge className="ml-2 bg-sky-100 text-sky-800">Matches existing entry</Badge>
+                  )}
+                </TableCell>
                 <TableCell>
                   <span className={cn(
                     trans.processedData.direction === 'inflow' ? 'text-green-600' : 'text-red-600'
@@ -200,6 +231,18 @@ export function ImportPreview({ batch, transactions, onConfirm, onCancel }: Impo
           </TableBody>
         </Table>
       </div>
+
+      {nextCursor !== null && (
+        <div className="flex justify-center">
+          <Button
+            variant="outline"
+            onClick={() => loadRows(nextCursor)}
+            disabled={isLoadingRows}
+          >
+            {isLoadingRows ? 'Loading...' : 'Load more'}
+          </Button>
+        </div>
+      )}
     </div>
   );
 }
@@ -7,28 +7,39 @@ import { ImportPreview } from '@/pages/transaction/_components/import-preview';
 import { useFinanceStore } from '@/stores/finance.store';
 import {
   createImportBatch,
+  getImportBatch,
   listImportBatches,
   processImportBatch,
+  waitForImportBatch,
   confirmImportBatch,
 } from '@/api/transaction.api';
-import { ImportBatch, ImportBatchResult } from '@/types/transaction/transaction.type';
+import {
+  ImportBatch,
+  ImportBatchProgress,
+  ImportBatchStatus,
+  ImportBatchSummary,
+} from '@/types/transaction/transaction.type';
 
 export default function ImportPage() {
   const { accounts } = useFinanceStore();
   const { toast } = useToast();
   const [isFormOpen, setIsFormOpen] = useState(false);
-  const [batches, setBatches] = useState<ImportBatch[]>([]);
-  const [selectedBatch, setSelectedBatch] = useState<ImportBatchResult | null>(null);
+  const [batches, setBatches] = useState<ImportBatchSummary[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [selectedBatch, setSelectedBatch] = useState<ImportBatch | null>(null);
+  const [progress, setProgress] = useState<ImportBatchProgress | null>(null);
   const [, setIsLoading] = useState(false);
 
   useEffect(() => {
     fetchBatches();
   }, []);
 
-  const fetchBatches = async () => {
+  // 不传游标时从第一页重新加载，传入游标时追加下一页
+  const fetchBatches = async (cursor?: string) => {
     try {
-      const data = await listImportBatches();
-      setBatches(data);
+      const page = await listImportBatches({ cursor });
+      setBatches((current) => (cursor ? [...current, ...page.batches] : page.batches));
+      setNextCursor(page.nextCursor);
     } catch (error) {
       toast({
         variant: 'destructive',
@@ -50,10 +61,14 @@ export default function ImportPage() {
         values.accountId,
         values.statementFormat
       );
-      const result = await processImportBatch(batch.id);
-      setSelectedBatch(result);
-      await fetchBatches();
       setIsFormOpen(false);
+      await processImportBatch(batch.id);
+      const finalProgress = await waitForImportBatch(batch.id, setProgress);
+      if (finalProgress.status === ImportBatchStatus.ERROR) {
+        throw new Error(finalProgress.errorMessage);
+      }
+      setSelectedBatch(await getImportBatch(batch.id));
+      await fetchBatches();
     } catch (error) {
       toast({
         variant: 'destructive',
@@ -61,15 +76,15 @@ export default function ImportPage() {
         description: 'Please check the file format',
       });
     } finally {
+      setProgress(null);
       setIsLoading(false);
     }
   };
 
-  const handleViewBatch = async (batch: ImportBatch) => {
+  const handleViewBatch = async (batch: ImportBatchSummary) => {
     setIsLoading(true);
     try {
-      const result = await processImportBatch(batch.id);
-      setSelectedBatch(result);
+      setSelectedBatch(await getImportBatch(batch.id));
     } catch (error) {
       toast({
         variant: 'destructive',
@@ -86,7 +101,7 @@ export default function ImportPage() {
 
     setIsLoading(true);
     try {
-      await confirmImportBatch(selectedBatch.batch.id, selectedRows);
+      await confirmImportBatch(selectedBatch.id, selectedRows);
       toast({
         title: 'Imported successfully',
         description: `Imported ${selectedRows.length} transactions`,
@@ -114,10 +129,16 @@ export default function ImportPage() {
         <Button onClick={() => setIsFormOpen(true)}>Import New Records</Button>
       </div>
 
+      {progress && (
+        <p className="text-sm text-gray-500">
+          Processing: {progress.categorizedCount} / {progress.parsedCount} rows,
+          {' '}{progress.insertedCount} inserted
+        </p>
+      )}
+
       {selectedBatch ? (
         <ImportPreview
-          batch={selectedBatch.batch}
-          transactions={selectedBatch.results}
+          batch={selectedBatch}
           onConfirm={handleConfirmImport}
           onCancel={() => setSelectedBatch(null)}
         />
@@ -125,6 +146,8 @@ export default function ImportPage() {
         <ImportBatchList
           batches={batches}
           onViewBatch={handleViewBatch}
+          hasMore={nextCursor !== null}
+          onLoadMore={() => nextCursor && fetchBatches(nextCursor)}
         />
       )}
 
@@ -72,13 +72,20 @@ export enum BankStatementFormat {
   CIBC_DEBIT = "cibc_debit",
   RBC_CHECKING = "rbc_checking",
   RBC_CREDIT = "rbc_credit",
-  RBC_SAVING = "rbc_saving"
+  RBC_SAVING = "rbc_saving",
+  GENERIC_CSV = "generic_csv",
+  OFX = "ofx",
+  XLSX = "xlsx"
 }
 
 export enum ImportBatchStatus {
   PENDING = "pending",
+  QUEUED = "queued",
   PROCESSING = "processing",
+  PROCESSED = "processed",
   COMPLETED = "completed",
+  CANCELLED = "cancelled",
+  UNDONE = "undone",
   ERROR = "error"
 }
 
@@ -136,10 +143,69 @@ export interface ImportBatch {
   status: ImportBatchStatus;
   errorMessage?: string;
   processedCount: number;
+  skippedCount?: number;
+  files?: ImportBatchFile[];
+  timings?: Record<string, ImportPhaseTiming>;
+  createdAt: string;
+  updatedAt: string;
+}
+
+export interface ImportPhaseTiming {
+  rows: number;
+  seconds: number;
+  stages: Record<string, number>;
+}
+
+// 批次列表中的一项：只包含元数据和原始交易按状态的行数
+export interface ImportBatchSummary {
+  id: string;
+  accountId: string;
+  statementFormat?: BankStatementFormat;
+  fileName: string;
+  fileSize?: number;
+  status: ImportBatchStatus;
+  errorMessage?: string;
+  processedCount: number;
+  insertedCount: number;
+  rowCounts: Record<"pending" | "processed" | "duplicate" | "reconciled" | "error", number>;
   createdAt: string;
   updatedAt: string;
 }
 
+export interface ImportBatchPage {
+  batches: ImportBatchSummary[];
+  nextCursor: string | null;
+}
+
+export interface ImportBatchFile {
+  id: string;
+  position: number;
+  fileName: string;
+  fileHash: string;
+  fileSize?: number;
+  statementFormat?: BankStatementFormat;
+  status: "pending" | "parsed" | "error";
+  errorMessage?: string;
+  parsedCount: number;
+  duplicateCount: number;
+}
+
+export interface ImportBatchProgress {
+  status: ImportBatchStatus;
+  errorMessage?: string;
+  parsedCount: number;
+  categorizedCount: number;
+  deduplicatedCount: number;
+  reconciledCount: number;
+  skippedCount: number;
+  categoryKeyCount: number;
+  categoryDedupeRatio?: number;
+  insertedCount: number;
+  cancelRequested: boolean;
+  startedAt?: string;
+  finishedAt?: string;
+}
+
 export interface ProcessedTransaction {
   transactionDate: string;
   description: string;
@@ -162,13 +228,19 @@ export interface RawTransaction {
   updatedAt: string;
 }
 
-export interface ImportBatchResult {
-  batch: ImportBatch;
-  results: {
-    id: string;
-    rowNumber: number;
-    processedData: ProcessedTransaction;
-  }[];
+export interface ImportRow {
+  id: string;
+  rowNumber: number;
+  processedData: ProcessedTransaction;
+  status: string;
+  duplicate?: boolean;
+  error?: string;
+}
+
+// 按 rowNumber 游标分页的原始交易，nextCursor 为空表示没有更多行
+export interface ImportRowsPage {
+  rows: ImportRow[];
+  nextCursor: number | null;
 }
 
 export interface Merchant {
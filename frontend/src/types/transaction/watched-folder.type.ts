@@ -0,0 +1,35 @@
+export interface WatchedFolder {
+    id: string;
+    userId: string;
+    accountId: string;
+    path: string;
+    pattern: string;
+    recursive: boolean;
+    autoCreate: boolean;
+    isActive: boolean;
+    lastScannedAt?: string;
+    lastError?: string;
+    createdAt: string;
+    updatedAt: string;
+}
+
+export interface WatchedFile {
+    id: string;
+    folderId: string;
+    path: string;
+    size: number;
+    fileHash?: string;
+    status: "baseline" | "imported" | "duplicate" | "error";
+    errorMessage?: string;
+    importBatchId?: string;
+    updatedAt?: string;
+}
+
+export interface WatchedFolderCreate {
+    accountId: string;
+    path: string;
+    pattern?: string;
+    recursive?: boolean;
+    autoCreate?: boolean;
+    importExisting?: boolean;
+}